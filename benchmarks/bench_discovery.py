@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from vedro.core import ModuleFileLoader
+from vedro.core.scenario_finder import ScenarioFileFinder
+from vedro.core.scenario_finder.scenario_file_finder import AnyFilter, DunderFilter, ExtFilter
+from vedro.core.scenario_orderer import StableScenarioOrderer
+
+from vedro_fn._scenario_discoverer import ScenarioDiscoverer
+from vedro_fn._scenario_loader import ScenarioLoader
+
+SCENARIO = '''
+from vedro_fn import scenario, given, when, then
+
+@scenario()
+def create_user_{idx}():
+    with given:
+        payload = {{"id": {idx}, "name": "user_{idx}"}}
+    with when:
+        result = dict(payload)
+    with then:
+        assert result == payload
+'''
+
+
+def generate(root: Path, files: int) -> None:
+    for idx in range(files):
+        (root / f"scenario_{idx}.py").write_text(SCENARIO.format(idx=idx))
+
+
+async def discover(root: Path, workers: int) -> float:
+    finder = ScenarioFileFinder(file_filter=AnyFilter([DunderFilter(), ExtFilter(only=["py"])]),
+                                dir_filter=AnyFilter([DunderFilter()]))
+    loader = ScenarioLoader(ModuleFileLoader())
+    discoverer = ScenarioDiscoverer(finder, loader, StableScenarioOrderer(), workers=workers)
+
+    started_at = perf_counter()
+    await discoverer.discover(root, project_dir=root.parent)
+    return perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold discovery with prefetch workers")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4, 8])
+    args = parser.parse_args()
+
+    sys.dont_write_bytecode = False
+    print(f"{'workers':>8} {'cold, s':>10}")
+    for workers in args.workers:
+        tmp_dir = Path(tempfile.mkdtemp())
+        cwd = os.getcwd()
+        try:
+            root = tmp_dir / f"scenarios_{workers}"
+            root.mkdir()
+            generate(root, args.files)
+            # ModuleFileLoader resolves relative paths against the working directory
+            os.chdir(tmp_dir)
+            elapsed = asyncio.run(discover(root, workers))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(tmp_dir)
+        print(f"{workers:>8} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
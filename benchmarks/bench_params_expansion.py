@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from textwrap import dedent
+from time import perf_counter
+from typing import Dict
+
+from vedro.core import ModuleFileLoader
+
+from vedro_fn._scenario_loader import ScenarioLoader
+
+EAGER_SOURCE = dedent('''
+    from vedro import params
+    from vedro_fn import scenario
+
+    @scenario([params(idx, f"user_{{idx}}") for idx in range({rows})])
+    def create_user(idx, username):
+        pass
+''')
+
+LAZY_SOURCE = dedent('''
+    from vedro import params
+    from vedro_fn import scenario
+
+    @scenario(params(idx, f"user_{{idx}}") for idx in range({rows}))
+    def create_user(idx, username):
+        pass
+''')
+
+
+def load(source: str, rows: int, name: str, *, trace_memory: bool = False) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            path = Path("scenarios") / f"{name}_{rows}.py"
+            path.parent.mkdir()
+            path.write_text(source.format(rows=rows))
+
+            loader = ScenarioLoader(ModuleFileLoader())
+
+            if trace_memory:
+                tracemalloc.start()
+            started_at = perf_counter()
+            scenarios = asyncio.run(loader.load(path))
+            result = perf_counter() - started_at
+            if trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result = peak / 1024 / 1024
+
+            assert len(scenarios) == rows
+            sys.modules.pop(f"scenarios.{name}_{rows}", None)
+        finally:
+            os.chdir(cwd)
+
+    return result
+
+
+def measure(source: str, rows: int, name: str) -> Dict[str, float]:
+    # Time and memory are measured in separate runs, tracemalloc slows down allocations
+    return {
+        "elapsed": load(source, rows, name),
+        "peak_mb": load(source, rows, name, trace_memory=True),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare eager and lazy params expansion")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'rows':>8} {'load, s':>10} {'peak, MB':>10}")
+    for rows in args.rows:
+        for name, source in (("eager", EAGER_SOURCE), ("lazy", LAZY_SOURCE)):
+            result = measure(source, rows, name)
+            print(f"{name:<6} {rows:>8} {result['elapsed']:>10.2f} {result['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+from time import perf_counter_ns
+
+from vedro_fn import given, when
+from vedro_fn._step_timings import StepRecorder, start_recording, stop_recording
+
+
+def run_steps(steps: int) -> int:
+    started_at = perf_counter_ns()
+    for _ in range(steps):
+        with given:
+            pass
+        with when("named step"):
+            pass
+    return perf_counter_ns() - started_at
+
+
+def measure(steps: int, repeat: int, *, record: bool) -> float:
+    best = None
+    for _ in range(repeat):
+        token = start_recording(StepRecorder()) if record else None
+        elapsed = run_steps(steps)
+        if token is not None:
+            stop_recording(token)
+        best = elapsed if (best is None) else min(best, elapsed)
+    assert best is not None
+    return best / (steps * 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure given/when/then enter/exit overhead")
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'no recorder, ns/step':>22} {'recorder, ns/step':>20}")
+    for steps in args.steps:
+        plain = measure(steps, args.repeat, record=False)
+        recorded = measure(steps, args.repeat, record=True)
+        print(f"{steps * 2:>6} {plain:>22.0f} {recorded:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from textwrap import dedent
+from time import perf_counter, perf_counter_ns, time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+import vedro
+from vedro.core import ExcInfo, ModuleFileLoader
+from vedro.core.scenario_loader import ScenarioFileLoader
+from vedro.events import ExceptionRaisedEvent
+
+import vedro_fn
+from vedro_fn import VedroFn, VedroFnPlugin, given, then, when
+from vedro_fn._scenario_loader import ScenarioLoader
+
+FORMAT_VERSION = 1
+SCENARIOS_PER_FILE = 100
+ROWS_PER_SCENARIO = 10
+
+FN_SCENARIO = '''
+@scenario()
+{fn_def} create_user_{idx}():
+    with given:
+        payload = {{"id": {idx}}}
+    with when:
+        result = dict(payload)
+    with then:
+        assert result == payload
+'''
+
+FN_PARAMS_SCENARIO = '''
+@scenario([{rows}])
+{fn_def} create_user_{idx}(user_id):
+    with given:
+        payload = {{"id": user_id}}
+    with when:
+        result = dict(payload)
+    with then:
+        assert result == payload
+'''
+
+CLASS_SCENARIO = '''
+class Scenario_{idx}(vedro.Scenario):
+    subject = "create user {idx}"
+
+    {fn_def} given_payload(self):
+        self.payload = {{"id": {idx}}}
+
+    {fn_def} when_user_created(self):
+        self.result = dict(self.payload)
+
+    {fn_def} then_it_should_return_payload(self):
+        assert self.result == self.payload
+'''
+
+CLASS_PARAMS_SCENARIO = '''
+class Scenario_{idx}(vedro.Scenario):
+    subject = "create user {idx}"
+
+{rows}
+    def __init__(self, user_id):
+        self.user_id = user_id
+
+    {fn_def} given_payload(self):
+        self.payload = {{"id": self.user_id}}
+
+    {fn_def} when_user_created(self):
+        self.result = dict(self.payload)
+
+    {fn_def} then_it_should_return_payload(self):
+        assert self.result == self.payload
+'''
+
+HEADERS = {
+    "fn": "from vedro import params\nfrom vedro_fn import scenario, given, when, then\n",
+    "class": "import vedro\nfrom vedro import params\n",
+}
+
+
+class Results:
+    def __init__(self) -> None:
+        self._results: List[Dict[str, Any]] = []
+
+    def add(self, name: str, value: float, unit: str, **params: Any) -> None:
+        self._results.append({"name": name, "params": params, "value": value, "unit": unit})
+        params_repr = " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"{name:<24} {params_repr:<40} {value:>14.3f} {unit}")
+
+    def dump(self) -> Dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "created_at": time(),
+            "environment": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "vedro": vedro.__version__,
+                "vedro_fn": vedro_fn.__version__,
+            },
+            "results": self._results,
+        }
+
+
+def render_scenario(style: str, kind: str, idx: int) -> str:
+    fn_def = "async def" if kind.endswith("async") else "def"
+    parametrized = kind.startswith("params")
+    if style == "fn":
+        if not parametrized:
+            return FN_SCENARIO.format(fn_def=fn_def, idx=idx)
+        rows = ", ".join(f"params({r})" for r in range(ROWS_PER_SCENARIO))
+        return FN_PARAMS_SCENARIO.format(fn_def=fn_def, idx=idx, rows=rows)
+    if not parametrized:
+        return CLASS_SCENARIO.format(fn_def=fn_def, idx=idx)
+    rows = "\n".join(f"    @params({r})" for r in range(ROWS_PER_SCENARIO))
+    return CLASS_PARAMS_SCENARIO.format(fn_def=fn_def, idx=idx, rows=rows)
+
+
+def generate_tree(root: Path, style: str, kind: str, size: int) -> List[Path]:
+    # `size` is the number of generated scenario classes (param rows included)
+    per_scenario = ROWS_PER_SCENARIO if kind.startswith("params") else 1
+    total = max(size // per_scenario, 1)
+
+    paths = []
+    for file_idx, start in enumerate(range(0, total, SCENARIOS_PER_FILE)):
+        path = root / f"scenario_{file_idx}.py"
+        body = [render_scenario(style, kind, idx)
+                for idx in range(start, min(start + SCENARIOS_PER_FILE, total))]
+        path.write_text(HEADERS[style] + "".join(body))
+        paths.append(path)
+    return paths
+
+
+def bench_discovery(results: Results, sizes: List[int]) -> None:
+    for size in sizes:
+        for kind in ("sync", "async", "params_sync", "params_async"):
+            for style in ("fn", "class"):
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    cwd = os.getcwd()
+                    os.chdir(tmp_dir)
+                    try:
+                        package = f"scenarios_{style}_{kind}_{size}"
+                        Path(package).mkdir()
+                        paths = generate_tree(Path(package), style, kind, size)
+                        elapsed, loaded = asyncio.run(load_tree(style, paths))
+                    finally:
+                        os.chdir(cwd)
+                        for name in [m for m in sys.modules if m.startswith(package)]:
+                            del sys.modules[name]
+                results.add("discovery", elapsed, "s",
+                            style=style, kind=kind, size=size, loaded=loaded)
+
+
+async def load_tree(style: str, paths: List[Path]) -> Any:
+    if style == "fn":
+        loader: Any = ScenarioLoader(ModuleFileLoader())
+    else:
+        loader = ScenarioFileLoader(ModuleFileLoader())
+
+    loaded = 0
+    started_at = perf_counter()
+    for path in paths:
+        loaded += len(await loader.load(path))
+    return perf_counter() - started_at, loaded
+
+
+def make_module(name: str, source: str) -> ModuleType:
+    module = ModuleType(name)
+    module.__file__ = f"{name}.py"
+    exec(compile(dedent(source), module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def bench_class_generation(results: Results, count: int) -> None:
+    rows = ", ".join(f"params({r})" for r in range(ROWS_PER_SCENARIO))
+    sources = {
+        "plain": "@scenario()\ndef create_user():\n    pass\n",
+        "params": f"@scenario([{rows}])\ndef create_user(user_id):\n    pass\n",
+        "lazy_params": f"@scenario(iter([{rows}]))\ndef create_user(user_id):\n    pass\n",
+    }
+    header = HEADERS["fn"]
+    loader = ScenarioLoader(ModuleFileLoader())
+
+    for kind, source in sources.items():
+        elapsed = 0
+        built = 0
+        for idx in range(count):
+            # Lazy params are consumed once, so every iteration needs a fresh module
+            module = make_module(f"bench_class_generation_{kind}_{idx}", header + source)
+            descriptor = module.create_user
+            started_at = perf_counter_ns()
+            built += len(loader._build_vedro_scenarios(descriptor, module))
+            elapsed += perf_counter_ns() - started_at
+        results.add("class_generation", elapsed / built, "ns/class", kind=kind, count=count)
+
+
+def bench_do_overhead(results: Results, calls: int) -> None:
+    loader = ScenarioLoader(ModuleFileLoader())
+    module = make_module("bench_do_overhead", HEADERS["fn"] + '''
+@scenario()
+def plain():
+    pass
+
+@scenario([params(1)])
+def with_params(user_id):
+    pass
+
+@scenario(iter([params(1)]))
+def with_row(user_id):
+    pass
+''')
+
+    def noop() -> None:
+        pass
+
+    results.add("do_overhead", measure_calls(noop, calls), "ns/call", kind="direct")
+    for name in ("plain", "with_params", "with_row"):
+        scenario_cls, = loader._build_vedro_scenarios(getattr(module, name), module)
+        results.add("do_overhead", measure_calls(scenario_cls().do, calls), "ns/call", kind=name)
+
+
+def measure_calls(fn: Callable[[], Any], calls: int, repeat: int = 5) -> float:
+    # Best of `repeat` rounds, per call
+    rounds = []
+    for _ in range(repeat):
+        started_at = perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        rounds.append((perf_counter_ns() - started_at) / calls)
+    return min(rounds)
+
+
+def bench_step_overhead(results: Results, steps: int) -> None:
+    def run_fn_steps() -> None:
+        with given:
+            pass
+        with when("named step"):
+            pass
+        with then:
+            pass
+
+    class ClassScenario(vedro.Scenario):
+        def given(self) -> None:
+            pass
+
+        def when(self) -> None:
+            pass
+
+        def then(self) -> None:
+            pass
+
+    class_scenario = ClassScenario()
+
+    def run_class_steps() -> None:
+        class_scenario.given()
+        class_scenario.when()
+        class_scenario.then()
+
+    results.add("step_overhead", measure_calls(run_fn_steps, steps) / 3, "ns/step", style="fn")
+    results.add("step_overhead", measure_calls(run_class_steps, steps) / 3, "ns/step",
+                style="class")
+
+
+def bench_traceback_filtering(results: Results, count: int, depth: int = 20) -> None:
+    def recurse(level: int) -> None:
+        if level == 0:
+            raise AssertionError("failed")
+        recurse(level - 1)
+
+    loader = ScenarioLoader(ModuleFileLoader())
+    module = make_module("bench_traceback_filtering", HEADERS["fn"] + '''
+FAIL = None
+
+@scenario()
+def failing():
+    with when:
+        FAIL()
+''')
+    module.FAIL = lambda: recurse(depth)
+    scenario_cls, = loader._build_vedro_scenarios(module.failing, module)
+    try:
+        scenario_cls().do()
+    except AssertionError as e:
+        assert e.__traceback__ is not None
+        exc_info = ExcInfo(type(e), e, e.__traceback__)
+
+    plugin = VedroFnPlugin(VedroFn)
+    orig_tb = exc_info.traceback
+
+    def filter_once() -> None:
+        exc_info.traceback = orig_tb
+        plugin._on_exception_raised(ExceptionRaisedEvent(exc_info))
+
+    def filter_and_render_once() -> None:
+        filter_once()
+        # Reporters read the traceback to render it
+        exc_info.traceback
+
+    filter_once()  # warm up (lazy filter creation)
+    results.add("traceback_filtering", measure_calls(filter_once, count), "ns/exception",
+                depth=depth, rendered=False)
+    results.add("traceback_filtering", measure_calls(filter_and_render_once, count),
+                "ns/exception", depth=depth, rendered=True)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    def key(result: Dict[str, Any]) -> str:
+        return json.dumps([result["name"], result["params"]], sort_keys=True)
+
+    base = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n{'benchmark':<64} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for result in current["results"]:
+        prev: Optional[Dict[str, Any]] = base.get(key(result))
+        if prev is None or prev["value"] == 0:
+            continue
+        ratio = result["value"] / prev["value"]
+        flag = " !" if ratio > threshold else ""
+        regressions += bool(flag)
+        params = " ".join(f"{k}={v}" for k, v in result["params"].items())
+        print(f"{result['name'] + ' ' + params:<64} {prev['value']:>12.3f} "
+              f"{result['value']:>12.3f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="vedro-fn benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000],
+                        help="Number of scenarios in synthetic trees (e.g. 1000 10000 100000)")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--only", nargs="+", choices=["discovery", "class_generation",
+                                                      "do_overhead", "step_overhead",
+                                                      "traceback_filtering"])
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Ratio to current/baseline considered a regression")
+    args = parser.parse_args()
+
+    def enabled(name: str) -> bool:
+        return (args.only is None) or (name in args.only)
+
+    results = Results()
+    if enabled("discovery"):
+        bench_discovery(results, args.sizes)
+    if enabled("class_generation"):
+        bench_class_generation(results, max(args.calls // 100, 1))
+    if enabled("do_overhead"):
+        bench_do_overhead(results, args.calls)
+    if enabled("step_overhead"):
+        bench_step_overhead(results, args.calls)
+    if enabled("traceback_filtering"):
+        bench_traceback_filtering(results, max(args.calls // 10, 1))
+
+    current = results.dump()
+    if args.output is not None:
+        args.output.write_text(json.dumps(current, indent=2))
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if compare(current, baseline, args.threshold) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
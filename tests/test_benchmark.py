@@ -0,0 +1,132 @@
+import asyncio
+from pathlib import Path
+from textwrap import dedent
+from typing import List
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher
+from vedro.events import ScenarioPassedEvent
+
+from vedro_fn import BenchmarkStats, VedroFn, VedroFnPlugin, benchmark, benchmark_async
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+def test_benchmark_calls():
+    with given:
+        calls = []
+
+    with when:
+        stats = benchmark(lambda: calls.append(1), repeat=20, warmup=5)
+
+    with then:
+        assert len(calls) == 25
+        assert stats.count == 20
+        assert stats.min <= stats.p50 <= stats.p95 <= stats.p99 <= stats.max
+
+
+async def test_benchmark_async_calls():
+    with given:
+        calls = []
+
+        async def fn() -> None:
+            await asyncio.sleep(0)
+            calls.append(1)
+
+    with when:
+        stats = await benchmark_async(fn, repeat=10, warmup=2)
+
+    with then:
+        assert len(calls) == 12
+        assert stats.count == 10
+
+
+@pytest.mark.parametrize(("repeat", "warmup"), [(0, 0), (1, -1)])
+def test_benchmark_invalid_args(repeat: int, warmup: int):
+    with when, pytest.raises(Exception) as exc:
+        benchmark(lambda: None, repeat=repeat, warmup=warmup)
+
+    with then:
+        assert exc.type is ValueError
+
+
+def test_percentiles():
+    with given:
+        stats = BenchmarkStats("get user", [i * 1_000_000 for i in range(100, 0, -1)])
+
+    with when:
+        res = (stats.p50, stats.p95, stats.p99, stats.max, stats.percentile(0))
+
+    with then:
+        assert res == pytest.approx((0.0505, 0.09505, 0.09901, 0.1, 0.001))
+        assert str(stats) == ("benchmark get user: n=100, p50 50.500ms, p95 95.050ms, "
+                              "p99 99.010ms, max 100.000ms")
+
+
+async def test_benchmark_details(*, loader: Loader, tmp_scn_dir: Path, dispatcher: Dispatcher):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        events: List[ScenarioPassedEvent] = []
+        dispatcher.listen(ScenarioPassedEvent, events.append)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, benchmark, given, when, then
+            @scenario()
+            def encode():
+                with given:
+                    data = "banana" * 100
+                with when:
+                    stats = benchmark(data.encode, repeat=50, name="encode")
+                with then:
+                    assert stats.p99 < 1.0
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.passed == 1
+        details = events[0].scenario_result.extra_details
+        assert len(details) == 1
+        assert details[0].startswith("benchmark encode: n=50, p50 ")
+
+
+async def test_benchmark_details_per_scenario(*, loader: Loader, tmp_scn_dir: Path,
+                                              dispatcher: Dispatcher):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        events: List[ScenarioPassedEvent] = []
+        dispatcher.listen(ScenarioPassedEvent, events.append)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, benchmark
+            @scenario()
+            def encode():
+                benchmark("banana".encode, repeat=5, name="encode")
+            @scenario()
+            def decode():
+                pass
+        '''))
+        scenarios = await loader.load(path)
+        benchmark(lambda: None, repeat=5, name="outside")
+
+    with when:
+        await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        details = [event.scenario_result.extra_details for event in events]
+        assert len(details) == 2
+        assert len(details[0]) == 1
+        assert details[0][0].startswith("benchmark encode: n=5, p50 ")
+        assert details[1] == []
@@ -0,0 +1,263 @@
+import subprocess
+import sys
+from argparse import Namespace
+from pathlib import Path
+from textwrap import dedent
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Config, Dispatcher, ModuleFileLoader, Report
+from vedro.events import ArgParsedEvent, CleanupEvent, ConfigLoadedEvent, StartupEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._impact_map import ImpactMap, get_changed_files
+from vedro_fn._import_graph import ImportGraph
+from vedro_fn._scenario_loader import ScenarioLoader
+
+from ._utils import ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, tmp_scn_dir
+
+__all__ = ("tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def project(tmp_scn_dir: Path, tmp_path: Path,
+            monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    helpers_dir = tmp_path / "impact_helpers"
+    helpers_dir.mkdir()
+    (helpers_dir / "__init__.py").write_text("")
+    (helpers_dir / "db.py").write_text("DSN = 'sqlite://'\n")
+    (helpers_dir / "users.py").write_text("from .db import DSN\n")
+
+    (tmp_scn_dir / "create_user.py").write_text(dedent('''
+        from vedro_fn import scenario
+        from impact_helpers.users import DSN
+        @scenario()
+        def create_user():
+            pass
+    '''))
+    (tmp_scn_dir / "connect.py").write_text(dedent('''
+        from vedro_fn import scenario
+        from impact_helpers import db
+        @scenario()
+        def connect():
+            pass
+    '''))
+    (tmp_scn_dir / "ping.py").write_text(dedent('''
+        from vedro_fn import scenario
+        @scenario()
+        def ping():
+            pass
+    '''))
+
+    yield tmp_path
+
+    for name in [name for name in sys.modules if name.startswith("impact_helpers")]:
+        del sys.modules[name]
+
+
+def git(project_dir: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@test", *args],
+                   cwd=project_dir, check=True, capture_output=True)
+
+
+async def test_record_dependencies(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        import_graph = ImportGraph()
+        loader = ScenarioLoader(ModuleFileLoader(), import_graph=import_graph)
+
+    with when:
+        for name in ("create_user", "connect", "ping"):
+            await loader.load(tmp_scn_dir / f"{name}.py")
+
+    with then:
+        assert import_graph.dependencies(project) == {
+            "scenarios/create_user.py": [
+                "impact_helpers/__init__.py",
+                "impact_helpers/db.py",
+                "impact_helpers/users.py",
+                "scenarios/create_user.py",
+            ],
+            "scenarios/connect.py": [
+                "impact_helpers/__init__.py",
+                "impact_helpers/db.py",
+                "scenarios/connect.py",
+            ],
+            "scenarios/ping.py": ["scenarios/ping.py"],
+        }
+
+
+async def test_record_params_source_reads(*, project: Path, tmp_scn_dir: Path,
+                                          monkeypatch: pytest.MonkeyPatch):
+    with given:
+        monkeypatch.chdir(project)
+        (project / "users.jsonl").write_text('{"name": "Bob"}\n')
+        (tmp_scn_dir / "load_users.py").write_text(dedent('''
+            from vedro_fn import scenario, params_from_jsonl
+            @scenario(params_from_jsonl("users.jsonl"))
+            def load_user(name):
+                pass
+        '''))
+
+        import_graph = ImportGraph()
+        loader = ScenarioLoader(ModuleFileLoader(), import_graph=import_graph)
+
+    with when:
+        await loader.load(tmp_scn_dir / "load_users.py")
+
+    with then:
+        assert import_graph.dependencies(project) == {
+            "scenarios/load_users.py": ["scenarios/load_users.py", "users.jsonl"],
+        }
+
+
+@pytest.mark.parametrize(("changed", "expected"), [
+    ({"scenarios/a.py"}, True),
+    ({"helpers/db.py"}, True),
+    ({"helpers/users.py"}, False),
+    (set(), False),
+])
+def test_is_affected(changed, expected, *, tmp_path: Path):
+    with given:
+        impact_map = ImpactMap(tmp_path / "impact.json")
+        impact_map.update({"scenarios/a.py": ["helpers/db.py", "scenarios/a.py"]})
+
+    with when:
+        res = impact_map.is_affected(Path("scenarios/a.py"), changed)
+
+    with then:
+        assert res is expected
+
+
+@pytest.mark.parametrize(("changed", "expected"), [
+    ({"scenarios/a.py", "helpers/db.py", "data/users.jsonl"}, set()),
+    ({"vedro.cfg.py", "helpers/db.py"}, {"vedro.cfg.py"}),
+    ({"helpers/plugins.py", "data/orders.csv"}, {"helpers/plugins.py", "data/orders.csv"}),
+    ({"README.md", "docs/index.rst"}, set()),
+])
+def test_get_uncovered(changed, expected, *, tmp_path: Path):
+    with given:
+        impact_map = ImpactMap(tmp_path / "impact.json")
+        impact_map.update({"scenarios/a.py": ["data/users.jsonl", "helpers/db.py",
+                                              "scenarios/a.py"]})
+
+    with when:
+        res = impact_map.get_uncovered(changed)
+
+    with then:
+        assert res == expected
+
+
+def test_unknown_scenario_is_affected(*, tmp_path: Path):
+    with given:
+        impact_map = ImpactMap(tmp_path / "impact.json")
+
+    with when:
+        res = impact_map.is_affected(Path("scenarios/new.py"), set())
+
+    with then:
+        assert res is True
+
+
+def test_get_changed_files(*, project: Path):
+    with given:
+        git(project, "init", "-q")
+        git(project, "add", ".")
+        git(project, "commit", "-q", "-m", "init")
+
+        (project / "impact_helpers" / "db.py").write_text("DSN = 'postgres://'\n")
+        (project / "impact_helpers" / "cache.py").write_text("")
+
+    with when:
+        changed = get_changed_files(project)
+
+    with then:
+        assert changed == {"impact_helpers/db.py", "impact_helpers/cache.py"}
+
+
+def test_get_changed_files_outside_repo(*, tmp_path: Path):
+    with when, pytest.raises(Exception) as exc:
+        get_changed_files(tmp_path, "HEAD")
+
+    with then:
+        assert exc.type is RuntimeError
+
+
+async def test_select_affected_scenarios(*, project: Path, tmp_scn_dir: Path,
+                                         dispatcher: Dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            impact_selection = True
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), Mock(Config, project_dir=project)))
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_changed="HEAD")))
+
+        git(project, "init", "-q")
+        git(project, "add", ".")
+        git(project, "commit", "-q", "-m", "init")
+        (project / "impact_helpers" / "users.py").write_text("from .db import DSN  # edit\n")
+
+        loader = plugin._create_scenario_loader(ModuleFileLoader())
+        scenarios = []
+        for name in ("create_user", "connect", "ping"):
+            for scn in await loader.load(tmp_scn_dir / f"{name}.py"):
+                scenarios.append(create_vscenario(scn, project_dir=project))
+        scheduler = ScenarioScheduler(scenarios)
+
+    with when:
+        await dispatcher.fire(StartupEvent(scheduler))
+
+    with then:
+        assert [scn.subject async for scn in scheduler] == ["create user"]
+        assert (project / ".vedro" / "vedro_fn" / "impact.json").exists()
+
+        report = Report()
+        await dispatcher.fire(CleanupEvent(report))
+        assert report.summary == [
+            "vedro-fn impact: 1 of 3 scenarios selected, 1 files changed since HEAD"
+        ]
+
+
+async def test_select_all_if_not_covered(*, project: Path, tmp_scn_dir: Path,
+                                         dispatcher: Dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            impact_selection = True
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), Mock(Config, project_dir=project)))
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_changed="HEAD")))
+
+        (project / "vedro.cfg.py").write_text("")
+        git(project, "init", "-q")
+        git(project, "add", ".")
+        git(project, "commit", "-q", "-m", "init")
+        (project / "vedro.cfg.py").write_text("import vedro  # edit\n")
+
+        loader = plugin._create_scenario_loader(ModuleFileLoader())
+        scenarios = []
+        for name in ("create_user", "connect", "ping"):
+            for scn in await loader.load(tmp_scn_dir / f"{name}.py"):
+                scenarios.append(create_vscenario(scn, project_dir=project))
+        scheduler = ScenarioScheduler(scenarios)
+
+    with when:
+        await dispatcher.fire(StartupEvent(scheduler))
+
+    with then:
+        assert [scn.subject async for scn in scheduler] == ["create user", "connect", "ping"]
+
+        report = Report()
+        await dispatcher.fire(CleanupEvent(report))
+        assert report.summary == [
+            "vedro-fn impact: all 3 scenarios selected, 1 files changed since HEAD, "
+            "not covered by the impact map: vedro.cfg.py"
+        ]
@@ -0,0 +1,236 @@
+import sys
+from collections import deque
+from pathlib import Path
+from textwrap import dedent
+from time import perf_counter
+from typing import List, Type
+
+import pytest
+from baby_steps import given, then, when
+from pytest import raises
+from vedro import Scenario
+from vedro.core import Dispatcher, Report
+from vedro.events import CleanupEvent, ScenarioReportedEvent, StartupEvent
+from vedro.plugins.deferrer import Deferrer, DeferrerPlugin, _deferrer
+
+from vedro_fn import StepTimingsRecordedEvent, VedroFn, VedroFnPlugin, scenario
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioRunner, ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def events(dispatcher: Dispatcher) -> List[StepTimingsRecordedEvent]:
+    class _VedroFn(VedroFn):
+        step_timings = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+
+    events: List[StepTimingsRecordedEvent] = []
+    dispatcher.listen(StepTimingsRecordedEvent, events.append)
+    return events
+
+
+async def run_scheduled(scenarios: List[Type[Scenario]], dispatcher: Dispatcher, *,
+                        project_dir: Path) -> Report:
+    scheduler = ScenarioScheduler([create_vscenario(scn, project_dir=project_dir)
+                                   for scn in scenarios])
+    await dispatcher.fire(StartupEvent(scheduler))
+    report = await ScenarioRunner(dispatcher).run(scheduler)
+    await dispatcher.fire(CleanupEvent(report))
+    return report
+
+
+def write_scenario(tmp_scn_dir: Path, rows: str, *, limit: int = 2) -> Path:
+    path = tmp_scn_dir / "scenario.py"
+    path.write_text(dedent(f'''
+        from asyncio import sleep
+        from vedro import params
+        from vedro_fn import scenario, when
+
+        running, peak = [], []
+
+        @scenario.concurrently(limit={limit})({rows})
+        async def check_row(row):
+            running.append(row)
+            peak.append(len(running))
+            try:
+                with when("wait"):
+                    await sleep(0.05)
+                assert row != 3
+            finally:
+                running.remove(row)
+    '''))
+    return path
+
+
+@pytest.mark.usefixtures(events.__name__)
+@pytest.mark.parametrize("rows", [
+    "[params(1), params(2), params(3), params(4)]",
+    "iter([params(1), params(2), params(3), params(4)])",
+])
+async def test_rows_run_concurrently(rows: str, *, loader: Loader, tmp_scn_dir: Path,
+                                     dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir, rows, limit=4)
+        scenarios = await loader.load(path)
+
+        reported: List[ScenarioReportedEvent] = []
+        dispatcher.listen(ScenarioReportedEvent, reported.append)
+
+    with when:
+        started_at = perf_counter()
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+        elapsed = perf_counter() - started_at
+
+    with then:
+        assert elapsed < 0.15
+        assert max(sys.modules[scenarios[0].__module__].peak) == 4
+        assert report.passed == 3
+        assert report.failed == 1
+        # Reported one by one, in the scheduled order
+        assert [e.aggregated_result.scenario.unique_id for e in reported] == [
+            create_vscenario(scn, project_dir=tmp_path).unique_id for scn in scenarios
+        ]
+
+
+@pytest.mark.usefixtures(events.__name__)
+async def test_rows_concurrency_limit(*, loader: Loader, tmp_scn_dir: Path,
+                                      dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir, "[params(1), params(2), params(4), params(5)]")
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert report.passed == 4
+        assert max(sys.modules[scenarios[0].__module__].peak) == 2
+
+
+async def test_rows_step_timings(*, loader: Loader, tmp_scn_dir: Path, dispatcher: Dispatcher,
+                                 tmp_path: Path, events: List[StepTimingsRecordedEvent]):
+    with given:
+        path = write_scenario(tmp_scn_dir, "[params(1), params(2), params(3)]")
+        scenarios = await loader.load(path)
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert [[(t.kind, t.name) for t in e.step_timings] for e in events] == [
+            [("when", "wait")], [("when", "wait")], [("when", "wait")]
+        ]
+
+
+async def test_rows_run_one_by_one_when_not_scheduled(*, loader: Loader, tmp_scn_dir: Path,
+                                                      dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir, "[params(1), params(2), params(3)]")
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert report.passed == 2
+        assert report.failed == 1
+        assert max(sys.modules[scenarios[0].__module__].peak) == 1
+
+
+@pytest.mark.usefixtures(events.__name__)
+async def test_skipped_rows_not_started(*, loader: Loader, tmp_scn_dir: Path,
+                                        dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir, "[params(1), params[skip](3), params(2)]")
+        path.write_text(path.read_text().replace("from vedro import params",
+                                                 "from vedro import params, skip"))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert report.passed == 2
+        assert report.skipped == 1
+        assert sorted(sys.modules[scenarios[0].__module__].peak) == [1, 2]
+
+
+@pytest.mark.usefixtures(events.__name__)
+async def test_rows_defer_and_elapsed(*, loader: Loader, tmp_scn_dir: Path,
+                                      dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        DeferrerPlugin(Deferrer).subscribe(dispatcher)
+        reported: List[ScenarioReportedEvent] = []
+        dispatcher.listen(ScenarioReportedEvent, reported.append)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from asyncio import sleep
+            from vedro import defer, params
+            from vedro_fn import scenario
+
+            log = []
+
+            @scenario.concurrently(limit=3)([params(3), params(2), params(1)])
+            async def cleanup_row(row):
+                defer(log.append, ("cleanup", row))
+                await sleep(0.05 * row)
+                log.append(("done", row))
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        # Each row is cleaned up when it is reported, not when the first row ends
+        assert sys.modules[scenarios[0].__module__].log == [
+            ("done", 1), ("cleanup", 1),
+            ("done", 2), ("cleanup", 2),
+            ("done", 3), ("cleanup", 3),
+        ]
+        elapsed = [e.aggregated_result.elapsed for e in reported]
+        assert all(0.05 * row <= x < 0.05 * row + 0.04 for row, x in enumerate(elapsed, 1))
+
+
+@pytest.mark.usefixtures(events.__name__)
+async def test_rows_restore_deferred_queue(*, loader: Loader, tmp_scn_dir: Path,
+                                           dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir, "[params(1), params(2)]")
+        scenarios = await loader.load(path)
+        assert type(_deferrer._queue) is deque
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert type(_deferrer._queue) is deque
+
+
+def test_concurrently_requires_async_scenario():
+    with when, raises(BaseException) as exc:
+        @scenario.concurrently(limit=2)([])
+        def check_row(row):
+            pass
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value) == ("Only async scenarios can run param rows concurrently, "
+                                  "'check_row' is not async")
+
+
+def test_concurrently_limit_validation():
+    with when, raises(BaseException) as exc:
+        scenario.concurrently(limit=0)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == "limit must be greater than 0, 0 given"
@@ -0,0 +1,151 @@
+import os
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+
+from vedro_fn._discovery_cache import DiscoveryCache
+from vedro_fn._scenario_index import IndexedScenario, ModuleIndex
+
+from ._utils import tmp_scn_dir
+
+__all__ = ("tmp_scn_dir",)  # fixtures
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / ".vedro" / "vedro_fn" / "discovery.json"
+
+
+def write_scenario(path: Path, name: str = "create_user") -> None:
+    path.write_text(dedent(f'''
+        from vedro_fn import scenario
+        @scenario()
+        def {name}():
+            pass
+    '''))
+
+
+def test_cache_miss(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+        cache = DiscoveryCache(cache_path)
+
+    with when:
+        index = cache.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidated) == (0, 1, 0)
+
+
+def test_cache_hit(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache = DiscoveryCache(cache_path)
+        cache.index(path)
+        cache.save()
+
+        cache = DiscoveryCache(cache_path)
+
+    with when:
+        index = cache.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidated) == (1, 0, 0)
+        assert cache.stats.hit_rate == 1.0
+
+
+def test_cache_persisted(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache = DiscoveryCache(cache_path)
+        cache.index(path)
+        cache.save()
+
+    with when:
+        index = DiscoveryCache(cache_path).get(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+
+
+def test_cache_touched_file(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache = DiscoveryCache(cache_path)
+        cache.index(path)
+        cache.save()
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        cache = DiscoveryCache(cache_path)
+
+    with when:
+        index = cache.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidated) == (1, 0, 0)
+
+
+def test_cache_invalidated(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache = DiscoveryCache(cache_path)
+        cache.index(path)
+        cache.save()
+
+        write_scenario(path, "update_user")
+        cache = DiscoveryCache(cache_path)
+
+    with when:
+        index = cache.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("update_user", 4)])
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidated) == (0, 0, 1)
+
+
+def test_cache_prune_deleted_files(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache = DiscoveryCache(cache_path)
+        cache.index(path)
+        path.unlink()
+
+    with when:
+        cache.save()
+
+    with then:
+        assert DiscoveryCache(cache_path).get(path) is None
+
+
+def test_cache_corrupted(*, tmp_scn_dir: Path, cache_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        write_scenario(path)
+
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text("{")
+        cache = DiscoveryCache(cache_path)
+
+    with when:
+        index = cache.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+        assert cache.stats.misses == 1
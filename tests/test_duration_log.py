@@ -0,0 +1,169 @@
+from pathlib import Path
+from textwrap import dedent
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Config, Dispatcher
+from vedro.events import CleanupEvent, ConfigLoadedEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._duration_log import DurationLog
+from vedro_fn._row_ids import get_row_key
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def regression_detection(dispatcher: Dispatcher) -> VedroFnPlugin:
+    class _VedroFn(VedroFn):
+        regression_detection = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+def test_append_runs(tmp_path: Path):
+    with given:
+        log_path = tmp_path / "durations.jsonl"
+        DurationLog(log_path).append({"a": 0.1})
+
+    with when:
+        DurationLog(log_path).append({"a": 0.2, "b": 0.123456})
+
+    with then:
+        assert DurationLog(log_path).runs == [{"a": 0.1}, {"a": 0.2, "b": 0.1235}]
+        assert len(log_path.read_text().splitlines()) == 2
+
+
+def test_compact_runs(tmp_path: Path):
+    with given:
+        log_path = tmp_path / "durations.jsonl"
+        duration_log = DurationLog(log_path, max_runs=2)
+        for idx in range(4):
+            duration_log.append({"a": idx})
+
+    with when:
+        duration_log.append({"a": 4})
+
+    with then:
+        assert DurationLog(log_path).runs == [{"a": 3}, {"a": 4}]
+        assert len(log_path.read_text().splitlines()) == 2
+
+
+def test_skip_invalid_lines(tmp_path: Path):
+    with given:
+        log_path = tmp_path / "durations.jsonl"
+        log_path.write_text('{"version": 2, "durations": {"a": 0.1}}\n'
+                            '{"version": 1, "durations": {"a": 0.2}}\n'
+                            '{"version": 2, "durat')
+
+    with when:
+        runs = DurationLog(log_path).runs
+
+    with then:
+        assert runs == [{"a": 0.1}]
+
+
+def test_latest_durations(tmp_path: Path):
+    with given:
+        duration_log = DurationLog(tmp_path / "durations.jsonl")
+        duration_log.append({"a": 0.1, "b": 0.2})
+        duration_log.append({"a": 0.3})
+
+    with when:
+        latest = duration_log.latest
+
+    with then:
+        assert latest == {"a": 0.3, "b": 0.2}
+
+
+def test_find_regressions(tmp_path: Path):
+    with given:
+        duration_log = DurationLog(tmp_path / "durations.jsonl")
+        for duration in (0.10, 0.12, 0.11, 0.50):
+            duration_log.append({"slow": duration, "stable": 0.2, "noisy": 0.001})
+        duration_log.append({"slow": 0.11, "stable": 0.2, "noisy": 0.001, "new": 0.1})
+
+    with when:
+        regressions = duration_log.find_regressions(
+            {"slow": 0.3, "stable": 0.21, "noisy": 0.01, "new": 1.0, "unknown": 1.0},
+            window=4,
+        )
+
+    with then:
+        assert [r.key for r in regressions] == ["slow"]
+        regression, = regressions
+        assert regression.baseline == pytest.approx(0.115)
+        assert regression.samples == 4
+        assert str(regression) == "slow: 0.30s, baseline 0.11s (x2.6 over 4 runs)"
+
+
+@pytest.mark.usefixtures(regression_detection.__name__)
+async def test_report_regressions(*, dispatcher: Dispatcher, loader: Loader,
+                                  tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        config_ = Mock(Config, project_dir=tmp_path)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from time import sleep
+            from vedro import params
+            from vedro_fn import scenario
+            @scenario([params(0.1), params(0)])
+            def wait(seconds):
+                sleep(seconds)
+        '''))
+        scenarios = await loader.load(path)
+        row_keys = [get_row_key(create_vscenario(scn, project_dir=tmp_path))
+                    for scn in scenarios]
+
+        log_path = tmp_path / ".vedro" / "vedro_fn" / "durations.jsonl"
+        for _ in range(3):
+            DurationLog(log_path).append({row_key: 0.001 for row_key in row_keys})
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_path)
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        slow, = [key for scn, key in zip(scenarios, row_keys)
+                 if scn.__vedro__template_args__.arguments["args"] == (0.1,)]
+        assert report.summary[0] == "vedro-fn regressions: 1 of 2 scenarios slower than baseline"
+        assert report.summary[1].startswith(f"  {slow}: 0.1")
+        assert len(DurationLog(log_path).runs) == 4
+
+
+async def test_keep_runs_for_regression_window(*, dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        class _VedroFn(VedroFn):
+            regression_detection = True
+            regression_window = 80
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+
+    with when:
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), Mock(Config, project_dir=tmp_path)))
+
+    with then:
+        assert plugin._duration_log.max_runs == 80
+
+
+def test_invalid_regression_window():
+    with given:
+        class _VedroFn(VedroFn):
+            regression_window = 0
+
+    with when, pytest.raises(Exception) as exc:
+        VedroFnPlugin(_VedroFn)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == "regression_window must be greater than 0, 0 given"
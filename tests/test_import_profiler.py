@@ -0,0 +1,202 @@
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from textwrap import dedent
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Config, Dispatcher, ModuleFileLoader, Report
+from vedro.events import ArgParsedEvent, ArgParseEvent, CleanupEvent, ConfigLoadedEvent
+
+from vedro_fn import VedroFnPlugin
+from vedro_fn._import_graph import ImportGraph
+from vedro_fn._import_profiler import ImportProfiler
+from vedro_fn._scenario_loader import ScenarioLoader
+
+from ._utils import dispatcher, tmp_scn_dir, vedro_fn
+
+__all__ = ("tmp_scn_dir", "dispatcher", "vedro_fn",)  # fixtures
+
+
+@pytest.fixture
+def project(tmp_scn_dir: Path, tmp_path: Path,
+            monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    helpers_dir = tmp_path / "profiled_helpers"
+    helpers_dir.mkdir()
+    (helpers_dir / "__init__.py").write_text("")
+    (helpers_dir / "slow.py").write_text(dedent('''
+        from time import sleep
+        from . import data
+        sleep(0.05)
+    '''))
+    (helpers_dir / "data.py").write_text("ROWS = [bytes(1024) for _ in range(1024)]\n")
+    (helpers_dir / "fast.py").write_text("from .data import ROWS\n")
+
+    (tmp_scn_dir / "slow.py").write_text(dedent('''
+        from vedro_fn import scenario
+        from profiled_helpers import slow
+        @scenario()
+        def use_slow():
+            pass
+    '''))
+    (tmp_scn_dir / "fast.py").write_text(dedent('''
+        from vedro_fn import scenario
+        from profiled_helpers.fast import ROWS
+        @scenario()
+        def use_fast():
+            pass
+    '''))
+
+    yield tmp_path
+
+    for name in [name for name in sys.modules if name.startswith("profiled_helpers")]:
+        del sys.modules[name]
+
+
+async def test_profile_imports(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        profiler = ImportProfiler()
+        loader = ScenarioLoader(ModuleFileLoader(), import_profiler=profiler)
+
+    with when:
+        scenarios = await loader.load(tmp_scn_dir / "slow.py")
+        scenarios += await loader.load(tmp_scn_dir / "fast.py")
+
+    with then:
+        assert len(scenarios) == 2
+        slow = profiler.profiles[tmp_scn_dir / "slow.py"]
+        assert slow.import_time >= 0.05
+        assert slow.import_allocated == 0
+        assert slow.build_time > 0
+
+        names = [timing.name for timing in slow.imports]
+        assert names == ["profiled_helpers.data", "profiled_helpers.slow"]
+        heaviest = slow.heaviest(1)[0]
+        assert heaviest.name == "profiled_helpers.slow"
+        assert heaviest.cumulative_time > heaviest.self_time >= 0.05
+
+        # Modules are attributed to the first scenario file importing them
+        fast = profiler.profiles[tmp_scn_dir / "fast.py"]
+        assert [timing.name for timing in fast.imports] == ["profiled_helpers.fast"]
+        assert not tracemalloc.is_tracing()
+
+
+async def test_profile_plain_import(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        (tmp_scn_dir / "plain.py").write_text(dedent('''
+            import profiled_helpers.fast
+            from vedro_fn import scenario
+            @scenario()
+            def use_fast():
+                pass
+        '''))
+        profiler = ImportProfiler()
+        loader = ScenarioLoader(ModuleFileLoader(), import_profiler=profiler)
+
+    with when:
+        await loader.load(tmp_scn_dir / "plain.py")
+
+    with then:
+        names = [timing.name for timing in profiler.profiles[tmp_scn_dir / "plain.py"].imports]
+        assert "profiled_helpers.fast" in names
+
+
+async def test_profile_import_allocations(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        profiler = ImportProfiler(track_allocations=True)
+        loader = ScenarioLoader(ModuleFileLoader(), import_profiler=profiler)
+
+    with when:
+        await loader.load(tmp_scn_dir / "slow.py")
+
+    with then:
+        slow = profiler.profiles[tmp_scn_dir / "slow.py"]
+        assert slow.import_allocated >= 1024 ** 2
+        assert str(slow).endswith(" MiB")
+        assert profiler.summary()[0].endswith(" MiB allocated")
+        assert not tracemalloc.is_tracing()
+
+
+async def test_profile_imports_with_import_graph(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        profiler, import_graph = ImportProfiler(), ImportGraph()
+        loader = ScenarioLoader(ModuleFileLoader(), import_profiler=profiler,
+                                import_graph=import_graph)
+
+    with when:
+        await loader.load(tmp_scn_dir / "slow.py")
+
+    with then:
+        assert len(profiler.profiles[tmp_scn_dir / "slow.py"].imports) == 2
+        assert "profiled_helpers.slow" in import_graph.edges["scenarios.slow"]
+
+
+async def test_summary(*, project: Path, tmp_scn_dir: Path):
+    with given:
+        profiler = ImportProfiler()
+        loader = ScenarioLoader(ModuleFileLoader(), import_profiler=profiler)
+        await loader.load(tmp_scn_dir / "fast.py")
+        await loader.load(tmp_scn_dir / "slow.py")
+
+    with when:
+        summary = profiler.summary(top=1)
+
+    with then:
+        assert len(summary) == 3
+        assert summary[0].startswith("vedro-fn import profile: 2 files in ")
+        assert "allocated" not in summary[0]
+        assert summary[1].startswith(f"  {tmp_scn_dir / 'slow.py'}: ")
+        assert "; heaviest: profiled_helpers.slow " in summary[1]
+        assert summary[2] == "  ... and 1 more"
+
+
+@pytest.mark.usefixtures(project.__name__)
+async def test_plugin_profile_imports(*, vedro_fn: VedroFnPlugin, dispatcher: Dispatcher,
+                                      tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        config_ = Mock(Config, project_dir=tmp_path)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+        arg_parser = ArgumentParser()
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+        await dispatcher.fire(ArgParsedEvent(arg_parser.parse_args(["--fn-profile-imports"])))
+
+        loader = vedro_fn._create_scenario_loader(ModuleFileLoader())
+        await loader.load(tmp_scn_dir / "slow.py")
+        report = Report()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary[-2].startswith("vedro-fn import profile: 1 files in ")
+        assert report.summary[-1].startswith(f"  {tmp_scn_dir / 'slow.py'}: ")
+
+
+@pytest.mark.usefixtures(project.__name__)
+async def test_plugin_profile_import_allocations(*, vedro_fn: VedroFnPlugin,
+                                                 dispatcher: Dispatcher,
+                                                 tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        config_ = Mock(Config, project_dir=tmp_path)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+        arg_parser = ArgumentParser()
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+        args = arg_parser.parse_args(["--fn-profile-import-allocations"])
+        await dispatcher.fire(ArgParsedEvent(args))
+
+        loader = vedro_fn._create_scenario_loader(ModuleFileLoader())
+        await loader.load(tmp_scn_dir / "slow.py")
+        report = Report()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary[-2].endswith(" MiB allocated")
@@ -4,8 +4,9 @@ from textwrap import dedent
 import pytest
 from baby_steps import given, then, when
 from vedro import Scenario
-from vedro.core import Dispatcher
+from vedro.core import Dispatcher, ModuleFileLoader
 
+from vedro_fn._discovery_cache import DiscoveryCache
 from vedro_fn._scenario_loader import ScenarioLoader as Loader
 
 from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
@@ -127,3 +128,146 @@ async def test_run_skipped_scenario(decorator: str, fn_def: str, *,
 
     with then:
         assert report.total == report.skipped == 1
+
+
+async def test_load_selected_module(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def create_user():
+                pass
+        '''))
+        loader = Loader(ModuleFileLoader(),
+                        scenario_filter=lambda scn: scn.subject == "create user")
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 1
+        assert scenarios[0].__name__ == "Scenario_create_user"
+
+
+async def test_skip_unselected_module(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            raise RuntimeError("must not be imported")
+            @scenario()
+            def create_user():
+                pass
+        '''))
+        loader = Loader(ModuleFileLoader(),
+                        scenario_filter=lambda scn: scn.subject == "update user")
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert scenarios == []
+
+
+async def test_load_incomplete_module(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            def update_user():
+                pass
+            update_user = scenario()(update_user)
+        '''))
+        loader = Loader(ModuleFileLoader(),
+                        scenario_filter=lambda scn: scn.subject == "update user")
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 1
+        assert scenarios[0].__name__ == "Scenario_update_user"
+
+
+async def test_load_module_with_discovery_cache(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def create_user():
+                pass
+        '''))
+        cache = DiscoveryCache(Path(".vedro/vedro_fn/discovery.json"))
+        loader = Loader(ModuleFileLoader(), indexer=cache,
+                        scenario_filter=lambda scn: scn.subject == "create user")
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 1
+        assert cache.get(path).scenarios[0].name == "create_user"
+
+
+async def test_not_indexed_without_filter(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def create_user():
+                pass
+        '''))
+        cache = DiscoveryCache(Path(".vedro/vedro_fn/discovery.json"))
+        loader = Loader(ModuleFileLoader(), indexer=cache)
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 1
+        assert cache.get(path) is None
+        assert cache.stats.total == 0
+
+
+@pytest.mark.parametrize(("source", "expected"), [
+    ("@scenario()\ndef create_user(): pass", ["Scenario_create_user"]),
+    ("@scenario([params(1)])\ndef create_user(x): pass", None),
+    ("create_user = scenario()(lambda: None)", None),
+])
+def test_get_class_names(source: str, expected, *, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text("from vedro import params\nfrom vedro_fn import scenario\n" + source)
+        loader = Loader(ModuleFileLoader())
+
+    with when:
+        class_names = loader.get_class_names(path)
+
+    with then:
+        assert class_names == expected
+
+
+async def test_load_selected_scenarios_only(*, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def create_user():
+                pass
+            @scenario()
+            def update_user():
+                pass
+        '''))
+        loader = Loader(ModuleFileLoader(),
+                        scenario_filter=lambda scn: scn.subject == "update user")
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 1
+        assert scenarios[0].__name__ == "Scenario_update_user"
@@ -1,8 +1,10 @@
+import sys
 from pathlib import Path
 from textwrap import dedent
 
 import pytest
 from baby_steps import given, then, when
+from pytest import raises
 from vedro import Scenario
 from vedro.core import Dispatcher
 
@@ -165,3 +167,175 @@ async def test_run_partially_skipped_parameterized_scenario(*, loader: Loader, t
         assert report.total == 2
         assert report.passed == 1
         assert report.skipped == 1
+
+
+async def test_load_lazy_parameterized_scenario(*, loader: Loader, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+
+            @scenario(params(name) for name in ["Bob", "Alice"])
+            def create_user(username):
+                pass
+        '''))
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 2
+
+        for idx, scenario in enumerate(scenarios, start=1):
+            assert issubclass(scenario, Scenario)
+            assert scenario.subject == "create user"
+            assert scenario.__name__ == f"Scenario_create_user_{idx}_VedroScenario"
+            assert scenario.__vedro__template_index__ == idx
+            assert scenario.__vedro__template_total__ == 2
+
+        assert scenarios[0].__vedro__template_args__.arguments == {"username": "Bob"}
+        assert scenarios[1].__vedro__template_args__.arguments == {"username": "Alice"}
+
+
+async def test_load_lazy_parameterized_scenario_invalid_params(*, loader: Loader,
+                                                               tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+
+            @scenario(iter([params("Bob", "Alice")]))
+            def create_user(username):
+                pass
+        '''))
+
+    with when, raises(BaseException) as exc:
+        await loader.load(path)
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value) == ("too many positional arguments "
+                                  "<scenarios.scenario.Scenario_create_user>")
+
+
+@pytest.mark.parametrize("fn_def", ["def", "async def"])
+async def test_run_lazy_parameterized_scenario(fn_def: str, *, loader: Loader,
+                                               tmp_scn_dir: Path, dispatcher: Dispatcher):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro import params, skip
+            from vedro_fn import scenario
+
+            def rows():
+                yield params("Bob")
+                yield params("Alice")
+                yield params[skip]("Chris")
+
+            @scenario(rows())
+            {fn_def} create_user(username):
+                assert username == "Bob"
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.total == 3
+        assert report.passed == 1
+        assert report.failed == 1
+        assert report.skipped == 1
+
+
+async def test_run_skipped_lazy_parameterized_scenario(*, loader: Loader, tmp_scn_dir: Path,
+                                                       dispatcher: Dispatcher):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params, skip
+            from vedro_fn import scenario
+            @scenario[skip](params(name) for name in ["Bob", "Alice"])
+            def create_user(username):
+                assert username
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.total == report.skipped == 2
+
+
+@pytest.mark.parametrize("rows", ["[params(1), params(2), params(3)]",
+                                  "(params(idx) for idx in range(1, 4))"])
+@pytest.mark.parametrize("fn_def", ["def", "async def"])
+async def test_run_parameterized_scenario_with_shared_setup(rows: str, fn_def: str, *,
+                                                            loader: Loader, tmp_scn_dir: Path,
+                                                            dispatcher: Dispatcher):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro import params
+            from vedro_fn import scenario, given, shared
+
+            CALLS = []
+
+            @shared
+            def seed_users():
+                CALLS.append(1)
+                return object()
+
+            @scenario({rows})
+            {fn_def} create_user(idx):
+                with given:
+                    users = seed_users()
+
+            @scenario({rows})
+            {fn_def} update_user(idx):
+                with given:
+                    users = seed_users()
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.passed == 6
+        # Computed once per scenario family
+        assert sys.modules[scenarios[0].__module__].CALLS == [1, 1]
+
+
+@pytest.mark.parametrize("fn_def", ["def", "async def"])
+async def test_run_scenario_with_params_source(fn_def: str, *, loader: Loader,
+                                               tmp_scn_dir: Path, dispatcher: Dispatcher):
+    with given:
+        Path("users.jsonl").write_text('{"username": "Bob"}\n{"username": "Alice"}\n{oops\n')
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro_fn import scenario, params_from_jsonl
+
+            @scenario(params_from_jsonl("users.jsonl"))
+            {fn_def} create_user(username):
+                assert username == "Bob"
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.total == 3
+        assert report.passed == 1
+        assert report.failed == 2
+        assert [scn.__vedro__template_index__ for scn in scenarios] == [1, 2, 3]
+        assert [scn.__vedro__template_args__ for scn in scenarios] == [None, None, None]
@@ -0,0 +1,217 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import List, Union
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher
+from vedro.events import CleanupEvent, ScenarioFailedEvent, ScenarioPassedEvent, StartupEvent
+
+import vedro_fn
+from vedro_fn import MemoryBudgetExceededError, VedroFn, VedroFnPlugin, memory_budget
+from vedro_fn._memory_tracker import MemoryTracker, parse_size, start_tracking, stop_tracking
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioRunner, ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+MiB = 1024 ** 2
+
+ScenarioEndEvent = Union[ScenarioPassedEvent, ScenarioFailedEvent]
+
+
+@pytest.fixture
+def events(dispatcher: Dispatcher) -> List[ScenarioEndEvent]:
+    class _VedroFn(VedroFn):
+        memory_tracking = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+
+    events: List[ScenarioEndEvent] = []
+    dispatcher.listen(ScenarioPassedEvent, events.append) \
+              .listen(ScenarioFailedEvent, events.append)
+    return events
+
+
+@pytest.mark.parametrize(("size", "expected"), [
+    (1024, 1024),
+    ("512", 512),
+    ("1KB", 1000),
+    ("1.5 MiB", int(1.5 * MiB)),
+    ("2gib", 2 * 1024 ** 3),
+])
+def test_parse_size(size: Union[int, str], expected: int):
+    with when:
+        res = parse_size(size)
+
+    with then:
+        assert res == expected
+
+
+@pytest.mark.parametrize("size", ["", "1 XB", "-1MiB", 0])
+def test_parse_invalid_size(size: Union[int, str]):
+    with when, pytest.raises(Exception) as exc:
+        memory_budget(size)
+
+    with then:
+        assert exc.type is ValueError
+
+
+def test_track_steps():
+    with given:
+        tracker = MemoryTracker()
+        token = start_tracking(tracker)
+
+    with when:
+        with vedro_fn.given("allocate"):
+            kept = bytearray(4 * MiB)
+            with vedro_fn.when("allocate temporary"):
+                temporary = bytearray(8 * MiB)
+                del temporary
+        stop_tracking(tracker, token)
+
+    with then:
+        assert [s.label for s in tracker.steps] == ["when allocate temporary", "given allocate"]
+        inner, outer = tracker.steps
+        assert 8 * MiB <= inner.peak < 9 * MiB
+        assert abs(inner.net) < MiB
+        assert 12 * MiB <= outer.peak < 13 * MiB
+        assert 4 * MiB <= outer.net < 5 * MiB
+        assert 12 * MiB <= tracker.peak < 13 * MiB
+        assert len(kept) == 4 * MiB
+
+
+async def test_memory_details(*, loader: Loader, tmp_scn_dir: Path,
+                              dispatcher: Dispatcher, events: List[ScenarioEndEvent]):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, when
+            @scenario()
+            def allocate():
+                with when("allocate"):
+                    data = bytearray(2 * 1024 ** 2)
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.passed == 1
+        scenario_details, step_details = events[0].scenario_result.extra_details
+        assert scenario_details.startswith("memory peak 2.")
+        assert step_details.startswith("when allocate: peak 2.")
+
+
+@pytest.mark.parametrize("fn_def", ["def", "async def"])
+async def test_memory_budget_exceeded(fn_def: str, *, loader: Loader, tmp_scn_dir: Path,
+                                      dispatcher: Dispatcher, events: List[ScenarioEndEvent]):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro_fn import scenario, memory_budget, given, when
+            @scenario[memory_budget("1MiB")]()
+            {fn_def} allocate():
+                with given:
+                    small = bytearray(1024)
+                with when("allocate"):
+                    data = bytearray(2 * 1024 ** 2)
+        '''))
+        scenarios = await loader.load(path)
+        allocation_site = f"{path.absolute()}:8"
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.failed == 1
+
+        exc_info = events[0].scenario_result.step_results[0].exc_info
+        assert exc_info.type is MemoryBudgetExceededError
+        message = str(exc_info.value)
+        assert "exceeds budget 1.00 MiB (exceeded in when allocate)" in message
+        assert f"{allocation_site}: +2.00 MiB" in message
+
+
+async def test_memory_budget_without_tracking(*, loader: Loader, tmp_scn_dir: Path,
+                                              dispatcher: Dispatcher):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, memory_budget
+            @scenario[memory_budget(1024)]()
+            def allocate():
+                data = bytearray(1024 ** 2)
+            @scenario()
+            def not_tracked():
+                data = bytearray(1024 ** 2)
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert (report.passed, report.failed) == (1, 1)
+
+
+async def test_memory_budget_on_concurrent_rows(*, loader: Loader, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario, memory_budget
+            @scenario.concurrently(limit=2)([params(1), params[memory_budget("1MiB")](2)])
+            async def allocate(row):
+                pass
+        '''))
+
+    with when, pytest.raises(BaseException) as exc:
+        await loader.load(path)
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value) == ("@memory_budget can't be used with scenarios running "
+                                  "concurrently or in threads "
+                                  "<scenarios.scenario.Scenario_allocate>")
+
+
+async def test_skip_batched_scenarios(*, loader: Loader, tmp_scn_dir: Path,
+                                      dispatcher: Dispatcher, events: List[ScenarioEndEvent]):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+            @scenario.concurrently(limit=2)([params(1), params(2)])
+            async def concurrent(row):
+                pass
+            @scenario()
+            def one_by_one():
+                pass
+        '''))
+        scenarios = await loader.load(path)
+        scheduler = ScenarioScheduler([create_vscenario(scn, project_dir=tmp_scn_dir)
+                                       for scn in scenarios])
+        await dispatcher.fire(StartupEvent(scheduler))
+
+    with when:
+        report = await ScenarioRunner(dispatcher).run(scheduler)
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.passed == 3
+        details = {e.scenario_result.scenario.subject: e.scenario_result.extra_details
+                   for e in events}
+        assert details["one by one"][0].startswith("memory peak ")
+        assert not any(d.startswith("memory peak ") for d in details["concurrent"])
+        assert report.summary == ["vedro-fn memory tracking: 2 skipped "
+                                  "(scenarios running concurrently or in threads)"]
@@ -0,0 +1,217 @@
+from argparse import ArgumentParser, Namespace
+from itertools import combinations, product
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+from pytest import raises
+from vedro.core import Dispatcher
+from vedro.events import ArgParsedEvent, ArgParseEvent
+
+from vedro_fn import scenario
+from vedro_fn._params_matrix import ParamsMatrix, set_full_matrix
+from vedro_fn._row_ids import get_row_id
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, tmp_scn_dir, vedro_fn
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher", "vedro_fn",)  # fixtures
+
+AXES = {
+    "browser": ["chrome", "firefox", "safari"],
+    "os": ["linux", "macos", "windows"],
+    "locale": ["en", "de", "fr"],
+    "theme": ["light", "dark"],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_full_matrix():
+    yield
+    set_full_matrix(False)
+
+
+def test_full_matrix():
+    with given:
+        matrix = ParamsMatrix({"browser": ["chrome", "firefox"], "os": ["linux", "macos"]})
+
+    with when:
+        rows = list(matrix)
+
+    with then:
+        assert [row.kwargs for row in rows] == [
+            {"browser": "chrome", "os": "linux"},
+            {"browser": "chrome", "os": "macos"},
+            {"browser": "firefox", "os": "linux"},
+            {"browser": "firefox", "os": "macos"},
+        ]
+        assert rows[0].args == ()
+        assert rows[0].id == "browser='chrome',os='linux'"
+        assert matrix.total == 4
+
+
+def test_pairwise_covers_all_pairs():
+    with given:
+        matrix = ParamsMatrix(AXES, reduce="pairwise")
+
+    with when:
+        rows = [row.kwargs for row in matrix]
+
+    with then:
+        assert len(rows) < matrix.total == 54
+        for x, y in combinations(AXES, 2):
+            covered = {(row[x], row[y]) for row in rows}
+            assert covered == set(product(AXES[x], AXES[y]))
+
+
+def test_pairwise_is_deterministic():
+    with given:
+        matrix = ParamsMatrix(AXES, reduce="pairwise")
+
+    with when:
+        first, second = [row.id for row in matrix], [row.id for row in matrix]
+
+    with then:
+        assert first == second
+        assert len(set(first)) == len(first)
+
+
+def test_random_sample():
+    with given:
+        matrix = ParamsMatrix(AXES, reduce="random", sample=10, seed=42)
+        full = [row.id for row in ParamsMatrix(AXES)]
+
+    with when:
+        rows = [row.id for row in matrix]
+
+    with then:
+        assert len(set(rows)) == 10
+        assert rows == [row_id for row_id in full if row_id in rows]
+        assert rows == [row.id for row in ParamsMatrix(AXES, reduce="random", sample=10, seed=42)]
+        assert rows != [row.id for row in ParamsMatrix(AXES, reduce="random", sample=10, seed=7)]
+
+
+def test_random_sample_huge_matrix():
+    with given:
+        axes = {f"axis{i}": list(range(10)) for i in range(20)}
+        matrix = ParamsMatrix(axes, reduce="random", sample=3, seed=42)
+
+    with when:
+        rows = [row.id for row in matrix]
+
+    with then:
+        assert matrix.total == 10 ** 20
+        assert len(set(rows)) == 3
+        assert rows == [row.id for row in ParamsMatrix(axes, reduce="random", sample=3, seed=42)]
+
+
+def test_random_sample_larger_than_matrix():
+    with given:
+        matrix = ParamsMatrix({"os": ["linux", "macos"]}, reduce="random", sample=5)
+
+    with when:
+        rows = [row.kwargs for row in matrix]
+
+    with then:
+        assert rows == [{"os": "linux"}, {"os": "macos"}]
+
+
+def test_full_matrix_ignores_reduction():
+    with given:
+        matrix = ParamsMatrix(AXES, reduce="pairwise")
+        reduced = [row.id for row in matrix]
+        set_full_matrix(True)
+
+    with when:
+        rows = [row.id for row in matrix]
+
+    with then:
+        assert len(rows) == 54
+        assert set(reduced) < set(rows)
+
+
+def test_unstable_repr_value_ids():
+    with given:
+        value = object()
+        matrix = ParamsMatrix({"value": [value, None]})
+
+    with when:
+        rows = list(matrix)
+
+    with then:
+        assert [row.id for row in rows] == ["value=#0", "value=None"]
+        assert rows[0].kwargs == {"value": value}
+
+
+@pytest.mark.parametrize(("axes", "kwargs", "message"), [
+    ({}, {}, "Matrix must have at least one axis"),
+    ({"os": []}, {}, "Axis 'os' has no values"),
+    ({"os": ["linux"]}, {"reduce": "triplewise"}, "reduce must be one of"),
+    ({"os": ["linux"]}, {"reduce": "random"}, "sample must be greater than 0, None given"),
+    ({"os": ["linux"]}, {"sample": 3}, "sample is only supported with reduce='random'"),
+])
+def test_matrix_validation(axes, kwargs, message):
+    with when, raises(BaseException) as exc:
+        ParamsMatrix(axes, **kwargs)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value).startswith(message)
+
+
+def test_scenario_matrix_axes_named_as_options():
+    with when:
+        @scenario.matrix({"reduce": ["sum", "max"]}, reduce="random", sample=1)
+        def aggregate(reduce):
+            pass
+
+    with then:
+        assert len(list(aggregate.params)) == 1
+        assert aggregate.is_lazy is True
+
+
+async def test_load_matrix_scenario(*, loader: Loader, tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+
+            @scenario.matrix(browser=["chrome", "firefox"], os=["linux", "macos", "windows"],
+                             reduce="pairwise")
+            def open_page(browser, os):
+                pass
+        '''))
+
+    with when:
+        scenarios = await loader.load(path)
+
+    with then:
+        assert len(scenarios) == 6
+        vscenario = create_vscenario(scenarios[0], project_dir=tmp_path)
+        assert get_row_id(vscenario) == "browser='chrome',os='linux'"
+        assert vscenario.template_args.arguments == {"browser": "chrome", "os": "linux"}
+
+
+@pytest.mark.usefixtures(vedro_fn.__name__)
+async def test_fn_full_matrix_argument(*, dispatcher: Dispatcher):
+    with given:
+        arg_parser = ArgumentParser()
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+        args = arg_parser.parse_args(["--fn-full-matrix"])
+
+    with when:
+        await dispatcher.fire(ArgParsedEvent(args))
+
+    with then:
+        assert len(list(ParamsMatrix(AXES, reduce="pairwise"))) == 54
+
+
+@pytest.mark.usefixtures(vedro_fn.__name__)
+async def test_reduced_matrix_by_default(*, dispatcher: Dispatcher):
+    with when:
+        await dispatcher.fire(ArgParsedEvent(Namespace()))
+
+    with then:
+        assert len(list(ParamsMatrix(AXES, reduce="pairwise"))) < 54
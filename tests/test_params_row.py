@@ -0,0 +1,30 @@
+from baby_steps import given, then, when
+from vedro import params, skip
+
+from vedro_fn._params_row import ParamsRow, iter_params_rows
+
+
+def test_iter_params_rows():
+    with given:
+        rows = (params("Bob", role="admin"), params[skip]("Alice"))
+
+    with when:
+        result = list(iter_params_rows(iter(rows)))
+
+    with then:
+        assert [(r.args, r.kwargs, r.decorators) for r in result] == [
+            (("Bob",), {"role": "admin"}, ()),
+            (("Alice",), {}, (skip,)),
+        ]
+
+
+def test_iter_params_rows_records():
+    with given:
+        row = ParamsRow(("Bob",), {})
+
+    with when:
+        result = list(iter_params_rows([row]))
+
+    with then:
+        assert result == [row]
+        assert repr(row) == "ParamsRow(('Bob',), {})"
@@ -0,0 +1,142 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import List
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher
+from vedro.events import ScenarioPassedEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin, params_from_csv, params_from_jsonl
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+def test_jsonl_rows(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.jsonl"
+        path.write_text(dedent('''\
+            {"username": "Bob", "age": 42}
+
+            ["Alice", 33]
+            "Chris"
+        '''))
+
+    with when:
+        rows = list(params_from_jsonl(path))
+
+    with then:
+        assert [row.id for row in rows] == [f"{path}:1", f"{path}:3", f"{path}:4"]
+        assert [row.resolve() for row in rows] == [
+            ((), {"username": "Bob", "age": 42}),
+            (("Alice", 33), {}),
+            (("Chris",), {}),
+        ]
+        assert all(row.is_deferred for row in rows)
+
+
+def test_jsonl_rows_id_field(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"id": "bob", "username": "Bob"}\n{"id": 2, "username": "Alice"}\n')
+
+    with when:
+        rows = list(params_from_jsonl(path, id_field="id"))
+
+    with then:
+        assert [row.id for row in rows] == ["bob", "2"]
+
+
+def test_jsonl_rows_id_field_encoding(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"id": "боб", "username": "Bob"}\n', encoding="cp1251")
+
+    with when:
+        rows = list(params_from_jsonl(path, id_field="id", encoding="cp1251"))
+
+    with then:
+        assert [row.id for row in rows] == ["боб"]
+        assert rows[0].resolve() == ((), {"id": "боб", "username": "Bob"})
+
+
+def test_jsonl_rows_missing_id_field(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"username": "Bob"}\n')
+
+    with when, pytest.raises(Exception) as exc:
+        list(params_from_jsonl(path, id_field="id"))
+
+    with then:
+        assert exc.type is KeyError
+
+
+def test_jsonl_rows_decoded_lazily(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"username": "Bob"}\n{invalid\n')
+
+    with when:
+        rows = list(params_from_jsonl(path))
+
+    with then:
+        assert len(rows) == 2
+        with pytest.raises(ValueError):
+            rows[1].resolve()
+
+
+def test_csv_rows(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.csv"
+        path.write_text('username,bio\nBob,"multi\nline"\n\nAlice,short\n')
+
+    with when:
+        rows = list(params_from_csv(path))
+
+    with then:
+        assert [row.id for row in rows] == [f"{path}:3", f"{path}:5"]
+        assert [row.resolve() for row in rows] == [
+            ((), {"username": "Bob", "bio": "multi\nline"}),
+            ((), {"username": "Alice", "bio": "short"}),
+        ]
+
+
+def test_csv_rows_id_field(*, tmp_path: Path):
+    with given:
+        path = tmp_path / "users.csv"
+        path.write_text("id;username\nbob;Bob\nalice;Alice\n")
+
+    with when:
+        rows = list(params_from_csv(path, id_field="id", delimiter=";"))
+
+    with then:
+        assert [row.id for row in rows] == ["bob", "alice"]
+        assert rows[1].resolve() == ((), {"id": "alice", "username": "Alice"})
+
+
+async def test_row_id_in_extra_details(*, loader: Loader, tmp_scn_dir: Path,
+                                       dispatcher: Dispatcher):
+    with given:
+        VedroFnPlugin(VedroFn).subscribe(dispatcher)
+        events: List[ScenarioPassedEvent] = []
+        dispatcher.listen(ScenarioPassedEvent, events.append)
+
+        Path("users.jsonl").write_text('{"id": "bob", "username": "Bob"}\n')
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, params_from_jsonl
+            @scenario(params_from_jsonl("users.jsonl", id_field="id"))
+            def create_user(id, username):
+                pass
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert events[0].scenario_result.extra_details == ["row bob"]
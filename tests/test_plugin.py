@@ -1,10 +1,14 @@
+from argparse import Namespace
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 from baby_steps import given, then, when
-from vedro.core import Config
-from vedro.events import ConfigLoadedEvent
+from vedro.core import Config, Report
+from vedro.events import ArgParsedEvent, CleanupEvent, ConfigLoadedEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._scenario_index import IndexedScenario
 
 from ._utils import dispatcher, vedro_fn
 
@@ -23,3 +27,103 @@ async def test_register_scenario_loader(*, dispatcher):
     with then:
         assert config_.Registry.ScenarioLoader.register.assert_called_once() is None
         assert len(config_.mock_calls) == 1
+
+
+@pytest.mark.parametrize(("static_index", "subject", "expected"), [
+    (False, None, None),
+    (False, "create user", None),
+    (True, None, None),
+])
+async def test_no_scenario_filter(static_index: bool, subject, expected, *, dispatcher):
+    with given:
+        config = type("_VedroFn", (VedroFn,), {"static_index": static_index})
+
+        plugin = VedroFnPlugin(config)
+        plugin.subscribe(dispatcher)
+
+        event = ArgParsedEvent(Namespace(subject=subject))
+
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        assert plugin._create_scenario_filter() is expected
+
+
+async def test_scenario_filter(*, dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            static_index = True
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+
+        await dispatcher.fire(ArgParsedEvent(Namespace(subject="create user")))
+
+    with when:
+        scenario_filter = plugin._create_scenario_filter()
+
+    with then:
+        assert scenario_filter(IndexedScenario("create_user", 1)) is True
+        assert scenario_filter(IndexedScenario("update_user", 1)) is False
+
+
+async def test_discovery_cache_summary(*, dispatcher, tmp_path: Path):
+    with given:
+        class _VedroFn(VedroFn):
+            discovery_cache = True
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+
+        config_ = Mock(Config, project_dir=tmp_path)
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+        report = Report()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary == [
+            "vedro-fn discovery cache: 0.0% hit rate (0 hits, 0 misses, 0 invalidated)"
+        ]
+
+
+async def test_register_scenario_discoverer(*, dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            discovery_workers = 4
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+
+        config_ = Mock(Config)
+
+    with when:
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+    with then:
+        assert config_.Registry.ScenarioDiscoverer.register.assert_called_once() is None
+
+
+async def test_discovery_summary(*, dispatcher, tmp_path: Path):
+    with given:
+        class _VedroFn(VedroFn):
+            discovery_workers = 4
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+
+        loader = plugin._create_scenario_loader(Mock())
+        loader.load_times.update({Path("a.py"): 0.5, Path("b.py"): 1.5})
+
+        report = Report()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary == [
+            "vedro-fn discovery: 2 files loaded in 2.00s, slowest: b.py (1.50s), a.py (0.50s)"
+        ]
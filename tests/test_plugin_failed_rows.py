@@ -0,0 +1,118 @@
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from textwrap import dedent
+from typing import List, Type
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro import Scenario
+from vedro.core import Config, Dispatcher
+from vedro.events import (
+    ArgParsedEvent,
+    ArgParseEvent,
+    CleanupEvent,
+    ConfigLoadedEvent,
+    StartupEvent,
+)
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._row_ids import get_row_id, get_row_key
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def failed_rows(dispatcher: Dispatcher) -> VedroFnPlugin:
+    class _VedroFn(VedroFn):
+        failed_rows = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+async def fire_config_loaded(dispatcher: Dispatcher, project_dir: Path) -> None:
+    config_ = Mock(Config, project_dir=project_dir)
+    await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+
+async def write_scenarios(loader: Loader, tmp_scn_dir: Path, rows: str) -> List[Type[Scenario]]:
+    path = tmp_scn_dir / "scenario.py"
+    path.write_text(dedent(f'''
+        from vedro import params
+        from vedro_fn import scenario
+        @scenario([{rows}])
+        def check_row(row):
+            assert row % 2 == 1
+    '''))
+    return await loader.load(path)
+
+
+@pytest.mark.usefixtures(failed_rows.__name__)
+async def test_add_fn_last_failed_argument(*, dispatcher: Dispatcher):
+    with given:
+        arg_parser = ArgumentParser()
+
+    with when:
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+
+    with then:
+        assert arg_parser.parse_args(["--fn-last-failed"]).fn_last_failed is True
+
+
+async def test_row_id_derived_from_values(*, loader: Loader, tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        scenarios = await write_scenarios(loader, tmp_scn_dir, "params(1), params(2)")
+        row_ids = [get_row_id(create_vscenario(scn, project_dir=tmp_path)) for scn in scenarios]
+
+    with when:
+        scenarios = await write_scenarios(loader, tmp_scn_dir, "params(0), params(2), params(1)")
+        reordered = [get_row_id(create_vscenario(scn, project_dir=tmp_path)) for scn in scenarios]
+
+    with then:
+        assert set(row_ids) < set(reordered)
+        assert len(set(reordered)) == 3
+
+
+async def test_row_id_falls_back_to_index(*, loader: Loader, tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        scenarios = await write_scenarios(loader, tmp_scn_dir, "params(object())")
+        vscenario = create_vscenario(scenarios[0], project_dir=tmp_path)
+
+    with when:
+        row_key = get_row_key(vscenario)
+
+    with then:
+        assert row_key == "scenarios/scenario.py::Scenario_check_row[#1]"
+
+
+@pytest.mark.usefixtures(failed_rows.__name__)
+async def test_rerun_failed_rows(*, dispatcher: Dispatcher, loader: Loader,
+                                 tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await fire_config_loaded(dispatcher, tmp_path)
+        scenarios = await write_scenarios(loader, tmp_scn_dir,
+                                          "params(1), params(2), params(3), params(4)")
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_path)
+        await dispatcher.fire(CleanupEvent(report))
+
+        scenarios = await write_scenarios(loader, tmp_scn_dir,
+                                          "params(4), params(5), params(2), params(1)")
+        vscenarios = [create_vscenario(scn, project_dir=tmp_path) for scn in scenarios]
+        scheduler = ScenarioScheduler(vscenarios)
+
+    with when:
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_last_failed=True)))
+        await dispatcher.fire(StartupEvent(scheduler))
+
+    with then:
+        assert report.failed == 2
+        assert sorted([scn.template_args.arguments["args"] async for scn in scheduler]) == [
+            (2,), (4,)
+        ]
@@ -0,0 +1,191 @@
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from textwrap import dedent
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Config, Dispatcher, ModuleFileLoader, Report
+from vedro.core.scenario_finder import ScenarioFileFinder
+from vedro.core.scenario_finder.scenario_file_finder import AnyFilter, ExtFilter
+from vedro.core.scenario_orderer import StableScenarioOrderer
+from vedro.events import (
+    ArgParsedEvent,
+    ArgParseEvent,
+    CleanupEvent,
+    ConfigLoadedEvent,
+    StartupEvent,
+)
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._duration_log import DurationLog
+from vedro_fn._row_ids import get_row_key
+from vedro_fn._scenario_discoverer import ScenarioDiscoverer
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def sharding(dispatcher: Dispatcher) -> VedroFnPlugin:
+    class _VedroFn(VedroFn):
+        sharding = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+async def fire_config_loaded(dispatcher: Dispatcher, project_dir: Path) -> None:
+    config_ = Mock(Config, project_dir=project_dir)
+    await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+
+async def write_scenarios(loader: Loader, tmp_scn_dir: Path):
+    path = tmp_scn_dir / "scenario.py"
+    path.write_text(dedent('''
+        from vedro import params
+        from vedro_fn import scenario
+        @scenario([params(1), params(2), params(3), params(4)])
+        def check_row(row):
+            pass
+    '''))
+    return await loader.load(path)
+
+
+@pytest.mark.usefixtures(sharding.__name__)
+async def test_add_fn_shard_argument(*, dispatcher: Dispatcher):
+    with given:
+        arg_parser = ArgumentParser()
+
+    with when:
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+
+    with then:
+        assert arg_parser.parse_args(["--fn-shard", "1/2"]).fn_shard == "1/2"
+
+
+@pytest.mark.parametrize("fn_shard", ["0/2", "3/2", "1", "a/b"])
+@pytest.mark.usefixtures(sharding.__name__)
+async def test_invalid_fn_shard(fn_shard: str, *, dispatcher: Dispatcher):
+    with when, pytest.raises(Exception) as exc:
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_shard=fn_shard)))
+
+    with then:
+        assert exc.type is ValueError
+
+
+@pytest.mark.usefixtures(sharding.__name__)
+async def test_shards_cover_all_rows(*, dispatcher: Dispatcher, loader: Loader,
+                                     tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await fire_config_loaded(dispatcher, tmp_path)
+        scenarios = [create_vscenario(scn, project_dir=tmp_path)
+                     for scn in await write_scenarios(loader, tmp_scn_dir)]
+
+        durations = {scn.unique_id: float(idx) for idx, scn in enumerate(scenarios, start=1)}
+        duration_log = DurationLog(tmp_path / ".vedro" / "vedro_fn" / "durations.jsonl")
+        duration_log.append({get_row_key(scn): durations[scn.unique_id] for scn in scenarios})
+
+    with when:
+        selected = []
+        for index in (1, 2):
+            await dispatcher.fire(ArgParsedEvent(Namespace(fn_shard=f"{index}/2")))
+            scheduler = ScenarioScheduler(scenarios)
+            await dispatcher.fire(StartupEvent(scheduler))
+            selected.append([scn.unique_id async for scn in scheduler])
+
+    with then:
+        assert sorted(selected[0] + selected[1]) == sorted(durations)
+        assert sum(durations[uid] for uid in selected[0]) == 5.0
+        assert sum(durations[uid] for uid in selected[1]) == 5.0
+
+
+@pytest.mark.usefixtures(sharding.__name__)
+async def test_record_durations(*, dispatcher: Dispatcher, loader: Loader,
+                                tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await fire_config_loaded(dispatcher, tmp_path)
+        scenarios = await write_scenarios(loader, tmp_scn_dir)
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_path)
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        duration_log = DurationLog(tmp_path / ".vedro" / "vedro_fn" / "durations.jsonl")
+        row_keys = [get_row_key(create_vscenario(scn, project_dir=tmp_path))
+                    for scn in scenarios]
+        assert sorted(duration_log.latest) == sorted(row_keys)
+        assert all(key.startswith("scenarios/scenario.py::Scenario_check_row[")
+                   for key in row_keys)
+
+
+@pytest.mark.usefixtures(sharding.__name__)
+async def test_shard_summary(*, dispatcher: Dispatcher, loader: Loader,
+                             tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await fire_config_loaded(dispatcher, tmp_path)
+        scenarios = [create_vscenario(scn, project_dir=tmp_path)
+                     for scn in await write_scenarios(loader, tmp_scn_dir)]
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_shard="1/1")))
+        await dispatcher.fire(StartupEvent(ScenarioScheduler(scenarios)))
+
+        report = Report()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary == [
+            "vedro-fn shard 1/1: 4 scenarios (estimated 0.00s, 4 without history)"
+        ]
+
+
+async def test_skip_modules_of_other_shards(*, dispatcher: Dispatcher, tmp_scn_dir: Path,
+                                            tmp_path: Path):
+    with given:
+        class _VedroFn(VedroFn):
+            sharding = True
+            discovery_cache = True
+
+        plugin = VedroFnPlugin(_VedroFn)
+        plugin.subscribe(dispatcher)
+        await fire_config_loaded(dispatcher, tmp_path)
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_shard="1/2")))
+
+        (tmp_scn_dir / "a.py").write_text("from vedro_fn import scenario\n"
+                                          "@scenario()\ndef a(): pass\n")
+        for name in ("b", "c"):
+            (tmp_scn_dir / f"{name}.py").write_text(dedent(f'''
+                from vedro_fn import scenario
+                @scenario()
+                def {name}(): pass
+                raise RuntimeError("must not be imported")
+            '''))
+        duration_log = DurationLog(tmp_path / ".vedro" / "vedro_fn" / "durations.jsonl")
+        duration_log.append({"scenarios/a.py::Scenario_a": 3.0,
+                             "scenarios/b.py::Scenario_b": 2.0,
+                             "scenarios/c.py::Scenario_c": 1.0})
+
+        finder = ScenarioFileFinder(file_filter=AnyFilter([ExtFilter(only=["py"])]),
+                                    dir_filter=AnyFilter([]))
+        discoverer = ScenarioDiscoverer(finder, plugin._create_scenario_loader(ModuleFileLoader()),
+                                        StableScenarioOrderer(), workers=0,
+                                        module_selector=plugin._create_module_selector())
+
+    with when:
+        scenarios = await discoverer.discover(tmp_scn_dir, project_dir=tmp_path)
+        await dispatcher.fire(StartupEvent(ScenarioScheduler(scenarios)))
+
+    with then:
+        assert [scn.unique_id for scn in scenarios] == ["scenarios/a.py::Scenario_a"]
+
+        report = Report()
+        await dispatcher.fire(CleanupEvent(report))
+        assert report.summary[0] == ("vedro-fn shard 1/2: 1 scenarios (estimated 3.00s, "
+                                     "0 without history), 2 files not imported")
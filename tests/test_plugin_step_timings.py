@@ -0,0 +1,113 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import List
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher
+
+from vedro_fn import StepTimingsRecordedEvent, VedroFn, VedroFnPlugin
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def events(dispatcher: Dispatcher) -> List[StepTimingsRecordedEvent]:
+    class _VedroFn(VedroFn):
+        step_timings = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+
+    events: List[StepTimingsRecordedEvent] = []
+    dispatcher.listen(StepTimingsRecordedEvent, events.append)
+    return events
+
+
+@pytest.mark.parametrize("fn_def", ["def", "async def"])
+async def test_step_timings(fn_def: str, *, loader: Loader, tmp_scn_dir: Path,
+                            dispatcher: Dispatcher, events: List[StepTimingsRecordedEvent]):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro_fn import scenario, given, when, then
+            @scenario()
+            {fn_def} create_user():
+                with given:
+                    pass
+                with when("create user"):
+                    pass
+                with then:
+                    assert False
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.failed == 1
+        assert len(events) == 1
+
+        timings = events[0].step_timings
+        assert [(t.kind, t.name, t.failed) for t in timings] == [
+            ("given", None, False),
+            ("when", "create user", False),
+            ("then", None, True),
+        ]
+        assert events[0].scenario_result.extra_details == [str(t) for t in timings]
+
+
+async def test_step_timings_per_scenario(*, loader: Loader, tmp_scn_dir: Path,
+                                         dispatcher: Dispatcher,
+                                         events: List[StepTimingsRecordedEvent]):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario, when
+            @scenario([params(1), params(2)])
+            def create_users(count):
+                for _ in range(count):
+                    with when:
+                        pass
+        '''))
+
+        scenarios = await loader.load(path)
+
+    with when:
+        await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert [len(e.step_timings) for e in events] == [2, 1]
+
+
+async def test_step_timings_disabled(*, loader: Loader, tmp_scn_dir: Path,
+                                     dispatcher: Dispatcher):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        events: List[StepTimingsRecordedEvent] = []
+        dispatcher.listen(StepTimingsRecordedEvent, events.append)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, when
+            @scenario()
+            def create_user():
+                with when:
+                    pass
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with then:
+        assert report.passed == 1
+        assert events == []
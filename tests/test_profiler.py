@@ -0,0 +1,183 @@
+import time
+from argparse import Namespace
+from contextvars import copy_context
+from pathlib import Path
+from pstats import Stats
+from textwrap import dedent
+from threading import Thread
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Config, Dispatcher
+from vedro.events import ArgParsedEvent, CleanupEvent, ConfigLoadedEvent, StartupEvent
+
+import vedro_fn
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._profiler import ScenarioProfiler, profile_body, start_profiling, stop_profiling
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioRunner, ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def profiling(dispatcher: Dispatcher) -> VedroFnPlugin:
+    class _VedroFn(VedroFn):
+        profiling = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+def test_samples_attributed_to_steps():
+    with given:
+        profiler = ScenarioProfiler()
+        token = start_profiling(profiler)
+
+    with when:
+        with profile_body():
+            with vedro_fn.given("create user"):
+                busy(0.05)
+            with vedro_fn.when:
+                busy(0.05)
+        stop_profiling(profiler, token)
+
+    with then:
+        roots = {stack.split(";")[0] for stack in profiler.collapsed_stacks}
+        assert {"given create user", "when"} <= roots
+        assert any("busy" in stack for stack in profiler.collapsed_stacks)
+
+
+def test_only_body_profiled():
+    with given:
+        profiler = ScenarioProfiler()
+        token = start_profiling(profiler)
+
+    with when:
+        busy(0.02)
+        with profile_body():
+            sum(range(100_000))
+        busy(0.02)
+        stop_profiling(profiler, token)
+
+    with then:
+        stats = Stats(profiler._profile)
+        assert not any(func[2] == "busy" for func in stats.stats)  # type: ignore
+        assert not any("busy" in stack for stack in profiler.collapsed_stacks)
+
+
+def test_body_profiled_in_thread():
+    with given:
+        profiler = ScenarioProfiler()
+        token = start_profiling(profiler)
+        context = copy_context()
+
+        def body():
+            with profile_body():
+                busy(0.05)
+
+    with when:
+        thread = Thread(target=context.run, args=(body,))
+        thread.start()
+        thread.join()
+        stop_profiling(profiler, token)
+
+    with then:
+        stats = Stats(profiler._profile)
+        assert any(func[2] == "busy" for func in stats.stats)  # type: ignore
+        assert any("busy" in stack for stack in profiler.collapsed_stacks)
+
+
+def test_steps_not_tracked_without_profiler():
+    with given:
+        profiler = ScenarioProfiler()
+
+    with when:
+        with vedro_fn.given("create user"):
+            pass
+
+    with then:
+        assert profiler._steps == ()
+
+
+@pytest.mark.usefixtures(profiling.__name__)
+async def test_write_profiles(*, dispatcher: Dispatcher, loader: Loader,
+                              tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), Mock(Config, project_dir=tmp_path)))
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario, profile, when
+            @scenario[profile]()
+            def profiled():
+                with when:
+                    sum(range(100_000))
+            @scenario()
+            def not_profiled():
+                pass
+        '''))
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_path)
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        profiles_dir = tmp_path / ".vedro" / "vedro_fn" / "profiles"
+        assert sorted(p.name for p in profiles_dir.iterdir()) == [
+            "scenarios_scenario.py_Scenario_profiled.collapsed",
+            "scenarios_scenario.py_Scenario_profiled.pstats",
+        ]
+        stats = Stats(str(profiles_dir / "scenarios_scenario.py_Scenario_profiled.pstats"))
+        assert any(func[2] == "profiled" for func in stats.stats)  # type: ignore
+        assert report.summary == [f"vedro-fn profiles: 1 written to {profiles_dir}"]
+
+
+@pytest.mark.usefixtures(profiling.__name__)
+async def test_skip_batched_scenarios(*, dispatcher: Dispatcher, loader: Loader,
+                                      tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), Mock(Config, project_dir=tmp_path)))
+        await dispatcher.fire(ArgParsedEvent(Namespace(fn_profile=True)))
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+            @scenario.concurrently(limit=2)([params(1), params(2)])
+            async def concurrent(row):
+                pass
+            @scenario()
+            def one_by_one():
+                pass
+        '''))
+        scenarios = await loader.load(path)
+        scheduler = ScenarioScheduler([create_vscenario(scn, project_dir=tmp_path)
+                                       for scn in scenarios])
+        await dispatcher.fire(StartupEvent(scheduler))
+
+    with when:
+        report = await ScenarioRunner(dispatcher).run(scheduler)
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.passed == 3
+        profiles_dir = tmp_path / ".vedro" / "vedro_fn" / "profiles"
+        assert sorted(p.name for p in profiles_dir.iterdir()) == [
+            "scenarios_scenario.py_Scenario_one_by_one.collapsed",
+            "scenarios_scenario.py_Scenario_one_by_one.pstats",
+        ]
+        assert report.summary == [f"vedro-fn profiles: 1 written to {profiles_dir}, 2 skipped "
+                                  f"(scenarios running concurrently or in threads)"]
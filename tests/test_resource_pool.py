@@ -0,0 +1,182 @@
+import asyncio
+import sys
+from pathlib import Path
+from textwrap import dedent
+from typing import AsyncIterator, List
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher
+from vedro.events import CleanupEvent
+
+from vedro_fn import Resource, VedroFn, VedroFnPlugin, resource
+from vedro_fn._resource_pool import start_leasing, stop_leasing
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import dispatcher, loader, run_scenarios, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+class Connection:
+    def __init__(self, idx: int, events: List[str]) -> None:
+        self.idx = idx
+        self._events = events
+
+    async def __aenter__(self) -> "Connection":
+        self._events.append(f"open {self.idx}")
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._events.append(f"close {self.idx}")
+
+
+def make_resource(events: List[str], **kwargs: int) -> Resource[Connection]:
+    counter = iter(range(1, 100))
+
+    @resource(**kwargs)
+    def connection() -> Connection:
+        return Connection(next(counter), events)
+
+    return connection
+
+
+async def test_reuse_released():
+    with given:
+        events: List[str] = []
+        connection = make_resource(events)
+
+    with when:
+        first = await connection.acquire()
+        connection.release(first)
+        second = await connection.acquire()
+        connection.release(second)
+
+    with then:
+        assert first is second
+        assert (connection.stats.created, connection.stats.reused) == (1, 1)
+        assert events == ["open 1"]
+
+
+async def test_max_size():
+    with given:
+        events: List[str] = []
+        connection = make_resource(events, max_size=2)
+
+        async def use() -> int:
+            async with connection.lease() as conn:
+                await asyncio.sleep(0.01)
+                return conn.idx
+
+    with when:
+        indexes = await asyncio.gather(*[use() for _ in range(6)])
+
+    with then:
+        assert sorted(set(indexes)) == [1, 2]
+        assert connection.stats.created == 2
+        assert connection.stats.reused == 4
+        assert connection.stats.waited == 4
+        assert connection.stats.peak_in_use == 2
+        assert connection.stats.in_use == 0
+
+
+async def test_close_async_generator_resource():
+    with given:
+        events: List[str] = []
+
+        @resource
+        async def session() -> AsyncIterator[str]:
+            events.append("open")
+            yield "session"
+            events.append("close")
+
+        async with session.lease() as value:
+            pass
+
+    with when:
+        await session.close()
+
+    with then:
+        assert value == "session"
+        assert events == ["open", "close"]
+
+
+async def test_release_leases():
+    with given:
+        events: List[str] = []
+        connection = make_resource(events, max_size=1)
+        token = start_leasing([])
+        await connection.acquire()
+
+    with when:
+        stop_leasing(token)
+
+    with then:
+        assert connection.stats.in_use == 0
+        assert (await connection.acquire()).idx == 1
+
+
+async def test_failed_creation_releases_slot():
+    with given:
+        attempts = []
+
+        @resource(max_size=1)
+        def broken() -> Connection:
+            attempts.append(1)
+            raise ConnectionError()
+
+    with when:
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(broken.acquire(), timeout=1)
+
+    with then:
+        assert len(attempts) == 2
+        assert broken.stats.created == 0
+
+
+def test_invalid_max_size():
+    with when, pytest.raises(Exception) as exc:
+        resource(max_size=0)(lambda: Connection(1, []))
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == "max_size must be greater than 0 or None, 0 given"
+
+
+async def test_pooled_between_scenarios(*, loader: Loader, tmp_scn_dir: Path,
+                                        dispatcher: Dispatcher):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario, resource, given, then
+            events = []
+            @resource
+            async def pooled_client():
+                events.append("open")
+                yield object()
+                events.append("close")
+            @scenario([params(1), params(2), params(3)])
+            async def use_client(idx):
+                async with given:
+                    client = await pooled_client.acquire()
+                with then:
+                    assert events == ["open"]
+        '''))
+        scenarios = await loader.load(path)
+        report = await run_scenarios(scenarios, dispatcher, project_dir=tmp_scn_dir)
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.passed == 3
+        assert report.summary == [
+            "vedro-fn resource pooled_client: 1 created, 2 reused, 0 waited, peak 1 in use"
+        ]
+        module = scenarios[0].__module__
+        assert sys.modules[module].events == ["open", "close"]
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import ModuleFileLoader
+from vedro.core.scenario_finder import ScenarioFileFinder
+from vedro.core.scenario_finder.scenario_file_finder import AnyFilter, ExtFilter
+from vedro.core.scenario_orderer import StableScenarioOrderer
+
+from vedro_fn._scenario_discoverer import ScenarioDiscoverer
+from vedro_fn._scenario_loader import ScenarioLoader
+
+from ._utils import tmp_scn_dir
+
+__all__ = ("tmp_scn_dir",)  # fixtures
+
+
+@pytest.fixture
+def loader() -> ScenarioLoader:
+    return ScenarioLoader(ModuleFileLoader())
+
+
+def make_discoverer(loader: ScenarioLoader, *, workers: int) -> ScenarioDiscoverer:
+    finder = ScenarioFileFinder(file_filter=AnyFilter([ExtFilter(only=["py"])]),
+                                dir_filter=AnyFilter([]))
+    return ScenarioDiscoverer(finder, loader, StableScenarioOrderer(), workers=workers)
+
+
+def write_scenario(path: Path, name: str) -> None:
+    path.write_text(dedent(f'''
+        from vedro_fn import scenario
+        @scenario()
+        def {name}():
+            pass
+    '''))
+
+
+@pytest.mark.parametrize("workers", [0, 1, 4])
+async def test_discover(workers: int, *, loader: ScenarioLoader, tmp_scn_dir: Path):
+    with given:
+        for idx in range(1, 6):
+            write_scenario(tmp_scn_dir / f"scenario_{idx}.py", f"create_user_{idx}")
+        discoverer = make_discoverer(loader, workers=workers)
+
+    with when:
+        scenarios = await discoverer.discover(tmp_scn_dir, project_dir=Path.cwd())
+
+    with then:
+        assert [scn.subject for scn in scenarios] == [f"create user {idx}" for idx in range(1, 6)]
+        assert sorted(loader.load_times) == [tmp_scn_dir / f"scenario_{idx}.py"
+                                             for idx in range(1, 6)]
+
+
+async def test_discover_writes_bytecode_cache(*, loader: ScenarioLoader, tmp_scn_dir: Path,
+                                              monkeypatch: pytest.MonkeyPatch):
+    with given:
+        monkeypatch.setattr(sys, "dont_write_bytecode", False)
+        write_scenario(tmp_scn_dir / "scenario.py", "create_user")
+        discoverer = make_discoverer(loader, workers=2)
+
+    with when:
+        await discoverer.discover(tmp_scn_dir, project_dir=Path.cwd())
+
+    with then:
+        assert len(list((tmp_scn_dir / "__pycache__").glob("scenario.*.pyc"))) == 1
+
+
+async def test_discover_syntax_error(*, loader: ScenarioLoader, tmp_scn_dir: Path):
+    with given:
+        (tmp_scn_dir / "scenario.py").write_text("def create_user(:")
+        discoverer = make_discoverer(loader, workers=2)
+
+    with when, pytest.raises(SyntaxError) as exc:
+        await discoverer.discover(tmp_scn_dir, project_dir=Path.cwd())
+
+    with then:
+        assert exc.type is SyntaxError
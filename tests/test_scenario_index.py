@@ -0,0 +1,207 @@
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+
+from vedro_fn._scenario_index import IndexedScenario, ModuleIndex, ScenarioIndexer
+
+
+@pytest.fixture
+def indexer() -> ScenarioIndexer:
+    return ScenarioIndexer()
+
+
+@pytest.mark.parametrize("decorator", ["@scenario", "@scenario()"])
+def test_index_scenario(decorator: str, *, indexer: ScenarioIndexer):
+    with given:
+        path = Path("scenario.py")
+        source = dedent(f'''
+            from vedro_fn import scenario
+            {decorator}
+            def create_user():
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+        assert index.scenarios[0].subject == "create user"
+
+
+def test_index_async_scenario(*, indexer: ScenarioIndexer):
+    with given:
+        source = dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            async def create_user():
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.scenarios == [IndexedScenario("create_user", 4, is_async=True)]
+
+
+@pytest.mark.parametrize(("decorator", "decorators"), [
+    ("@scenario[skip]", ("skip",)),
+    ("@scenario[skip]()", ("skip",)),
+    ("@scenario[skip, only]()", ("skip", "only")),
+    ("@scenario[vedro.skip('reason')]()", ("skip",)),
+])
+def test_index_scenario_decorators(decorator: str, decorators: tuple, *,
+                                   indexer: ScenarioIndexer):
+    with given:
+        source = dedent(f'''
+            import vedro
+            from vedro import only, skip
+            from vedro_fn import scenario
+            {decorator}
+            def create_user():
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.scenarios == [IndexedScenario("create_user", 6, decorators=decorators)]
+
+
+@pytest.mark.parametrize(("decorator", "params"), [
+    ("@scenario([params('Bob'), params('Alice')])", 2),
+    ("@scenario[skip]([params('Bob')])", 1),
+    ("@scenario(ROWS)", None),
+    ("@scenario([*ROWS])", None),
+])
+def test_index_parameterized_scenario(decorator: str, params: int, *, indexer: ScenarioIndexer):
+    with given:
+        source = dedent(f'''
+            from vedro import params, skip
+            from vedro_fn import scenario
+            ROWS = [params("Bob")]
+            {decorator}
+            def create_user(username):
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.scenarios[0].params == params
+
+
+@pytest.mark.parametrize(("decorator", "decorators", "params"), [
+    ("@scenario.matrix(username=['Bob', 'Alice'], reduce='pairwise')", (), None),
+    ("@scenario[skip].matrix({'username': ['Bob']})", ("skip",), None),
+    ("@scenario.concurrently(limit=2)([params('Bob'), params('Alice')])", (), 2),
+    ("@scenario.concurrently(limit=2)(ROWS)", (), None),
+    ("@scenario.threaded()", (), 0),
+    ("@scenario[skip].threaded()([params('Bob')])", ("skip",), 1),
+    ("@vedro_fn.scenario.threaded(False)", (), 0),
+])
+def test_index_scenario_methods(decorator: str, decorators: tuple, params, *,
+                                indexer: ScenarioIndexer):
+    with given:
+        source = dedent(f'''
+            import vedro_fn
+            from vedro import params, skip
+            from vedro_fn import scenario
+            ROWS = [params("Bob")]
+            {decorator}
+            def create_user(username):
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.is_complete is True
+        assert index.scenarios == [IndexedScenario("create_user", 7, decorators=decorators,
+                                                   params=params)]
+
+
+@pytest.mark.parametrize(("imports", "decorator"), [
+    ("from vedro_fn import scenario as scn", "@scn()"),
+    ("import vedro_fn as scn", "@scn.scenario()"),
+])
+def test_index_aliased_scenario(imports: str, decorator: str, *, indexer: ScenarioIndexer):
+    with given:
+        source = dedent(f'''
+            {imports}
+            {decorator}
+            def create_user():
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.is_complete is True
+        assert index.scenarios == [IndexedScenario("create_user", 4)]
+
+
+def test_index_private_scenario(*, indexer: ScenarioIndexer):
+    with given:
+        source = dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def _create_user():
+                pass
+        ''')
+
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index == ModuleIndex(Path("scenario.py"), [], is_complete=True)
+
+
+@pytest.mark.parametrize("source", [
+    "from vedro_fn import scenario\ncreate_user = scenario()(lambda: None)",
+    "from vedro_fn import scenario\nif True:\n    @scenario()\n    def create_user(): pass",
+    "def create_user(:",
+])
+def test_index_incomplete_module(source: str, *, indexer: ScenarioIndexer):
+    with when:
+        index = indexer.index_source(source, Path("scenario.py"))
+
+    with then:
+        assert index.is_complete is False
+
+
+def test_index_file(*, indexer: ScenarioIndexer, tmp_path: Path):
+    with given:
+        path = tmp_path / "scenario.py"
+        path.write_text(dedent('''
+            from vedro_fn import scenario
+            @scenario()
+            def create_user():
+                pass
+        '''))
+
+    with when:
+        index = indexer.index(path)
+
+    with then:
+        assert index == ModuleIndex(path, [IndexedScenario("create_user", 4)])
+
+
+@pytest.mark.parametrize(("params", "class_names"), [
+    (0, ("Scenario_create_user",)),
+    (2, ("Scenario_create_user_1_VedroScenario", "Scenario_create_user_2_VedroScenario")),
+    (None, ()),
+])
+def test_indexed_scenario_class_names(params, class_names: tuple):
+    with when:
+        scenario = IndexedScenario("create_user", 1, params=params)
+
+    with then:
+        assert scenario.class_names == class_names
@@ -0,0 +1,89 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher, ModuleFileLoader
+from vedro.core.scenario_finder import ScenarioFileFinder
+from vedro.core.scenario_finder.scenario_file_finder import AnyFilter, ExtFilter
+from vedro.events import ArgParseEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._discovery_cache import DiscoveryCache
+from vedro_fn._scenario_lister import ScenarioLister
+from vedro_fn._scenario_loader import ScenarioLoader
+
+from ._utils import dispatcher, tmp_scn_dir
+
+__all__ = ("tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def cache() -> DiscoveryCache:
+    return DiscoveryCache(Path(".vedro/vedro_fn/discovery.json"))
+
+
+@pytest.fixture
+def lister(tmp_scn_dir: Path, cache: DiscoveryCache) -> ScenarioLister:
+    finder = ScenarioFileFinder(file_filter=AnyFilter([ExtFilter(only=["py"])]),
+                                dir_filter=AnyFilter([]))
+    loader = ScenarioLoader(ModuleFileLoader())
+    return ScenarioLister(finder, loader, tmp_scn_dir, project_dir=Path.cwd(), indexer=cache)
+
+
+async def test_list_without_import(*, lister: ScenarioLister, cache: DiscoveryCache,
+                                   tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+            raise RuntimeError("must not be imported")
+            @scenario()
+            def create_user():
+                pass
+            @scenario([params(1), params(2)])
+            def delete_user(user_id):
+                pass
+        '''))
+
+    with when:
+        lines = await lister.list()
+
+    with then:
+        assert lines == [f"{path}::create user", f"{path}::delete user"]
+        assert cache.stats.misses == 1
+
+
+async def test_list_incomplete_module(*, lister: ScenarioLister, tmp_scn_dir: Path):
+    with given:
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from vedro import params
+            from vedro_fn import scenario
+            def update_user(user_id):
+                pass
+            update_user = scenario([params(1), params(2)])(update_user)
+        '''))
+
+    with when:
+        lines = await lister.list()
+
+    with then:
+        assert lines == [f"{path}::update user"]
+
+
+async def test_add_fn_list_argument(*, dispatcher: Dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            discovery_cache = True
+
+        VedroFnPlugin(_VedroFn).subscribe(dispatcher)
+        arg_parser = ArgumentParser()
+
+    with when:
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+
+    with then:
+        assert arg_parser.parse_args(["--fn-list"]).fn_list is True
@@ -0,0 +1,142 @@
+import os
+from argparse import ArgumentParser
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+from vedro.core import Dispatcher, ModuleFileLoader
+from vedro.core.scenario_finder import ScenarioFileFinder
+from vedro.core.scenario_finder.scenario_file_finder import AnyFilter, ExtFilter
+from vedro.events import ArgParseEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._scenario_loader import ScenarioLoader
+from vedro_fn._scenario_watcher import ScenarioWatcher
+
+from ._utils import dispatcher, tmp_scn_dir
+
+__all__ = ("tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+@pytest.fixture
+def watcher(tmp_scn_dir: Path) -> ScenarioWatcher:
+    finder = ScenarioFileFinder(file_filter=AnyFilter([ExtFilter(only=["py"])]),
+                                dir_filter=AnyFilter([]))
+    loader = ScenarioLoader(ModuleFileLoader())
+    return ScenarioWatcher(finder, loader, tmp_scn_dir, project_dir=Path.cwd())
+
+
+def write_scenarios(path: Path, *, helper: str = "1", body: str = "pass",
+                    comment: str = "") -> None:
+    path.write_text(dedent(f'''
+        from vedro import params
+        from vedro_fn import scenario
+        HELPER = {helper}  {comment}
+        @scenario()
+        def create_user():
+            {body}
+        @scenario([params(1), params(2)])
+        def delete_user(user_id):
+            pass
+    '''))
+    # Make sure the change is visible even on filesystems with coarse mtime
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def scenario_path(tmp_scn_dir: Path) -> Path:
+    path = tmp_scn_dir / "scenario.py"
+    write_scenarios(path)
+    return path
+
+
+async def test_nothing_changed(*, watcher: ScenarioWatcher, scenario_path: Path):
+    with given:
+        await watcher.snapshot()
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert scenarios == []
+
+
+async def test_scenario_changed(*, watcher: ScenarioWatcher, scenario_path: Path):
+    with given:
+        await watcher.snapshot()
+        write_scenarios(scenario_path, body="assert True")
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert [scn.subject for scn in scenarios] == ["create user"]
+        assert await watcher.poll() == []
+
+
+async def test_module_level_code_changed(*, watcher: ScenarioWatcher, scenario_path: Path):
+    with given:
+        await watcher.snapshot()
+        write_scenarios(scenario_path, helper="2")
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert [scn.subject for scn in scenarios] == ["create user", "delete user",
+                                                      "delete user"]
+
+
+async def test_comment_changed(*, watcher: ScenarioWatcher, scenario_path: Path):
+    with given:
+        await watcher.snapshot()
+        write_scenarios(scenario_path, comment="# comment")
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert scenarios == []
+
+
+async def test_new_module(*, watcher: ScenarioWatcher, scenario_path: Path, tmp_scn_dir: Path):
+    with given:
+        await watcher.snapshot()
+        write_scenarios(tmp_scn_dir / "new_scenario.py")
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert [scn.rel_path for scn in scenarios] == [tmp_scn_dir / "new_scenario.py"] * 3
+
+
+async def test_broken_module(*, watcher: ScenarioWatcher, scenario_path: Path,
+                             capsys: pytest.CaptureFixture[str]):
+    with given:
+        await watcher.snapshot()
+        write_scenarios(scenario_path, body="raise RuntimeError('boom')\n        1/")
+
+    with when:
+        scenarios = await watcher.poll()
+
+    with then:
+        assert scenarios == []
+        assert f"failed to load {scenario_path}: SyntaxError" in capsys.readouterr().err
+
+
+async def test_add_fn_watch_argument(*, dispatcher: Dispatcher):
+    with given:
+        class _VedroFn(VedroFn):
+            watch = True
+
+        VedroFnPlugin(_VedroFn).subscribe(dispatcher)
+        arg_parser = ArgumentParser()
+
+    with when:
+        await dispatcher.fire(ArgParseEvent(arg_parser))
+
+    with then:
+        assert arg_parser.parse_args(["--fn-watch"]).fn_watch is True
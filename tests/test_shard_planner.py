@@ -0,0 +1,61 @@
+import pytest
+from baby_steps import given, then, when
+
+from vedro_fn._shard_planner import ShardPlanner
+
+
+def test_plan_by_durations():
+    with given:
+        durations = {"a#1": 8.0, "a#2": 1.0, "a#3": 1.0, "b": 4.0, "c": 3.0, "d": 1.0}
+        planner = ShardPlanner(2)
+
+    with when:
+        plan = planner.plan(durations.keys(), durations)
+
+    with then:
+        loads = [sum(durations[uid] for uid, shard in plan.items() if shard == idx)
+                 for idx in range(2)]
+        assert loads == [9.0, 9.0]
+
+
+def test_plan_is_stable():
+    with given:
+        unique_ids = [f"scenarios/scenario.py::Scenario_fn#{idx}" for idx in range(1, 101)]
+        durations = {uid: float(idx % 7) for idx, uid in enumerate(unique_ids[:50])}
+        planner = ShardPlanner(4)
+
+    with when:
+        plan = planner.plan(unique_ids, durations)
+
+    with then:
+        assert plan == planner.plan(reversed(unique_ids), durations)
+        assert set(plan.values()) == {0, 1, 2, 3}
+
+
+def test_plan_unseen_pinned_by_hash():
+    with given:
+        planner = ShardPlanner(4)
+        unseen = "scenarios/scenario.py::Scenario_fn#3"
+
+    with when:
+        plan = planner.plan([unseen, "a", "b"], {"a": 1.0, "b": 2.0})
+
+    with then:
+        assert plan[unseen] == planner.plan([unseen], {})[unseen]
+
+
+def test_plan_single_shard():
+    with when:
+        plan = ShardPlanner(1).plan(["a", "b"], {"a": 1.0})
+
+    with then:
+        assert plan == {"a": 0, "b": 0}
+
+
+def test_invalid_total():
+    with when, pytest.raises(Exception) as exc:
+        ShardPlanner(0)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == "Number of shards must be greater than 0, 0 given"
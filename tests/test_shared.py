@@ -0,0 +1,236 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from typing import List
+
+import pytest
+from baby_steps import given, then, when
+
+from vedro_fn import shared
+from vedro_fn._shared import (
+    SharedFunction,
+    clear_shared,
+    reset_scenario_family,
+    set_scenario_family,
+)
+
+
+def in_family(module: str, name: str, fn: SharedFunction, *args):
+    token = set_scenario_family((module, name))
+    try:
+        return fn(*args)
+    finally:
+        reset_scenario_family(token)
+
+
+@pytest.fixture
+def calls() -> List[str]:
+    return []
+
+
+def test_shared_family_scope(*, calls: List[str]):
+    with given:
+        @shared
+        def setup(name):
+            calls.append(name)
+            return object()
+
+    with when:
+        first = in_family("scenarios.scenario", "create_user", setup, "Bob")
+        second = in_family("scenarios.scenario", "create_user", setup, "Bob")
+
+    with then:
+        assert first is second
+        assert calls == ["Bob"]
+
+
+def test_shared_args(*, calls: List[str]):
+    with given:
+        @shared
+        def setup(name):
+            calls.append(name)
+
+    with when:
+        for name in ["Bob", "Alice", "Bob"]:
+            in_family("scenarios.scenario", "create_user", setup, name)
+
+    with then:
+        assert calls == ["Bob", "Alice"]
+
+
+def test_shared_family_eviction(*, calls: List[str]):
+    with given:
+        @shared
+        def setup():
+            calls.append("setup")
+
+    with when:
+        for name in ["create_user", "update_user", "create_user"]:
+            in_family("scenarios.scenario", name, setup)
+
+    with then:
+        assert calls == ["setup"] * 3
+
+
+def test_shared_family_maxsize(*, calls: List[str]):
+    with given:
+        @shared(maxsize=None)
+        def setup():
+            calls.append("setup")
+
+    with when:
+        for name in ["create_user", "update_user", "create_user"]:
+            in_family("scenarios.scenario", name, setup)
+
+    with then:
+        assert calls == ["setup"] * 2
+
+
+@pytest.mark.parametrize(("scope", "expected"), [
+    ("family", 3),
+    ("module", 2),
+    ("session", 1),
+])
+def test_shared_scope(scope: str, expected: int, *, calls: List[str]):
+    with given:
+        @shared(scope=scope)
+        def setup():
+            calls.append("setup")
+
+    with when:
+        in_family("scenarios.users", "create_user", setup)
+        in_family("scenarios.users", "update_user", setup)
+        in_family("scenarios.orders", "create_order", setup)
+
+    with then:
+        assert len(calls) == expected
+
+
+async def test_shared_async(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        async def setup():
+            calls.append("setup")
+            return object()
+
+    with when:
+        first = await setup()
+        second = await setup()
+
+    with then:
+        assert first is second
+        assert calls == ["setup"]
+
+
+async def test_shared_async_concurrent_calls(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        async def setup():
+            calls.append("setup")
+            await asyncio.sleep(0.01)
+            return object()
+
+    with when:
+        results = await asyncio.gather(setup(), setup(), setup())
+
+    with then:
+        assert results[0] is results[1] is results[2]
+        assert calls == ["setup"]
+
+
+def test_shared_threaded_calls(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        def setup():
+            calls.append("setup")
+            sleep(0.01)
+            return object()
+
+    with when:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: setup(), range(4)))
+
+    with then:
+        assert all(result is results[0] for result in results)
+        assert calls == ["setup"]
+
+
+def test_shared_unhashable_args(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        def setup(user, roles):
+            calls.append(user["name"])
+            return object()
+
+    with when:
+        first = setup({"name": "Bob"}, roles=["admin"])
+        second = setup({"name": "Bob"}, roles=["admin"])
+        third = setup({"name": "Bob"}, roles=["user"])
+
+    with then:
+        assert first is second
+        assert third is not first
+        assert calls == ["Bob", "Bob"]
+
+
+def test_shared_unhashable_args_without_stable_repr():
+    with given:
+        @shared(scope="session")
+        def setup(user, roles):
+            pass
+
+    with when, pytest.raises(Exception) as exc:
+        setup({"name": "Bob"}, roles=[object()])
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value).startswith(
+            "Can't cache test_shared_unhashable_args_without_stable_repr.<locals>.setup(): "
+            "argument 'roles' is unhashable and has no stable repr ([<object object at ")
+
+
+def test_shared_exception_not_cached(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        def setup():
+            calls.append("setup")
+            raise RuntimeError()
+
+        with pytest.raises(RuntimeError):
+            setup()
+
+    with when, pytest.raises(Exception) as exc:
+        setup()
+
+    with then:
+        assert exc.type is RuntimeError
+        assert calls == ["setup"] * 2
+
+
+def test_clear_shared(*, calls: List[str]):
+    with given:
+        @shared(scope="session")
+        def setup():
+            calls.append("setup")
+
+        setup()
+
+    with when:
+        clear_shared()
+        setup()
+
+    with then:
+        assert calls == ["setup"] * 2
+
+
+@pytest.mark.parametrize(("kwargs", "error"), [
+    ({"scope": "package"}, "Unknown scope 'package', expected 'family', 'module' or 'session'"),
+    ({"maxsize": 0}, "maxsize must be greater than 0 or None, 0 given"),
+])
+def test_shared_invalid_args(kwargs, error: str):
+    with when, pytest.raises(Exception) as exc:
+        shared(**kwargs)(lambda: None)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == error
@@ -0,0 +1,352 @@
+import os
+from argparse import ArgumentParser
+from pathlib import Path
+from threading import Lock
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from baby_steps import given, then, when
+from pytest import raises
+from vedro.core import Config, Dispatcher, Report
+from vedro.events import ArgParsedEvent, ArgParseEvent, CleanupEvent, ConfigLoadedEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin, snapshot
+from vedro_fn._snapshot_cache import SnapshotCache, get_snapshot_cache, set_snapshot_cache
+
+from ._utils import dispatcher
+
+__all__ = ("dispatcher",)  # fixtures
+
+
+@pytest.fixture(autouse=True)
+def reset_snapshot_cache() -> None:
+    yield
+    set_snapshot_cache(None)
+
+
+@pytest.fixture
+def calls() -> List[str]:
+    return []
+
+
+def new_cache(tmp_path: Path, max_size: int = 1024 ** 2) -> SnapshotCache:
+    # Each cache is a new run sharing the same directory
+    cache = SnapshotCache(tmp_path / "snapshots", max_size=max_size)
+    set_snapshot_cache(cache)
+    return cache
+
+
+def test_snapshot_loaded_from_disk(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        def setup(name):
+            calls.append(name)
+            return {"name": name, "keys": list(range(3))}
+
+        new_cache(tmp_path)
+        setup("Bob")
+        cache = new_cache(tmp_path)
+
+    with when:
+        result = setup("Bob")
+
+    with then:
+        assert result == {"name": "Bob", "keys": [0, 1, 2]}
+        assert calls == ["Bob"]
+        assert (cache.stats.hits, cache.stats.misses) == (1, 0)
+
+
+def test_snapshot_args(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        def setup(name, *, size=1):
+            calls.append(name)
+            return name * size
+
+        new_cache(tmp_path)
+
+    with when:
+        results = [setup("a"), setup("b"), setup("a", size=2), setup("a"), setup("a", size=2)]
+
+    with then:
+        assert results == ["a", "b", "aa", "a", "aa"]
+        assert calls == ["a", "b", "a"]
+
+
+def test_snapshot_unstable_args(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        def setup(obj):
+            calls.append("setup")
+
+        cache = new_cache(tmp_path)
+        obj = object()
+
+    with when:
+        setup(obj)
+        setup(obj)
+
+    with then:
+        assert calls == ["setup", "setup"]
+        assert cache.size == 0
+
+
+def test_snapshot_invalidated_by_code(*, tmp_path: Path):
+    with given:
+        @snapshot
+        def setup():
+            return 1
+
+        new_cache(tmp_path)
+        setup()
+
+    with when:
+        @snapshot
+        def setup():
+            return 2
+
+        result = setup()
+
+    with then:
+        assert result == 2
+
+
+def test_snapshot_invalidated_by_version(*, tmp_path: Path, calls: List[str]):
+    with given:
+        def record():
+            calls.append("setup")
+
+        def setup():
+            record()
+
+        new_cache(tmp_path)
+        snapshot(version="1")(setup)()
+
+    with when:
+        snapshot(version="1")(setup)()
+        snapshot(version="2")(setup)()
+
+    with then:
+        assert calls == ["setup", "setup"]
+
+
+def test_snapshot_invalidated_by_defaults(*, tmp_path: Path):
+    with given:
+        @snapshot
+        def build(n=10):
+            return list(range(n))
+
+        new_cache(tmp_path)
+        build()
+
+    with when:
+        @snapshot
+        def build(n=20):
+            return list(range(n))
+
+        result = build()
+
+    with then:
+        assert len(result) == 20
+
+
+def test_snapshot_invalidated_by_closure(*, tmp_path: Path):
+    with given:
+        def create(size):
+            @snapshot
+            def build():
+                return list(range(size))
+            return build
+
+        new_cache(tmp_path)
+        create(10)()
+
+    with when:
+        result = create(20)()
+
+    with then:
+        assert len(result) == 20
+
+
+def test_snapshot_default_args_matched(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        def setup(name, size=1):
+            calls.append(name)
+            return name * size
+
+        new_cache(tmp_path)
+        setup("a")
+
+    with when:
+        results = [setup("a", 1), setup(name="a", size=1)]
+
+    with then:
+        assert results == ["a", "a"]
+        assert calls == ["a"]
+
+
+async def test_snapshot_async(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        async def setup(name):
+            calls.append(name)
+            return name.upper()
+
+        new_cache(tmp_path)
+        await setup("Bob")
+
+    with when:
+        result = await setup("Bob")
+
+    with then:
+        assert result == "BOB"
+        assert calls == ["Bob"]
+
+
+def test_snapshot_without_cache(*, calls: List[str]):
+    with given:
+        @snapshot
+        def setup(name):
+            calls.append(name)
+            return name
+
+    with when:
+        results = [setup("Bob"), setup("Bob")]
+
+    with then:
+        assert results == ["Bob", "Bob"]
+        assert calls == ["Bob", "Bob"]
+
+
+def test_snapshot_unpicklable_result(*, tmp_path: Path):
+    with given:
+        @snapshot
+        def setup():
+            return Lock()
+
+        cache = new_cache(tmp_path)
+
+    with when, raises(BaseException) as exc:
+        setup()
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value).startswith("Result of ")
+        assert cache.size == 0
+        assert [p.name for p in cache.directory.iterdir()] == []
+
+
+def test_least_recently_used_evicted(*, tmp_path: Path):
+    with given:
+        cache = SnapshotCache(tmp_path, max_size=2500)
+        for idx, key in enumerate(["a", "b"]):
+            cache.put(key, b"x" * 1000)
+            os.utime(tmp_path / f"{key}.pickle", (idx, idx))
+        cache.get("a")
+
+    with when:
+        cache.put("c", b"x" * 1000)
+
+    with then:
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pickle", "c.pickle"]
+        assert cache.stats.evicted == 1
+
+
+def test_corrupted_snapshot(*, tmp_path: Path, calls: List[str]):
+    with given:
+        @snapshot
+        def setup():
+            calls.append("setup")
+            return 1
+
+        cache = new_cache(tmp_path)
+        setup()
+        for path in cache.directory.iterdir():
+            path.write_bytes(b"corrupted")
+
+    with when:
+        result = setup()
+
+    with then:
+        assert result == 1
+        assert calls == ["setup", "setup"]
+
+
+async def fire_arg_parsed(dispatcher: Dispatcher, project_dir: Path, *args: str) -> None:
+    config_ = Mock(Config, project_dir=project_dir)
+    await dispatcher.fire(ConfigLoadedEvent(Path("."), config_))
+
+    arg_parser = ArgumentParser()
+    await dispatcher.fire(ArgParseEvent(arg_parser))
+    await dispatcher.fire(ArgParsedEvent(arg_parser.parse_args(args)))
+
+
+@pytest.fixture
+def snapshots(dispatcher: Dispatcher) -> VedroFnPlugin:
+    class _VedroFn(VedroFn):
+        snapshots = True
+
+    plugin = VedroFnPlugin(_VedroFn)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+@pytest.mark.usefixtures(snapshots.__name__)
+async def test_plugin_snapshots(*, dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        await fire_arg_parsed(dispatcher, tmp_path)
+
+        @snapshot
+        def setup():
+            return 1
+
+        report = Report()
+
+    with when:
+        setup()
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        cache = get_snapshot_cache()
+        assert cache.directory == tmp_path / ".vedro" / "vedro_fn" / "snapshots"
+        assert ("vedro-fn snapshots: 0 hits, 1 misses, 0 evicted (0.00 MiB on disk)"
+                in report.summary)
+
+
+@pytest.mark.usefixtures(snapshots.__name__)
+async def test_plugin_no_snapshots(*, dispatcher: Dispatcher, tmp_path: Path):
+    with when:
+        await fire_arg_parsed(dispatcher, tmp_path, "--fn-no-snapshots")
+
+    with then:
+        assert get_snapshot_cache() is None
+
+
+@pytest.mark.usefixtures(snapshots.__name__)
+async def test_plugin_clear_snapshots(*, dispatcher: Dispatcher, tmp_path: Path):
+    with given:
+        snapshots_dir = tmp_path / ".vedro" / "vedro_fn" / "snapshots"
+        SnapshotCache(snapshots_dir, max_size=1024).put("key", 1)
+
+    with when:
+        await fire_arg_parsed(dispatcher, tmp_path, "--fn-clear-snapshots")
+
+    with then:
+        assert list(snapshots_dir.iterdir()) == []
+        assert get_snapshot_cache() is not None
+
+
+def test_snapshot_cache_size_validation():
+    with given:
+        class _VedroFn(VedroFn):
+            snapshot_cache_size = "256 apples"
+
+    with when, raises(BaseException) as exc:
+        VedroFnPlugin(_VedroFn)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == ("Invalid memory size '256 apples', "
+                                  "expected bytes or a string like '512MiB'")
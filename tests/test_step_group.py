@@ -0,0 +1,131 @@
+import asyncio
+from typing import List
+
+import pytest
+from baby_steps import given as given_
+from baby_steps import then as then_
+from baby_steps import when as when_
+
+from vedro_fn import given, when
+from vedro_fn._step_timings import StepRecorder, start_recording, stop_recording
+
+
+class Tracker:
+    def __init__(self) -> None:
+        self.active = 0
+        self.max_active = 0
+        self.cancelled: List[int] = []
+
+    async def work(self, value: int, delay: float = 0.01) -> int:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(value)
+            raise
+        finally:
+            self.active -= 1
+        return value
+
+    async def fail(self, delay: float = 0.0) -> None:
+        await asyncio.sleep(delay)
+        raise AssertionError("failed")
+
+
+async def test_step_group_runs_concurrently():
+    with given_:
+        tracker = Tracker()
+
+    with when_:
+        async with given.concurrently() as group:
+            tasks = [group.add(tracker.work(value)) for value in range(5)]
+
+    with then_:
+        assert tracker.max_active == 5
+        assert group.results == [0, 1, 2, 3, 4]
+        assert [task.result() for task in tasks] == [0, 1, 2, 3, 4]
+
+
+async def test_step_group_limit():
+    with given_:
+        tracker = Tracker()
+
+    with when_:
+        async with given.concurrently(limit=2) as group:
+            for value in range(5):
+                group.add(tracker.work(value))
+
+    with then_:
+        assert tracker.max_active == 2
+        assert group.results == [0, 1, 2, 3, 4]
+
+
+async def test_step_group_failure():
+    with given_:
+        tracker = Tracker()
+
+    with when_, pytest.raises(AssertionError) as exc:
+        async with given("create fixtures").concurrently() as group:
+            group.add(tracker.work(1, delay=1.0))
+            group.add(tracker.fail())
+
+    with then_:
+        assert str(exc.value) == "failed"
+        assert exc.value.__notes__ == ["raised in given 'create fixtures' (task 2 of 2)"]
+        assert tracker.cancelled == [1]
+
+
+async def test_step_group_body_failure():
+    with given_:
+        tracker = Tracker()
+
+    with when_, pytest.raises(Exception) as exc:
+        async with when.concurrently() as group:
+            task = group.add(tracker.work(1, delay=1.0))
+            raise KeyError("body")
+
+    with then_:
+        assert exc.type is KeyError
+        assert task.cancelled()
+
+
+async def test_step_group_timing():
+    with given_:
+        recorder = StepRecorder()
+        token = start_recording(recorder)
+        tracker = Tracker()
+
+    with when_:
+        try:
+            async with given("create fixtures").concurrently() as group:
+                group.add(tracker.work(1))
+        finally:
+            stop_recording(token)
+
+    with then_:
+        timing, = list(recorder)
+        assert (timing.kind, timing.name, timing.failed) == ("given", "create fixtures", False)
+        assert timing.elapsed >= 10_000_000
+
+
+async def test_step_group_add_outside():
+    with given_:
+        group = given.concurrently()
+        coro = asyncio.sleep(0)
+
+    with when_, pytest.raises(Exception) as exc:
+        group.add(coro)
+
+    with then_:
+        coro.close()
+        assert exc.type is RuntimeError
+
+
+def test_step_group_invalid_limit():
+    with when_, pytest.raises(Exception) as exc:
+        given.concurrently(limit=0)
+
+    with then_:
+        assert exc.type is ValueError
+        assert str(exc.value) == "limit must be greater than 0 or None, 0 given"
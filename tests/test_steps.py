@@ -1,7 +1,22 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
 import pytest
+from baby_steps import given as given_
+from baby_steps import then as then_
+from baby_steps import when as when_
 
 from vedro_fn import given, then, when
 from vedro_fn._scenario_steps import Step
+from vedro_fn._step_timings import (
+    StepRecorder,
+    StepTiming,
+    get_step_recorder,
+    start_recording,
+    stop_recording,
+)
 
 
 @pytest.mark.parametrize("step", [given, when, then])
@@ -26,3 +41,128 @@ def test_step_call(step: Step):
         assert step_._name == "step"
 
     assert step_._name is None
+
+
+@pytest.mark.parametrize("step", [given, when, then])
+def test_step_timing_recorded(step: Step):
+    with given_:
+        recorder = StepRecorder()
+        token = start_recording(recorder)
+
+    with when_:
+        with step("step"):
+            pass
+        stop_recording(token)
+
+    with then_:
+        timings = list(recorder)
+        assert len(timings) == 1
+        assert timings[0].kind == step.__class__.__name__.lower()
+        assert timings[0].name == "step"
+        assert timings[0].elapsed >= 0
+        assert timings[0].failed is False
+
+
+def test_failed_step_timing_recorded():
+    with given_:
+        recorder = StepRecorder()
+        token = start_recording(recorder)
+
+    with when_:
+        with pytest.raises(AssertionError):
+            with then:
+                assert False
+        stop_recording(token)
+
+    with then_:
+        timings = list(recorder)
+        assert len(timings) == 1
+        assert timings[0].name is None
+        assert timings[0].failed is True
+
+
+def test_step_timing_not_recorded():
+    with when_:
+        with given:
+            pass
+
+    with then_:
+        assert get_step_recorder() is None
+
+
+def test_step_timing_str():
+    with given_:
+        timing = StepTiming("when", "create user", 0, 1_500_000)
+
+    with when_:
+        res = str(timing)
+
+    with then_:
+        assert res == "when create user (1.50ms)"
+
+
+def test_nested_steps():
+    with given_:
+        recorder = StepRecorder()
+        token = start_recording(recorder)
+
+    with when_:
+        with given("outer"):
+            with when("inner"):
+                inner_name = when._name
+            outer_name = given._name
+        stop_recording(token)
+
+    with then_:
+        assert (inner_name, outer_name) == ("inner", "outer")
+        assert [t.name for t in recorder] == ["inner", "outer"]
+
+
+async def test_concurrent_async_steps():
+    async def run_scenario(idx: int) -> List[Tuple[str, str]]:
+        recorder = StepRecorder()
+        start_recording(recorder)
+        names = []
+
+        async with given(f"given {idx}"):
+            await asyncio.sleep(0)
+            names.append(given._name)
+            async with when(f"when {idx}"):
+                await asyncio.sleep(0)
+                names.append(when._name)
+            await asyncio.sleep(0)
+        async with then:
+            await asyncio.sleep(0)
+            names.append(then._name)
+
+        return [(t.kind, t.name) for t in recorder] + [("name", n) for n in names]
+
+    with when_:
+        results = await asyncio.gather(*[run_scenario(idx) for idx in range(2000)])
+
+    with then_:
+        for idx, result in enumerate(results):
+            assert result == [
+                ("when", f"when {idx}"),
+                ("given", f"given {idx}"),
+                ("then", None),
+                ("name", f"given {idx}"),
+                ("name", f"when {idx}"),
+                ("name", None),
+            ]
+
+
+def test_concurrent_threaded_steps():
+    def run_scenario(idx: int) -> List[Optional[str]]:
+        recorder = StepRecorder()
+        start_recording(recorder)
+        with when(f"when {idx}"):
+            time.sleep(0.001)
+        return [t.name for t in recorder]
+
+    with when_:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run_scenario, range(200)))
+
+    with then_:
+        assert results == [[f"when {idx}"] for idx in range(200)]
@@ -0,0 +1,295 @@
+import sys
+from pathlib import Path
+from textwrap import dedent
+from time import perf_counter
+from typing import List, Type
+
+import pytest
+from baby_steps import given, then, when
+from pytest import raises
+from vedro import Scenario, skip
+from vedro.core import Dispatcher, ModuleFileLoader, Report
+from vedro.events import CleanupEvent, ScenarioFailedEvent, ScenarioReportedEvent, StartupEvent
+from vedro.plugins.deferrer import Deferrer, DeferrerPlugin
+
+from vedro_fn import StepTimingsRecordedEvent, VedroFn, VedroFnPlugin, scenario
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+
+from ._utils import ScenarioRunner, ScenarioScheduler
+from ._utils import _create_vscenario as create_vscenario
+from ._utils import dispatcher, loader, tmp_scn_dir
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+
+def create_plugin(dispatcher: Dispatcher, *, threaded: bool = False) -> VedroFnPlugin:
+    options = {"step_timings": True, "thread_pool_size": 3, "threaded": threaded}
+    config = type("_VedroFn", (VedroFn,), options)
+    plugin = VedroFnPlugin(config)
+    plugin.subscribe(dispatcher)
+    return plugin
+
+
+async def run_scheduled(scenarios: List[Type[Scenario]], dispatcher: Dispatcher, *,
+                        project_dir: Path) -> Report:
+    scheduler = ScenarioScheduler([create_vscenario(scn, project_dir=project_dir)
+                                   for scn in scenarios])
+    await dispatcher.fire(StartupEvent(scheduler))
+    report = await ScenarioRunner(dispatcher).run(scheduler)
+    await dispatcher.fire(CleanupEvent(report))
+    return report
+
+
+def write_scenario(tmp_scn_dir: Path, decorator: str = "scenario.threaded()") -> Path:
+    path = tmp_scn_dir / "scenario.py"
+    path.write_text(dedent(f'''
+        from threading import current_thread
+        from time import sleep
+        from vedro import params
+        from vedro_fn import scenario, when
+
+        threads = {{}}
+
+        @{decorator}([params(1), params(2), params(3)])
+        def wait_row(row):
+            threads[row] = current_thread().name
+            with when(f"wait {{row}}"):
+                sleep(0.1)
+                assert row != 2
+
+        @{decorator}
+        def wait():
+            threads[0] = current_thread().name
+            with when("wait"):
+                sleep(0.1)
+    '''))
+    return path
+
+
+async def test_threaded_scenarios_overlap(*, dispatcher: Dispatcher, tmp_scn_dir: Path,
+                                          tmp_path: Path):
+    with given:
+        plugin = create_plugin(dispatcher)
+        events: List[StepTimingsRecordedEvent] = []
+        dispatcher.listen(StepTimingsRecordedEvent, events.append)
+
+        path = write_scenario(tmp_scn_dir)
+        scenarios = await plugin._create_scenario_loader(ModuleFileLoader()).load(path)
+
+    with when:
+        started_at = perf_counter()
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+        elapsed = perf_counter() - started_at
+
+    with then:
+        assert report.passed == 3
+        assert report.failed == 1
+        assert elapsed < 0.35
+
+        threads = sys.modules[scenarios[0].__module__].threads
+        assert all(name.startswith("vedro_fn_scenario") for name in threads.values())
+        assert len(set(threads.values())) == 3
+
+        # Each scenario reports its own steps
+        assert sorted(t.name for e in events for t in e.step_timings) == [
+            "wait", "wait 1", "wait 2", "wait 3"
+        ]
+
+
+async def test_threaded_scenario_traceback(*, dispatcher: Dispatcher, tmp_scn_dir: Path,
+                                           tmp_path: Path):
+    with given:
+        plugin = create_plugin(dispatcher)
+        path = write_scenario(tmp_scn_dir)
+        scenarios = await plugin._create_scenario_loader(ModuleFileLoader()).load(path)
+
+        failed: List[ScenarioFailedEvent] = []
+        dispatcher.listen(ScenarioFailedEvent, failed.append)
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        event, = failed
+        exc_info = event.scenario_result.step_results[-1].exc_info
+        assert exc_info.type is AssertionError
+        tb, frames = exc_info.traceback, []
+        while tb is not None:
+            frames.append(tb.tb_frame.f_code.co_name)
+            tb = tb.tb_next
+        assert frames[-1] == "wait_row"
+
+
+async def test_threaded_by_config(*, dispatcher: Dispatcher, tmp_scn_dir: Path,
+                                  tmp_path: Path):
+    with given:
+        plugin = create_plugin(dispatcher, threaded=True)
+        path = write_scenario(tmp_scn_dir, "scenario")
+        scenarios = await plugin._create_scenario_loader(ModuleFileLoader()).load(path)
+
+    with when:
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert report.passed == 3
+        threads = sys.modules[scenarios[0].__module__].threads
+        assert all(name.startswith("vedro_fn_scenario") for name in threads.values())
+
+
+async def test_threaded_opt_out(*, dispatcher: Dispatcher, tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        plugin = create_plugin(dispatcher, threaded=True)
+        path = write_scenario(tmp_scn_dir, "scenario.threaded(False)")
+        scenarios = await plugin._create_scenario_loader(ModuleFileLoader()).load(path)
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        threads = sys.modules[scenarios[0].__module__].threads
+        assert set(threads.values()) == {"MainThread"}
+
+
+async def test_thread_batch_not_created(*, dispatcher: Dispatcher, tmp_scn_dir: Path):
+    with given:
+        plugin = create_plugin(dispatcher)
+        path = write_scenario(tmp_scn_dir, "scenario")
+        loader = plugin._create_scenario_loader(ModuleFileLoader())
+
+    with when:
+        await loader.load(path)
+
+    with then:
+        # Created for the first threaded scenario only
+        assert loader._thread_batch is None
+
+
+async def test_threaded_without_plugin(*, dispatcher: Dispatcher, loader: Loader,
+                                       tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        path = write_scenario(tmp_scn_dir)
+        scenarios = await loader.load(path)
+
+    with when:
+        report = await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        assert report.failed == 1
+        threads = sys.modules[scenarios[0].__module__].threads
+        assert set(threads.values()) == {"MainThread"}
+
+
+async def test_threaded_not_overlapping_other_scenarios(*, dispatcher: Dispatcher,
+                                                        tmp_scn_dir: Path, tmp_path: Path):
+    with given:
+        plugin = create_plugin(dispatcher)
+        DeferrerPlugin(Deferrer).subscribe(dispatcher)
+        reported: List[ScenarioReportedEvent] = []
+        dispatcher.listen(ScenarioReportedEvent, reported.append)
+
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent('''
+            from time import sleep
+            from vedro import defer
+            from vedro_fn import scenario
+
+            log = []
+
+            def wait(name, seconds):
+                defer(log.append, f"cleanup {name}")
+                sleep(seconds)
+                log.append(f"done {name}")
+
+            @scenario.threaded()
+            def first():
+                wait("first", 0.05)
+
+            @scenario.threaded()
+            def second():
+                wait("second", 0.1)
+
+            @scenario
+            def plain():
+                wait("plain", 0.05)
+
+            @scenario.threaded()
+            def last():
+                wait("last", 0.01)
+        '''))
+        scenarios = await plugin._create_scenario_loader(ModuleFileLoader()).load(path)
+
+    with when:
+        await run_scheduled(scenarios, dispatcher, project_dir=tmp_path)
+
+    with then:
+        # `last` is not started together with `first` and `second`, so it doesn't overlap
+        # with `plain`; deferred calls run when their scenario is reported
+        assert sys.modules[scenarios[0].__module__].log == [
+            "done first", "cleanup first",
+            "done second", "cleanup second",
+            "done plain", "cleanup plain",
+            "done last", "cleanup last",
+        ]
+        elapsed = [e.aggregated_result.elapsed for e in reported]
+        assert 0.05 <= elapsed[0] < 0.09
+        assert 0.1 <= elapsed[1] < 0.14
+
+
+@pytest.mark.parametrize("decorator", ["profile", "memory_budget('1MiB')"])
+async def test_threaded_refuses_profiling(decorator: str, *, dispatcher: Dispatcher,
+                                          tmp_scn_dir: Path):
+    with given:
+        plugin = create_plugin(dispatcher, threaded=True)
+        path = tmp_scn_dir / "scenario.py"
+        path.write_text(dedent(f'''
+            from vedro_fn import scenario, profile, memory_budget
+
+            @scenario[{decorator}]
+            def measured():
+                pass
+        '''))
+        loader = plugin._create_scenario_loader(ModuleFileLoader())
+
+    with when, raises(BaseException) as exc:
+        await loader.load(path)
+
+    with then:
+        assert exc.type is TypeError
+        name = decorator.split("(")[0]
+        assert str(exc.value) == (f"@{name} can't be used with scenarios running concurrently "
+                                  "or in threads <scenarios.scenario.Scenario_measured>")
+
+
+def test_threaded_requires_sync_scenario():
+    with when, raises(BaseException) as exc:
+        @scenario.threaded()
+        async def wait():
+            pass
+
+    with then:
+        assert exc.type is TypeError
+        assert str(exc.value) == "Only sync scenarios can run in threads, 'wait' is async"
+
+
+def test_thread_pool_size_validation():
+    with given:
+        class _VedroFn(VedroFn):
+            thread_pool_size = 0
+
+    with when, raises(BaseException) as exc:
+        VedroFnPlugin(_VedroFn)
+
+    with then:
+        assert exc.type is ValueError
+        assert str(exc.value) == "thread_pool_size must be greater than 0, 0 given"
+
+
+def test_threaded_keeps_decorators():
+    with when:
+        @scenario[skip].threaded()
+        def wait():
+            pass
+
+    with then:
+        assert wait.threaded is True
+        assert wait.decorators == (skip,)
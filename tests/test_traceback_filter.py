@@ -0,0 +1,164 @@
+import os
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+from baby_steps import given, then, when
+from vedro import Config
+from vedro.core import Dispatcher, ExcInfo, Factory, StepResult, VirtualStep
+from vedro.core.exc_info import NoOpTracebackFilter, TracebackFilterType
+from vedro.events import ConfigLoadedEvent, StepFailedEvent
+
+from vedro_fn import VedroFn, VedroFnPlugin
+from vedro_fn._scenario_loader import ScenarioLoader as Loader
+from vedro_fn._traceback_filter import FilteredExcInfo, TracebackFilter
+
+from ._utils import dispatcher, loader, tmp_scn_dir, vedro_fn
+
+__all__ = ("loader", "tmp_scn_dir", "dispatcher",)  # fixtures
+
+VEDRO_FN_DIR = os.path.dirname(sys.modules["vedro_fn"].__file__)
+
+
+@pytest.fixture
+async def exc_info(loader: Loader, tmp_scn_dir: Path) -> ExcInfo:
+    path = tmp_scn_dir / "scenario.py"
+    path.write_text(dedent('''
+        from vedro_fn import scenario, when
+
+        def helper():
+            __tracebackhide__ = True
+            assert False
+
+        @scenario()
+        def create_user():
+            with when:
+                helper()
+    '''))
+    scenario, = await loader.load(path)
+    try:
+        scenario().do()
+    except AssertionError:
+        return ExcInfo(*sys.exc_info())  # type: ignore
+
+
+def get_filenames(tb):
+    filenames = []
+    while tb is not None:
+        filenames.append(os.path.basename(tb.tb_frame.f_code.co_filename))
+        tb = tb.tb_next
+    return filenames
+
+
+def test_filter_tb(*, exc_info: ExcInfo):
+    with given:
+        tb_filter = TracebackFilter(modules=[VEDRO_FN_DIR])
+
+    with when:
+        tb = tb_filter.filter_tb(exc_info.traceback)
+
+    with then:
+        assert get_filenames(tb) == ["test_traceback_filter.py", "scenario.py"]
+
+
+def test_filter_tb_caches_files(*, exc_info: ExcInfo):
+    with given:
+        tb_filter = TracebackFilter(modules=[VEDRO_FN_DIR])
+        tb_filter.filter_tb(exc_info.traceback)
+        files = dict(tb_filter._internal_files)
+
+    with when:
+        tb_filter.filter_tb(exc_info.traceback)
+
+    with then:
+        assert tb_filter._internal_files == files
+        assert True in files.values()
+
+
+def test_filtered_exc_info(*, exc_info: ExcInfo):
+    with given:
+        orig_tb = exc_info.traceback
+        tb_filter = TracebackFilter(modules=[VEDRO_FN_DIR])
+
+    with when:
+        filtered = FilteredExcInfo(exc_info, tb_filter)
+
+    with then:
+        assert (filtered.type, filtered.value) == (exc_info.type, exc_info.value)
+        assert filtered._traceback is orig_tb
+        assert get_filenames(filtered.traceback) == ["test_traceback_filter.py", "scenario.py"]
+
+
+def test_filtered_exc_info_overridden(*, exc_info: ExcInfo):
+    with given:
+        orig_tb = exc_info.traceback
+        filtered = FilteredExcInfo(exc_info, TracebackFilter(modules=[VEDRO_FN_DIR]))
+
+    with when:
+        filtered.traceback = orig_tb
+
+    with then:
+        assert filtered.traceback is orig_tb
+        assert "_scenario_loader.py" in get_filenames(filtered.traceback)
+
+
+def make_step_failed_event(exc_info: ExcInfo) -> StepFailedEvent:
+    step_result = StepResult(VirtualStep(lambda self: None))
+    step_result.set_exc_info(exc_info)
+    return StepFailedEvent(step_result)
+
+
+@pytest.mark.usefixtures(vedro_fn.__name__)
+async def test_plugin_filters_lazily(*, dispatcher: Dispatcher, exc_info: ExcInfo):
+    with given:
+        orig_tb = exc_info.traceback
+        event = make_step_failed_event(exc_info)
+
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        filtered = event.step_result.exc_info
+        assert isinstance(filtered, FilteredExcInfo)
+        assert filtered._traceback is orig_tb
+        assert get_filenames(filtered.traceback) == ["test_traceback_filter.py", "scenario.py"]
+
+
+async def test_plugin_uses_registry_filter(*, dispatcher: Dispatcher, exc_info: ExcInfo):
+    with given:
+        plugin = VedroFnPlugin(VedroFn)
+        plugin.subscribe(dispatcher)
+
+        class _Config(Config):
+            class Registry(Config.Registry):
+                TracebackFilter = Factory[TracebackFilterType](NoOpTracebackFilter)
+
+        await dispatcher.fire(ConfigLoadedEvent(Path("."), _Config))
+        orig_tb = exc_info.traceback
+        event = make_step_failed_event(exc_info)
+
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        assert event.step_result.exc_info.traceback is orig_tb
+        assert "_scenario_loader.py" in get_filenames(orig_tb)
+
+
+async def test_plugin_show_internal_calls(*, dispatcher: Dispatcher, exc_info: ExcInfo):
+    with given:
+        class _VedroFn(VedroFn):
+            show_internal_calls = True
+
+        VedroFnPlugin(_VedroFn).subscribe(dispatcher)
+        orig_tb = exc_info.traceback
+        event = make_step_failed_event(exc_info)
+
+    with when:
+        await dispatcher.fire(event)
+
+    with then:
+        assert event.step_result.exc_info is exc_info
+        assert exc_info.traceback is orig_tb
+        assert "_scenario_loader.py" in get_filenames(exc_info.traceback)
@@ -1,6 +1,19 @@
+from ._benchmark import BenchmarkStats, benchmark, benchmark_async
+from ._events import StepTimingsRecordedEvent
+from ._memory_tracker import MemoryBudgetExceededError, memory_budget
+from ._params_source import params_from_csv, params_from_jsonl
+from ._profiler import profile
+from ._resource_pool import Resource, ResourceStats, resource
 from ._scenario_decorator import scenario
 from ._scenario_steps import given, then, when
+from ._shared import shared
+from ._snapshot_cache import snapshot
+from ._step_timings import StepTiming
 from ._vedro_fn_plugin import VedroFn, VedroFnPlugin
 
-__all__ = ("scenario", "given", "when", "then", "VedroFn", "VedroFnPlugin",)
+__all__ = ("scenario", "given", "when", "then", "shared", "snapshot", "params_from_jsonl",
+           "params_from_csv", "profile", "memory_budget", "MemoryBudgetExceededError", "benchmark",
+           "benchmark_async", "BenchmarkStats", "resource", "Resource", "ResourceStats",
+           "VedroFn", "VedroFnPlugin", "StepTiming",
+           "StepTimingsRecordedEvent",)
 __version__ = "0.1.0"
@@ -0,0 +1,143 @@
+from contextvars import ContextVar, Token
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, List, Sequence, Union
+
+__all__ = ("benchmark", "benchmark_async", "BenchmarkStats", "collect_benchmarks",
+           "pop_collected_benchmarks", "start_collecting",)
+
+
+class BenchmarkStats:
+    def __init__(self, name: Union[str, None], samples: Sequence[int]) -> None:
+        if len(samples) == 0:
+            raise ValueError("BenchmarkStats requires at least one sample")
+        self._name = name
+        self._samples = sorted(samples)
+
+    @property
+    def name(self) -> Union[str, None]:
+        return self._name
+
+    @property
+    def samples(self) -> List[int]:
+        # nanoseconds, sorted
+        return self._samples
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def min(self) -> float:
+        # seconds
+        return self._samples[0] / 1e9
+
+    @property
+    def max(self) -> float:
+        return self._samples[-1] / 1e9
+
+    @property
+    def mean(self) -> float:
+        return sum(self._samples) / len(self._samples) / 1e9
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def percentile(self, q: float) -> float:
+        if not (0 <= q <= 100):
+            raise ValueError(f"Percentile must be between 0 and 100, {q} given")
+        # Linear interpolation between the closest ranks
+        rank = (len(self._samples) - 1) * q / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(self._samples) - 1)
+        low, high = self._samples[lower], self._samples[upper]
+        return (low + (high - low) * (rank - lower)) / 1e9
+
+    def __str__(self) -> str:
+        title = "benchmark" if (self._name is None) else f"benchmark {self._name}"
+        return (f"{title}: n={self.count}, p50 {self.p50 * 1000:.3f}ms, "
+                f"p95 {self.p95 * 1000:.3f}ms, p99 {self.p99 * 1000:.3f}ms, "
+                f"max {self.max * 1000:.3f}ms")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self}>"
+
+
+_collected: ContextVar[Union[List[BenchmarkStats], None]] = ContextVar(
+    "vedro_fn_benchmarks", default=None)
+
+
+def collect_benchmarks(stats: Sequence[BenchmarkStats]) -> None:
+    # The list is created by the first `benchmark` call of the scenario
+    if len(stats) == 0:
+        return
+    collected = _collected.get()
+    if collected is None:
+        collected = []
+        _collected.set(collected)
+    collected.extend(stats)
+
+
+def pop_collected_benchmarks() -> List[BenchmarkStats]:
+    collected = _collected.get()
+    if collected is None:
+        return []
+    _collected.set(None)
+    return collected
+
+
+def start_collecting(collected: List[BenchmarkStats]) -> Token[Union[List[BenchmarkStats], None]]:
+    return _collected.set(collected)
+
+
+def _validate(repeat: int, warmup: int) -> None:
+    if repeat <= 0:
+        raise ValueError(f"repeat must be greater than 0, {repeat} given")
+    if warmup < 0:
+        raise ValueError(f"warmup must be greater than or equal to 0, {warmup} given")
+
+
+def _collect(name: Union[str, None], samples: List[int]) -> BenchmarkStats:
+    stats = BenchmarkStats(name, samples)
+    collect_benchmarks([stats])
+    return stats
+
+
+def benchmark(fn: Callable[[], Any], *, repeat: int = 100, warmup: int = 10,
+              name: Union[str, None] = None) -> BenchmarkStats:
+    # with when:
+    #     stats = benchmark(lambda: client.get_user(1), repeat=200)
+    _validate(repeat, warmup)
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started_at = perf_counter_ns()
+        fn()
+        samples.append(perf_counter_ns() - started_at)
+    return _collect(name, samples)
+
+
+async def benchmark_async(fn: Callable[[], Awaitable[Any]], *, repeat: int = 100,
+                          warmup: int = 10, name: Union[str, None] = None) -> BenchmarkStats:
+    # with when:
+    #     stats = await benchmark_async(lambda: client.get_user(1), repeat=200)
+    _validate(repeat, warmup)
+    for _ in range(warmup):
+        await fn()
+
+    samples = []
+    for _ in range(repeat):
+        started_at = perf_counter_ns()
+        await fn()
+        samples.append(perf_counter_ns() - started_at)
+    return _collect(name, samples)
@@ -0,0 +1,120 @@
+import os
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Dict, Optional, cast
+
+from ._scenario_index import IndexedScenario, ModuleIndex, ScenarioIndexer
+from ._storage import read_json, write_json
+
+__all__ = ("DiscoveryCache", "DiscoveryCacheStats",)
+
+
+class DiscoveryCacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    @property
+    def total(self) -> int:
+        return self.hits + self.misses + self.invalidated
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits / self.total) if self.total > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"<{self.__class__.__name__} hits={self.hits} misses={self.misses} "
+                f"invalidated={self.invalidated}>")
+
+
+class DiscoveryCache(ScenarioIndexer):
+    VERSION = 1
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+        self._file_path = file_path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._stats = DiscoveryCacheStats()
+
+    @property
+    def stats(self) -> DiscoveryCacheStats:
+        return self._stats
+
+    def index(self, path: Path) -> ModuleIndex:
+        entries = self._load_entries()
+        key = str(path)
+        entry = entries.get(key)
+
+        stat = os.stat(path)
+        if entry is not None:
+            if (entry["mtime_ns"] == stat.st_mtime_ns) and (entry["size"] == stat.st_size):
+                self._stats.hits += 1
+                return self._load_index(path, entry)
+
+        source = path.read_bytes()
+        digest = self._hash(source)
+
+        if entry is not None and entry["hash"] == digest:
+            # Touched but not modified (e.g. fresh checkout in CI)
+            self._stats.hits += 1
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            return self._load_index(path, entry)
+
+        if entry is None:
+            self._stats.misses += 1
+        else:
+            self._stats.invalidated += 1
+
+        index = self.index_source(source, path)
+        entries[key] = self._dump_index(index, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                                        digest=digest)
+        return index
+
+    def get(self, path: Path) -> Optional[ModuleIndex]:
+        entry = self._load_entries().get(str(path))
+        return self._load_index(path, entry) if (entry is not None) else None
+
+    def save(self) -> None:
+        entries = {key: entry for key, entry in self._load_entries().items()
+                   if os.path.exists(key)}
+        write_json(self._file_path, {"version": self.VERSION, "files": entries})
+
+    def _load_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read_entries()
+        return self._entries
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        content = read_json(self._file_path)
+        if not isinstance(content, dict) or (content.get("version") != self.VERSION):
+            return {}
+        return cast(Dict[str, Dict[str, Any]], content["files"])
+
+    def _hash(self, source: bytes) -> str:
+        return blake2b(source, digest_size=20).hexdigest()
+
+    def _dump_index(self, index: ModuleIndex, *,
+                    mtime_ns: int, size: int, digest: str) -> Dict[str, Any]:
+        return {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "hash": digest,
+            "is_complete": index.is_complete,
+            "scenarios": [{
+                "name": scn.name,
+                "lineno": scn.lineno,
+                "is_async": scn.is_async,
+                "decorators": list(scn.decorators),
+                "params": scn.params,
+            } for scn in index.scenarios],
+        }
+
+    def _load_index(self, path: Path, entry: Dict[str, Any]) -> ModuleIndex:
+        scenarios = [IndexedScenario(
+            scn["name"], scn["lineno"],
+            is_async=scn["is_async"],
+            decorators=tuple(scn["decorators"]),
+            params=scn["params"],
+        ) for scn in entry["scenarios"]]
+        return ModuleIndex(path, scenarios, is_complete=entry["is_complete"])
@@ -0,0 +1,118 @@
+from pathlib import Path
+from statistics import median
+from time import time
+from typing import Dict, List, Optional, cast
+
+from ._storage import append_json_line, read_json_lines, write_json_lines
+
+__all__ = ("DurationLog", "Regression",)
+
+
+class Regression:
+    def __init__(self, key: str, latest: float, baseline: float, samples: int) -> None:
+        self._key = key
+        self._latest = latest
+        self._baseline = baseline
+        self._samples = samples
+
+    @property
+    def key(self) -> str:
+        # Row key of the scenario (see `get_row_key`)
+        return self._key
+
+    @property
+    def latest(self) -> float:
+        # seconds
+        return self._latest
+
+    @property
+    def baseline(self) -> float:
+        # Median of previous runs, seconds
+        return self._baseline
+
+    @property
+    def samples(self) -> int:
+        return self._samples
+
+    @property
+    def ratio(self) -> float:
+        return self._latest / self._baseline if (self._baseline > 0) else float("inf")
+
+    def __str__(self) -> str:
+        return (f"{self._key}: {self._latest:.2f}s, baseline {self._baseline:.2f}s "
+                f"(x{self.ratio:.1f} over {self._samples} runs)")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self}>"
+
+
+class DurationLog:
+    VERSION = 2
+
+    def __init__(self, file_path: Path, *, max_runs: int = 50) -> None:
+        if max_runs < 1:
+            raise ValueError(f"max_runs must be greater than 0, {max_runs} given")
+        self._file_path = file_path
+        self._max_runs = max_runs
+        self._runs: Optional[List[Dict[str, float]]] = None
+        self._lines = 0
+
+    @property
+    def max_runs(self) -> int:
+        return self._max_runs
+
+    @property
+    def runs(self) -> List[Dict[str, float]]:
+        # row key -> seconds, one dict per run, oldest first
+        if self._runs is None:
+            self._runs = self._read_runs()
+        return self._runs
+
+    @property
+    def latest(self) -> Dict[str, float]:
+        # row key -> seconds of the latest run that recorded it
+        durations: Dict[str, float] = {}
+        for run in self.runs:
+            durations.update(run)
+        return durations
+
+    def append(self, durations: Dict[str, float]) -> None:
+        # Runs are appended as JSON lines, the file is rewritten only when it holds twice
+        # as many runs as kept
+        runs = self.runs
+        runs.append(durations)
+        if self._lines + 1 > 2 * self._max_runs:
+            del runs[:-self._max_runs]
+            write_json_lines(self._file_path, [self._create_line(run) for run in runs])
+            self._lines = len(runs)
+        else:
+            append_json_line(self._file_path, self._create_line(durations))
+            self._lines += 1
+
+    def find_regressions(self, durations: Dict[str, float], *, window: int = 10,
+                         threshold: float = 1.5, min_delta: float = 0.05,
+                         min_samples: int = 3) -> List[Regression]:
+        # Compares durations of the latest run with the median of (up to) `window` previous
+        # runs of the same scenario; slower by `threshold` times and by `min_delta` seconds
+        regressions = []
+        for key, latest in durations.items():
+            samples = [run[key] for run in self.runs if key in run][-window:]
+            if len(samples) < min_samples:
+                continue
+            baseline = median(samples)
+            if (latest >= baseline * threshold) and (latest - baseline >= min_delta):
+                regressions.append(Regression(key, latest, baseline, len(samples)))
+        return sorted(regressions, key=lambda r: r.ratio, reverse=True)
+
+    def _create_line(self, durations: Dict[str, float]) -> Dict[str, object]:
+        return {
+            "version": self.VERSION,
+            "finished_at": int(time()),
+            "durations": {k: round(v, 4) for k, v in durations.items()},
+        }
+
+    def _read_runs(self) -> List[Dict[str, float]]:
+        lines = read_json_lines(self._file_path)
+        self._lines = len(lines)
+        return [cast(Dict[str, float], line["durations"]) for line in lines
+                if isinstance(line, dict) and (line.get("version") == self.VERSION)]
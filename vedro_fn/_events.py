@@ -0,0 +1,24 @@
+from typing import List
+
+from vedro.core import Event, ScenarioResult
+
+from ._step_timings import StepTiming
+
+__all__ = ("StepTimingsRecordedEvent",)
+
+
+class StepTimingsRecordedEvent(Event):
+    def __init__(self, scenario_result: ScenarioResult, step_timings: List[StepTiming]) -> None:
+        self._scenario_result = scenario_result
+        self._step_timings = step_timings
+
+    @property
+    def scenario_result(self) -> ScenarioResult:
+        return self._scenario_result
+
+    @property
+    def step_timings(self) -> List[StepTiming]:
+        return self._step_timings
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._scenario_result!r}, {self._step_timings!r})"
@@ -0,0 +1,75 @@
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set, cast
+
+from ._storage import read_json, write_json
+
+__all__ = ("ImpactMap", "get_changed_files",)
+
+# Changes in documentation can't affect scenarios
+_IGNORED_SUFFIXES = (".md", ".rst",)
+
+
+class ImpactMap:
+    VERSION = 1
+
+    def __init__(self, file_path: Path) -> None:
+        self._file_path = file_path
+        self._dependencies: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def dependencies(self) -> Dict[str, List[str]]:
+        # scenario file -> project-local files it depends on (relative posix paths)
+        if self._dependencies is None:
+            self._dependencies = self._read_dependencies()
+        return self._dependencies
+
+    def update(self, dependencies: Dict[str, List[str]]) -> None:
+        self.dependencies.update(dependencies)
+
+    def is_affected(self, rel_path: Path, changed_files: Set[str]) -> bool:
+        path = rel_path.as_posix()
+        if path in changed_files:
+            return True
+        dependencies = self.dependencies.get(path)
+        if dependencies is None:
+            # Unknown scenario files are always selected
+            return True
+        return any(dep in changed_files for dep in dependencies)
+
+    def get_uncovered(self, changed_files: Set[str]) -> Set[str]:
+        # Changed files no scenario file is known to depend on (e.g. `vedro.cfg.py`,
+        # modules loaded with `importlib.import_module`), they can affect any scenario
+        covered = set(self.dependencies)
+        for dependencies in self.dependencies.values():
+            covered.update(dependencies)
+        return {path for path in changed_files
+                if (path not in covered) and not path.endswith(_IGNORED_SUFFIXES)}
+
+    def save(self) -> None:
+        write_json(self._file_path, {"version": self.VERSION, "dependencies": self.dependencies})
+
+    def _read_dependencies(self) -> Dict[str, List[str]]:
+        content = read_json(self._file_path)
+        if not isinstance(content, dict) or (content.get("version") != self.VERSION):
+            return {}
+        return cast(Dict[str, List[str]], content["dependencies"])
+
+
+def _git(project_dir: Path, *args: str) -> List[str]:
+    try:
+        result = subprocess.run(["git", *args], cwd=project_dir, capture_output=True,
+                                text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", None) or str(e)
+        raise RuntimeError(f"Failed to run 'git {' '.join(args)}': {stderr.strip()}") from None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def get_changed_files(project_dir: Path, ref: str = "HEAD") -> Set[str]:
+    # Working tree (staged and unstaged) compared to `ref`, plus untracked files,
+    # relative to the project directory
+    changed = set(_git(project_dir, "diff", "--name-only", "--relative", ref, "--"))
+    changed.update(_git(project_dir, "ls-files", "--others", "--exclude-standard"))
+    # Plugin state (e.g. this impact map) is not a change of the project
+    return {path for path in changed if not path.startswith(".vedro/")}
@@ -0,0 +1,138 @@
+import builtins
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib.util import resolve_name
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Union
+
+__all__ = ("ImportGraph", "record_file_read",)
+
+# Data files read while a scenario module is loaded (e.g. by params sources)
+_read_files: ContextVar[Union[Set[Path], None]] = ContextVar("_read_files", default=None)
+
+
+def record_file_read(path: Path) -> None:
+    read_files = _read_files.get()
+    if read_files is not None:
+        read_files.add(path)
+
+
+class ImportGraph:
+    def __init__(self) -> None:
+        # importer module name -> imported module names
+        self._edges: Dict[str, Set[str]] = {}
+        # scenario file -> module name
+        self._roots: Dict[Path, str] = {}
+        # scenario file -> data files read while loading it
+        self._files: Dict[Path, Set[Path]] = {}
+        self._recording = False
+
+    @property
+    def edges(self) -> Dict[str, Set[str]]:
+        return self._edges
+
+    @contextmanager
+    def record(self) -> Iterator[None]:
+        # `import` statements still call `__import__` when the module is already imported,
+        # so edges are recorded regardless of the loading order
+        if self._recording:
+            yield
+            return
+
+        orig_import = builtins.__import__
+
+        def __import__(name: str, globals: Optional[Mapping[str, Any]] = None,
+                       locals: Optional[Mapping[str, Any]] = None,
+                       fromlist: Sequence[str] = (), level: int = 0) -> Any:
+            module = orig_import(name, globals, locals, fromlist, level)
+            self._add_edges(name, globals, fromlist, level)
+            return module
+
+        builtins.__import__ = __import__
+        self._recording = True
+        try:
+            yield
+        finally:
+            builtins.__import__ = orig_import
+            self._recording = False
+
+    @contextmanager
+    def record_files(self, path: Path) -> Iterator[None]:
+        read_files = self._files.setdefault(path, set())
+        token = _read_files.set(read_files)
+        try:
+            yield
+        finally:
+            _read_files.reset(token)
+
+    def add_root(self, path: Path, module_name: str) -> None:
+        self._roots[path] = module_name
+
+    def dependencies(self, project_dir: Path) -> Dict[str, List[str]]:
+        # scenario file -> project-local files it imports (directly or not), relative paths
+        project_dir = project_dir.resolve()
+        dependencies = {}
+        for path, module_name in self._roots.items():
+            files = set()
+            for name in self._walk(module_name):
+                file = self._get_local_file(name, project_dir)
+                if file is not None:
+                    files.add(file)
+            for read_file in self._files.get(path, ()):
+                file = self._get_relative_path(read_file, project_dir)
+                if file is not None:
+                    files.add(file)
+            dependencies[Path(path).as_posix()] = sorted(files)
+        return dependencies
+
+    def _add_edges(self, name: str, globals: Optional[Mapping[str, Any]],
+                   fromlist: Sequence[str], level: int) -> None:
+        if globals is None:
+            return
+        importer = globals.get("__name__")
+        if not isinstance(importer, str):
+            return
+
+        if level > 0:
+            package = globals.get("__package__") or importer.rpartition(".")[0]
+            try:
+                name = resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return
+
+        imported = self._edges.setdefault(importer, set())
+        imported.add(name)
+        # Parent packages are imported (and their __init__ executed) as well
+        parts = name.split(".")
+        imported.update(".".join(parts[:idx]) for idx in range(1, len(parts)))
+        # `from package import module`
+        for item in fromlist or ():
+            if f"{name}.{item}" in sys.modules:
+                imported.add(f"{name}.{item}")
+
+    def _walk(self, module_name: str) -> Set[str]:
+        visited = {module_name}
+        stack = [module_name]
+        while stack:
+            for name in self._edges.get(stack.pop(), ()):
+                if name not in visited:
+                    visited.add(name)
+                    stack.append(name)
+        return visited
+
+    def _get_local_file(self, module_name: str, project_dir: Path) -> Union[str, None]:
+        module = sys.modules.get(module_name)
+        file = getattr(module, "__file__", None)
+        if not file:
+            return None
+        return self._get_relative_path(Path(file), project_dir)
+
+    def _get_relative_path(self, path: Path, project_dir: Path) -> Union[str, None]:
+        path = path.resolve()
+        if ("site-packages" in path.parts) or ("dist-packages" in path.parts):
+            return None
+        try:
+            return path.relative_to(project_dir).as_posix()
+        except ValueError:
+            return None
@@ -0,0 +1,220 @@
+import builtins
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from importlib.util import resolve_name
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from ._memory_tracker import format_size
+
+__all__ = ("ImportProfiler", "ModuleImportProfile", "ImportTiming",)
+
+
+class ImportTiming:
+    def __init__(self, name: str, self_time: float, cumulative_time: float) -> None:
+        self._name = name
+        self._self_time = self_time
+        self._cumulative_time = cumulative_time
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def self_time(self) -> float:
+        # seconds, without nested imports
+        return self._self_time
+
+    @property
+    def cumulative_time(self) -> float:
+        # seconds, with nested imports
+        return self._cumulative_time
+
+    def __str__(self) -> str:
+        return f"{self._name} {self._self_time:.2f}s"
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}({self._name!r}, {self._self_time!r}, "
+                f"{self._cumulative_time!r})")
+
+
+class ModuleImportProfile:
+    def __init__(self, path: Path, *, track_allocations: bool = False) -> None:
+        self._path = path
+        self._track_allocations = track_allocations
+        self.import_time = 0.0
+        self.import_allocated = 0
+        self.build_time = 0.0
+        self.build_allocated = 0
+        # Modules imported for the first time while importing the scenario file
+        self.imports: List[ImportTiming] = []
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def total_time(self) -> float:
+        return self.import_time + self.build_time
+
+    @property
+    def allocated(self) -> int:
+        # bytes still allocated after the import and the class building
+        return self.import_allocated + self.build_allocated
+
+    def heaviest(self, n: int = 3) -> List[ImportTiming]:
+        return sorted(self.imports, key=lambda x: x.self_time, reverse=True)[:n]
+
+    def __str__(self) -> str:
+        res = (f"{self._path}: {self.total_time:.2f}s (import {self.import_time:.2f}s, "
+               f"build {self.build_time:.2f}s)")
+        if self._track_allocations:
+            res += f", {format_size(self.allocated)}"
+        return res
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self}>"
+
+
+class ImportProfiler:
+    def __init__(self, *, track_allocations: bool = False) -> None:
+        self._profiles: Dict[Path, ModuleImportProfile] = {}
+        # tracemalloc makes imports several times slower, so it is opt-in
+        self._track_allocations = track_allocations
+        # Time spent in nested imports, one item per import in progress
+        self._nested: List[float] = []
+
+    @property
+    def profiles(self) -> Dict[Path, ModuleImportProfile]:
+        return self._profiles
+
+    @contextmanager
+    def measure_import(self, path: Path) -> Iterator[None]:
+        profile = self._get_profile(path)
+        orig_import = builtins.__import__
+        thread_id = get_ident()
+
+        def __import__(name: str, globals: Optional[Mapping[str, Any]] = None,
+                       locals: Optional[Mapping[str, Any]] = None,
+                       fromlist: Sequence[str] = (), level: int = 0) -> Any:
+            # Like `-X importtime`, only the first import of a module is measured
+            resolved = _resolve(name, globals, level)
+            if (get_ident() != thread_id) or (resolved is None) or \
+               ((resolved in sys.modules) and not fromlist):
+                return orig_import(name, globals, locals, fromlist, level)
+
+            imported = set(sys.modules)
+            self._nested.append(0.0)
+            started_at = perf_counter()
+            try:
+                return orig_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = perf_counter() - started_at
+                nested = self._nested.pop()
+                # `from package import module` is attributed to the module,
+                # `fromlist` is None for `import package.module`
+                submodules = [f"{resolved}.{item}" for item in (fromlist or ())
+                              if (f"{resolved}.{item}" in sys.modules) and
+                                 (f"{resolved}.{item}" not in imported)]
+                if submodules:
+                    resolved = ", ".join(submodules)
+                elif resolved in imported:
+                    resolved = None
+                if resolved is None:
+                    # Nothing new was imported by the call itself, only by nested imports
+                    if self._nested:
+                        self._nested[-1] += nested
+                else:
+                    if self._nested:
+                        self._nested[-1] += elapsed
+                    profile.imports.append(ImportTiming(resolved, elapsed - nested, elapsed))
+
+        builtins.__import__ = __import__
+        try:
+            with self._measure() as measurement:
+                yield
+        finally:
+            builtins.__import__ = orig_import
+            self._nested = []
+        profile.import_time, profile.import_allocated = measurement
+
+    @contextmanager
+    def measure_build(self, path: Path) -> Iterator[None]:
+        profile = self._get_profile(path)
+        with self._measure() as measurement:
+            yield
+        profile.build_time, profile.build_allocated = measurement
+
+    def summary(self, *, top: int = 10) -> List[str]:
+        if not self._profiles:
+            return []
+        profiles = sorted(self._profiles.values(), key=lambda p: p.total_time, reverse=True)
+
+        import_time = sum(p.import_time for p in profiles)
+        build_time = sum(p.build_time for p in profiles)
+        allocated = sum(p.allocated for p in profiles)
+        header = (f"vedro-fn import profile: {len(profiles)} files "
+                  f"in {import_time + build_time:.2f}s (import {import_time:.2f}s, "
+                  f"build {build_time:.2f}s)")
+        if self._track_allocations:
+            header += f", {format_size(allocated)} allocated"
+        lines = [header]
+
+        for profile in profiles[:top]:
+            line = f"  {profile}"
+            heaviest = profile.heaviest()
+            if heaviest:
+                line += "; heaviest: " + ", ".join(str(x) for x in heaviest)
+            lines.append(line)
+        if len(profiles) > top:
+            lines.append(f"  ... and {len(profiles) - top} more")
+        return lines
+
+    def _get_profile(self, path: Path) -> ModuleImportProfile:
+        if path not in self._profiles:
+            self._profiles[path] = ModuleImportProfile(
+                path, track_allocations=self._track_allocations
+            )
+        return self._profiles[path]
+
+    @contextmanager
+    def _measure(self) -> Iterator[List[Any]]:
+        # [seconds, bytes still allocated], filled in on exit
+        measurement: List[Any] = [0.0, 0]
+        if not self._track_allocations:
+            started_at = perf_counter()
+            try:
+                yield measurement
+            finally:
+                measurement[0] = perf_counter() - started_at
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        started_at = perf_counter()
+        try:
+            yield measurement
+        finally:
+            measurement[0] = perf_counter() - started_at
+            memory_after, _ = tracemalloc.get_traced_memory()
+            measurement[1] = max(memory_after - memory_before, 0)
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def _resolve(name: str, globals: Optional[Mapping[str, Any]],
+             level: int) -> Union[str, None]:
+    if level == 0:
+        return name
+    if globals is None:
+        return None
+    package = globals.get("__package__") or str(globals.get("__name__", "")).rpartition(".")[0]
+    try:
+        return resolve_name("." * level + name, package)
+    except (ImportError, ValueError):
+        return None
@@ -0,0 +1,229 @@
+import re
+import tracemalloc
+from contextvars import ContextVar, Token
+from typing import Callable, List, Tuple, Type, TypeVar, Union
+
+from vedro import Scenario
+from vedro.core import VirtualScenario
+
+__all__ = ("memory_budget", "get_memory_budget", "MemoryBudgetExceededError", "StepMemory",
+           "MemoryTracker", "get_memory_tracker", "clear_memory_tracker", "start_tracking",
+           "stop_tracking", "check_memory_budget", "format_size",)
+
+T = TypeVar("T", bound=Type[Scenario])
+
+_UNITS = {"": 1, "b": 1, "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3,
+          "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3}
+
+
+def parse_size(size: Union[int, str]) -> int:
+    if isinstance(size, int):
+        value = size
+    else:
+        match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*$", size)
+        if (match is None) or (match.group(2).lower() not in _UNITS):
+            raise ValueError(f"Invalid memory size '{size}', "
+                             "expected bytes or a string like '512MiB'")
+        value = int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+    if value <= 0:
+        raise ValueError(f"Memory size must be greater than 0, {size} given")
+    return value
+
+
+def format_size(size: int, *, sign: bool = False) -> str:
+    value = size / 1024 ** 2
+    return f"{value:+.2f} MiB" if sign else f"{value:.2f} MiB"
+
+
+def memory_budget(peak: Union[int, str]) -> Callable[[T], T]:
+    # @scenario[memory_budget("512MiB")]()
+    budget = parse_size(peak)
+
+    def wrapped(scenario: T) -> T:
+        setattr(scenario, "__vedro_fn_memory_budget__", budget)
+        return scenario
+    return wrapped
+
+
+def get_memory_budget(scenario: VirtualScenario) -> Union[int, None]:
+    orig_scenario = scenario._orig_scenario
+    # Decorators of lazily expanded rows are applied to the template
+    template = getattr(orig_scenario, "__vedro__template__", None)
+    budget = getattr(template, "__vedro_fn_memory_budget__",
+                     getattr(orig_scenario, "__vedro_fn_memory_budget__", None))
+    return budget
+
+
+class MemoryBudgetExceededError(AssertionError):
+    pass
+
+
+class StepMemory:
+    def __init__(self, label: str, peak: int, net: int) -> None:
+        self._label = label
+        self._peak = peak
+        self._net = net
+
+    @property
+    def label(self) -> str:
+        return self._label
+
+    @property
+    def peak(self) -> int:
+        # bytes allocated on top of the memory in use when the step started
+        return self._peak
+
+    @property
+    def net(self) -> int:
+        # bytes still allocated when the step ended
+        return self._net
+
+    def __str__(self) -> str:
+        return (f"{self._label}: peak {format_size(self._peak)}, "
+                f"net {format_size(self._net, sign=True)}")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._label!r}, {self._peak!r}, {self._net!r})"
+
+
+class MemoryTracker:
+    def __init__(self, budget: Union[int, None] = None, *, top_sites: int = 5) -> None:
+        self._budget = budget
+        self._top_sites = top_sites
+        # (label, traced memory at start, [highest traced memory seen])
+        self._frames: List[Tuple[str, int, List[int]]] = []
+        self._steps: List[StepMemory] = []
+        self._peak = 0
+        self._net = 0
+        self._started_tracing = False
+        self._baseline: Union[tracemalloc.Snapshot, None] = None
+        self._exceeded: Union[Tuple[str, List[str]], None] = None
+
+    @property
+    def budget(self) -> Union[int, None]:
+        return self._budget
+
+    @property
+    def peak(self) -> int:
+        return self._peak
+
+    @property
+    def net(self) -> int:
+        return self._net
+
+    @property
+    def steps(self) -> List[StepMemory]:
+        return self._steps
+
+    def start(self) -> None:
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self._budget is not None:
+            self._baseline = tracemalloc.take_snapshot()
+        self._push("scenario")
+
+    def stop(self) -> None:
+        _, start, peak = self._frames[0]
+        current, traced_peak = tracemalloc.get_traced_memory()
+        self._peak = max(peak[0], traced_peak) - start
+        self._net = current - start
+        self._frames = []
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def enter_step(self, label: str) -> None:
+        _, _, peak = self._frames[-1]
+        peak[0] = max(peak[0], tracemalloc.get_traced_memory()[1])
+        self._push(label)
+
+    def exit_step(self) -> None:
+        if len(self._frames) < 2:
+            # The step was entered before tracking started
+            return
+        label, start, peak = self._frames.pop()
+        current, traced_peak = tracemalloc.get_traced_memory()
+        step_peak = max(peak[0], traced_peak)
+        self._steps.append(StepMemory(label, step_peak - start, current - start))
+
+        _, _, parent_peak = self._frames[-1]
+        parent_peak[0] = max(parent_peak[0], step_peak)
+
+        # Locals of the scenario are still alive here, so the snapshot shows what was allocated
+        if (self._exceeded is None) and self._is_exceeded(step_peak):
+            self._exceeded = (label, self._take_top_sites())
+
+    def check_budget(self) -> None:
+        if self._budget is None:
+            return
+        _, start, peak = self._frames[0]
+        scenario_peak = max(peak[0], tracemalloc.get_traced_memory()[1])
+        if not self._is_exceeded(scenario_peak):
+            return
+
+        label, top_sites = self._exceeded or ("scenario", self._take_top_sites())
+        message = (f"Peak memory {format_size(scenario_peak - start)} exceeds "
+                   f"budget {format_size(self._budget)} (exceeded in {label})")
+        if top_sites:
+            message += "\nTop allocation sites:\n" + "\n".join(f"  {x}" for x in top_sites)
+        raise MemoryBudgetExceededError(message)
+
+    def _push(self, label: str) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._frames.append((label, current, [current]))
+
+    def _is_exceeded(self, peak: int) -> bool:
+        if self._budget is None:
+            return False
+        _, start, _ = self._frames[0]
+        return peak - start > self._budget
+
+    def _take_top_sites(self) -> List[str]:
+        assert self._baseline is not None  # for type checker
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        stats = snapshot.compare_to(self._baseline.filter_traces(filters), "lineno")
+
+        top_sites = []
+        for stat in stats[:self._top_sites]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            top_sites.append(f"{frame.filename}:{frame.lineno}: "
+                             f"{format_size(stat.size_diff, sign=True)} "
+                             f"({stat.count_diff:+d} blocks)")
+        return top_sites
+
+
+_tracker: ContextVar[Union[MemoryTracker, None]] = ContextVar("vedro_fn_memory_tracker",
+                                                              default=None)
+
+
+def get_memory_tracker() -> Union[MemoryTracker, None]:
+    return _tracker.get()
+
+
+def clear_memory_tracker() -> None:
+    # The tracker is not stopped, it belongs to another context (e.g. a batched scenario)
+    _tracker.set(None)
+
+
+def start_tracking(tracker: MemoryTracker) -> Token[Union[MemoryTracker, None]]:
+    tracker.start()
+    return _tracker.set(tracker)
+
+
+def stop_tracking(tracker: MemoryTracker, token: Token[Union[MemoryTracker, None]]) -> None:
+    _tracker.reset(token)
+    tracker.stop()
+
+
+def check_memory_budget() -> None:
+    tracker = get_memory_tracker()
+    if tracker is not None:
+        tracker.check_budget()
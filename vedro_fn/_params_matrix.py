@@ -0,0 +1,165 @@
+import sys
+from itertools import product
+from random import Random
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from ._params_row import ParamsRow
+from ._row_ids import UnstableReprError, stable_repr
+
+__all__ = ("ParamsMatrix", "set_full_matrix",)
+
+_REDUCTIONS = ("pairwise", "random",)
+
+_full_matrix = False
+
+
+def set_full_matrix(enabled: bool) -> None:
+    # Reductions are ignored and every combination is generated, configured by the plugin
+    global _full_matrix
+    _full_matrix = enabled
+
+
+# (axis, value index, other axis, other value index), axis < other axis
+_Pair = Tuple[int, int, int, int]
+
+
+class ParamsMatrix:
+    def __init__(self, axes: Mapping[str, Iterable[Any]], *, reduce: Optional[str] = None,
+                 sample: Optional[int] = None, seed: int = 0) -> None:
+        if len(axes) == 0:
+            raise ValueError("Matrix must have at least one axis")
+        if (reduce is not None) and (reduce not in _REDUCTIONS):
+            raise ValueError(f"reduce must be one of {_REDUCTIONS!r} or None, {reduce!r} given")
+        if reduce == "random":
+            if (sample is None) or (sample < 1):
+                raise ValueError(f"sample must be greater than 0, {sample!r} given")
+        elif sample is not None:
+            raise ValueError("sample is only supported with reduce='random'")
+
+        self._names = tuple(axes)
+        self._values = tuple(tuple(values) for values in axes.values())
+        for name, values in zip(self._names, self._values):
+            if len(values) == 0:
+                raise ValueError(f"Axis '{name}' has no values")
+
+        self._reduce = reduce
+        self._sample = sample
+        self._seed = seed
+        self._value_ids = tuple(self._create_value_ids(values) for values in self._values)
+
+    @property
+    def axes(self) -> Dict[str, Tuple[Any, ...]]:
+        return dict(zip(self._names, self._values))
+
+    @property
+    def reduce(self) -> Optional[str]:
+        return self._reduce
+
+    @property
+    def total(self) -> int:
+        # Number of combinations of the full matrix
+        total = 1
+        for values in self._values:
+            total *= len(values)
+        return total
+
+    def __iter__(self) -> Iterator[ParamsRow]:
+        if _full_matrix or (self._reduce is None):
+            combinations = self._iter_product()
+        elif self._reduce == "pairwise":
+            combinations = self._iter_pairwise()
+        else:
+            combinations = self._iter_random()
+
+        for indices in combinations:
+            yield self._create_row(indices)
+
+    def _iter_product(self) -> Iterator[Tuple[int, ...]]:
+        return product(*(range(len(values)) for values in self._values))
+
+    def _iter_random(self) -> Iterator[Tuple[int, ...]]:
+        total = self.total
+        assert self._sample is not None
+        if self._sample >= total:
+            yield from self._iter_product()
+            return
+
+        # Combinations are decoded from their positions in the full matrix,
+        # so the matrix itself is never built
+        random = Random(self._seed)
+        if total <= sys.maxsize:
+            positions: Set[int] = set(random.sample(range(total), self._sample))
+        else:
+            # `sample` needs the length of the range, which overflows
+            positions = set()
+            while len(positions) < self._sample:
+                positions.add(random.randrange(total))
+        for position in sorted(positions):
+            indices = []
+            for values in reversed(self._values):
+                position, idx = divmod(position, len(values))
+                indices.append(idx)
+            yield tuple(reversed(indices))
+
+    def _iter_pairwise(self) -> Iterator[Tuple[int, ...]]:
+        sizes = [len(values) for values in self._values]
+        if len(sizes) < 2:
+            yield from self._iter_product()
+            return
+
+        uncovered: Set[_Pair] = {
+            (i, a, j, b)
+            for i in range(len(sizes)) for j in range(i + 1, len(sizes))
+            for a in range(sizes[i]) for b in range(sizes[j])
+        }
+        # Greedy: every row starts from the first uncovered pair and picks the values
+        # of the remaining axes that cover the most uncovered pairs (deterministic)
+        while uncovered:
+            i, a, j, b = min(uncovered)
+            row: List[Optional[int]] = [None] * len(sizes)
+            row[i], row[j] = a, b
+
+            for axis in range(len(sizes)):
+                if row[axis] is not None:
+                    continue
+                best, best_score = 0, -1
+                for value in range(sizes[axis]):
+                    score = sum(1 for other, other_value in enumerate(row)
+                                if (other_value is not None) and
+                                (self._pair(axis, value, other, other_value) in uncovered))
+                    if score > best_score:
+                        best, best_score = value, score
+                row[axis] = best
+
+            indices = tuple(v for v in row if v is not None)
+            for x in range(len(indices)):
+                for y in range(x + 1, len(indices)):
+                    uncovered.discard((x, indices[x], y, indices[y]))
+            yield indices
+
+    def _pair(self, axis: int, value: int, other: int, other_value: int) -> _Pair:
+        if axis < other:
+            return axis, value, other, other_value
+        return other, other_value, axis, value
+
+    def _create_row(self, indices: Tuple[int, ...]) -> ParamsRow:
+        kwargs = {name: values[idx]
+                  for name, values, idx in zip(self._names, self._values, indices)}
+        # IDs depend only on the values, so a row keeps its ID whether the matrix is reduced or not
+        row_id = ",".join(f"{name}={value_ids[idx]}"
+                          for name, value_ids, idx in zip(self._names, self._value_ids, indices))
+        return ParamsRow((), kwargs, id=row_id)
+
+    def _create_value_ids(self, values: Tuple[Any, ...]) -> Tuple[str, ...]:
+        value_ids = []
+        for idx, value in enumerate(values):
+            try:
+                value_ids.append(stable_repr(value))
+            except UnstableReprError:
+                value_ids.append(f"#{idx}")
+        return tuple(value_ids)
+
+    def __repr__(self) -> str:
+        axes = ", ".join(f"{name}={len(values)}"
+                         for name, values in zip(self._names, self._values))
+        return f"<{self.__class__.__name__} {axes} reduce={self._reduce!r}>"
@@ -0,0 +1,42 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+__all__ = ("ParamsRow", "iter_params_rows",)
+
+
+class ParamsRow:
+    __slots__ = ("args", "kwargs", "decorators", "id",)
+
+    # Deferred rows are decoded by `resolve()` when the scenario runs
+    is_deferred = False
+
+    def __init__(self, args: Tuple[Any, ...], kwargs: Dict[str, Any],
+                 decorators: Tuple[Callable[..., Any], ...] = (), *,
+                 id: Optional[str] = None) -> None:
+        self.args = args
+        self.kwargs = kwargs
+        self.decorators = decorators
+        self.id = id
+
+    def resolve(self) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        return self.args, self.kwargs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.args!r}, {self.kwargs!r})"
+
+
+def _to_params_row(params: Any) -> ParamsRow:
+    if isinstance(params, ParamsRow):
+        return params
+
+    # `params(...)` and `params[...](...)` record their values on the decorated function
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # type: ignore
+        pass
+
+    params(__init__)
+    (args, kwargs, decorators), = getattr(__init__, "__vedro__params__")
+    return ParamsRow(args, kwargs, decorators)
+
+
+def iter_params_rows(params: Iterable[Any]) -> Iterator[ParamsRow]:
+    for row in params:
+        yield _to_params_row(row)
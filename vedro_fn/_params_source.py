@@ -0,0 +1,131 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from ._import_graph import record_file_read
+from ._params_row import ParamsRow
+
+__all__ = ("ParamsSource", "JsonLinesParamsSource", "CsvParamsSource", "DeferredParamsRow",
+           "params_from_jsonl", "params_from_csv",)
+
+ResolvedType = Tuple[Tuple[Any, ...], Dict[str, Any]]
+
+
+class ParamsSource(ABC):
+    def __init__(self, path: Union[str, Path], *, id_field: Optional[str] = None,
+                 encoding: str = "utf-8") -> None:
+        self._path = Path(path)
+        # Relative paths are resolved against the working (project) directory at import time
+        self._abs_path = self._path.absolute()
+        self._id_field = id_field
+        self._encoding = encoding
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @abstractmethod
+    def __iter__(self) -> Iterator["DeferredParamsRow"]:
+        pass
+
+    @abstractmethod
+    def read_row(self, offset: int) -> ResolvedType:
+        pass
+
+    def _create_row_id(self, lineno: int, value: Any = None) -> str:
+        if self._id_field is None:
+            return f"{self._path}:{lineno}"
+        if not isinstance(value, dict) or (self._id_field not in value):
+            raise KeyError(f"Field '{self._id_field}' not found at {self._path}:{lineno}")
+        return str(value[self._id_field])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self._path)!r})"
+
+
+class DeferredParamsRow(ParamsRow):
+    __slots__ = ("_source", "_offset",)
+
+    is_deferred = True
+
+    def __init__(self, source: ParamsSource, offset: int, *, id: str) -> None:
+        super().__init__((), {}, id=id)
+        self._source = source
+        self._offset = offset
+
+    def resolve(self) -> ResolvedType:
+        # Decoded on every call, the row is not kept in memory between runs
+        return self._source.read_row(self._offset)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._source!r}, {self._offset!r}, id={self.id!r})"
+
+
+class JsonLinesParamsSource(ParamsSource):
+    def __iter__(self) -> Iterator[DeferredParamsRow]:
+        record_file_read(self._abs_path)
+        with open(self._abs_path, "rb") as f:
+            offset = 0
+            for lineno, line in enumerate(f, start=1):
+                if line.strip():
+                    value = (json.loads(line.decode(self._encoding))
+                             if (self._id_field is not None) else None)
+                    yield DeferredParamsRow(self, offset,
+                                            id=self._create_row_id(lineno, value))
+                offset += len(line)
+
+    def read_row(self, offset: int) -> ResolvedType:
+        with open(self._abs_path, "rb") as f:
+            f.seek(offset)
+            value = json.loads(f.readline().decode(self._encoding))
+
+        if isinstance(value, dict):
+            return (), value
+        if isinstance(value, list):
+            return tuple(value), {}
+        return (value,), {}
+
+
+class CsvParamsSource(ParamsSource):
+    def __init__(self, path: Union[str, Path], *, id_field: Optional[str] = None,
+                 encoding: str = "utf-8", **fmtparams: Any) -> None:
+        super().__init__(path, id_field=id_field, encoding=encoding)
+        self._fmtparams = fmtparams
+        self._fieldnames: Optional[List[str]] = None
+
+    def __iter__(self) -> Iterator[DeferredParamsRow]:
+        record_file_read(self._abs_path)
+        with open(self._abs_path, "r", encoding=self._encoding, newline="") as f:
+            # Lines are pulled one by one, so `tell()` points to the start of the next record
+            reader = csv.reader(iter(f.readline, ""), **self._fmtparams)
+            self._fieldnames = next(reader, [])
+            while True:
+                offset = f.tell()
+                record = next(reader, None)
+                if record is None:
+                    break
+                if not record:
+                    continue
+                value = dict(zip(self._fieldnames, record))
+                yield DeferredParamsRow(self, offset,
+                                        id=self._create_row_id(reader.line_num, value))
+
+    def read_row(self, offset: int) -> ResolvedType:
+        with open(self._abs_path, "r", encoding=self._encoding, newline="") as f:
+            if self._fieldnames is None:
+                self._fieldnames = next(csv.reader(iter(f.readline, ""), **self._fmtparams), [])
+            f.seek(offset)
+            record = next(csv.reader(iter(f.readline, ""), **self._fmtparams))
+        return (), dict(zip(self._fieldnames, record))
+
+
+def params_from_jsonl(path: Union[str, Path], *, id_field: Optional[str] = None,
+                      encoding: str = "utf-8") -> JsonLinesParamsSource:
+    return JsonLinesParamsSource(path, id_field=id_field, encoding=encoding)
+
+
+def params_from_csv(path: Union[str, Path], *, id_field: Optional[str] = None,
+                    encoding: str = "utf-8", **fmtparams: Any) -> CsvParamsSource:
+    return CsvParamsSource(path, id_field=id_field, encoding=encoding, **fmtparams)
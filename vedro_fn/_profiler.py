@@ -0,0 +1,140 @@
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from cProfile import Profile
+from pathlib import Path
+from threading import Event, Thread, get_ident
+from types import CodeType, FrameType
+from typing import Dict, Iterator, Tuple, Type, TypeVar, Union
+
+from vedro import Scenario
+from vedro.core import VirtualScenario
+
+__all__ = ("profile", "is_profiled", "ScenarioProfiler", "get_step_profiler",
+           "clear_step_profiler", "start_profiling", "stop_profiling", "profile_body",)
+
+T = TypeVar("T", bound=Type[Scenario])
+
+
+def profile(scenario: T) -> T:
+    # @scenario[profile]()
+    setattr(scenario, "__vedro_fn_profile__", True)
+    return scenario
+
+
+def is_profiled(scenario: VirtualScenario) -> bool:
+    orig_scenario = scenario._orig_scenario
+    # Decorators of lazily expanded rows are applied to the template
+    template = getattr(orig_scenario, "__vedro__template__", None)
+    return bool(getattr(template, "__vedro_fn_profile__",
+                        getattr(orig_scenario, "__vedro_fn_profile__", False)))
+
+
+class ScenarioProfiler:
+    def __init__(self, *, interval: float = 0.001) -> None:
+        self._interval = interval
+        self._profile = Profile()
+        self._steps: Tuple[str, ...] = ()
+        self._stacks: Dict[str, int] = {}
+        self._labels: Dict[CodeType, str] = {}
+        self._thread_id: Union[int, None] = None
+        self._sampler: Union[Thread, None] = None
+        self._stopped = Event()
+
+    @property
+    def collapsed_stacks(self) -> Dict[str, int]:
+        # "given create user;module.fn (path:lineno);..." -> number of samples
+        return self._stacks
+
+    def enable(self) -> None:
+        # Called by the thread running the scenario body, cProfile is per thread
+        self._thread_id = get_ident()
+        self._stopped.clear()
+        self._sampler = Thread(target=self._sample, name="vedro_fn_profiler", daemon=True)
+        self._sampler.start()
+        self._profile.enable()
+
+    def disable(self) -> None:
+        if self._sampler is None:
+            return
+        self._profile.disable()
+        self._stopped.set()
+        self._sampler.join()
+        self._sampler = None
+
+    def stop(self) -> None:
+        self.disable()
+
+    def enter_step(self, label: str) -> None:
+        # Tuples are replaced, not mutated, so the sampler never sees a partial update
+        self._steps = self._steps + (label,)
+
+    def exit_step(self) -> None:
+        self._steps = self._steps[:-1]
+
+    def dump_stats(self, path: Path) -> None:
+        self._profile.dump_stats(str(path))
+
+    def dump_collapsed_stacks(self, path: Path) -> None:
+        lines = [f"{stack} {count}\n" for stack, count in sorted(self._stacks.items())]
+        path.write_text("".join(lines))
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)  # type: ignore[arg-type]
+            if frame is None:
+                continue
+            stack = ";".join((self._steps or ("(scenario)",)) + self._walk(frame))
+            self._stacks[stack] = self._stacks.get(stack, 0) + 1
+
+    def _walk(self, frame: Union[FrameType, None]) -> Tuple[str, ...]:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        return tuple(reversed(labels))
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)  # Python 3.11+
+            label = f"{name} ({code.co_filename}:{code.co_firstlineno})".replace(";", ",")
+            self._labels[code] = label
+        return label
+
+
+_profiler: ContextVar[Union[ScenarioProfiler, None]] = ContextVar("vedro_fn_step_profiler",
+                                                                  default=None)
+
+
+def get_step_profiler() -> Union[ScenarioProfiler, None]:
+    return _profiler.get()
+
+
+def clear_step_profiler() -> None:
+    # The profiler is not stopped, it belongs to another context (e.g. a batched scenario)
+    _profiler.set(None)
+
+
+def start_profiling(profiler: ScenarioProfiler) -> Token[Union[ScenarioProfiler, None]]:
+    # Only the scenario body (see `profile_body`) is profiled, not other plugins
+    return _profiler.set(profiler)
+
+
+def stop_profiling(profiler: ScenarioProfiler,
+                   token: Token[Union[ScenarioProfiler, None]]) -> None:
+    _profiler.reset(token)
+    profiler.stop()
+
+
+@contextmanager
+def profile_body() -> Iterator[None]:
+    profiler = _profiler.get()
+    if profiler is None:
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
@@ -0,0 +1,243 @@
+from asyncio import AbstractEventLoop, Semaphore, get_running_loop
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from inspect import isasyncgenfunction
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+from weakref import WeakKeyDictionary, WeakSet
+
+__all__ = ("resource", "Resource", "ResourceStats", "iter_resources", "has_resources",
+           "close_resources", "set_default_pool_size", "start_leasing", "stop_leasing",)
+
+T = TypeVar("T")
+
+FactoryType = Callable[[], Union[AsyncContextManager[T], AsyncIterator[T]]]
+
+_default_pool_size: Optional[int] = None
+
+
+def set_default_pool_size(size: Optional[int]) -> None:
+    # Used by pools created afterwards, configured by the plugin
+    global _default_pool_size
+    _default_pool_size = size
+
+
+class ResourceStats:
+    def __init__(self) -> None:
+        self.created = 0
+        self.reused = 0
+        self.waited = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def __str__(self) -> str:
+        return (f"{self.created} created, {self.reused} reused, {self.waited} waited, "
+                f"peak {self.peak_in_use} in use")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self}>"
+
+
+class _Pool(Generic[T]):
+    def __init__(self, factory: Callable[[], AsyncContextManager[T]], stats: ResourceStats, *,
+                 max_size: Optional[int]) -> None:
+        self._factory = factory
+        self._stats = stats
+        self._semaphore = Semaphore(max_size) if (max_size is not None) else None
+        self._idle: List[T] = []
+        # (resource, its context manager) in creation order
+        self._created: List[Tuple[T, AsyncContextManager[T]]] = []
+
+    async def acquire(self) -> T:
+        if self._semaphore is not None:
+            if self._semaphore.locked():
+                self._stats.waited += 1
+            await self._semaphore.acquire()
+
+        try:
+            if self._idle:
+                obj = self._idle.pop()
+                self._stats.reused += 1
+            else:
+                manager = self._factory()
+                obj = await manager.__aenter__()
+                self._created.append((obj, manager))
+                self._stats.created += 1
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+
+        self._stats.in_use += 1
+        self._stats.peak_in_use = max(self._stats.peak_in_use, self._stats.in_use)
+        return obj
+
+    def release(self, obj: T) -> None:
+        self._idle.append(obj)
+        self._stats.in_use -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def close(self) -> None:
+        created, self._created, self._idle = self._created, [], []
+        # Resources are closed in reverse creation order, errors don't prevent closing the rest
+        errors = []
+        for _, manager in reversed(created):
+            try:
+                await manager.__aexit__(None, None, None)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+
+# (pool, resource) acquired by the running scenario
+_LeaseType = Tuple[_Pool[Any], Any]
+
+_leases: ContextVar[Union[List[_LeaseType], None]] = ContextVar("vedro_fn_resource_leases",
+                                                                default=None)
+
+
+def start_leasing(leases: List[_LeaseType]) -> Token[Union[List[_LeaseType], None]]:
+    return _leases.set(leases)
+
+
+def stop_leasing(token: Token[Union[List[_LeaseType], None]]) -> None:
+    # Resources acquired by the scenario are returned to their pools
+    leases = _leases.get()
+    _leases.reset(token)
+    for pool, obj in reversed(leases or []):
+        pool.release(obj)
+
+
+class Resource(Generic[T]):
+    def __init__(self, factory: FactoryType[T], *, max_size: Optional[int] = None) -> None:
+        if (max_size is not None) and (max_size < 1):
+            raise ValueError(f"max_size must be greater than 0 or None, {max_size} given")
+
+        if isasyncgenfunction(factory):
+            self._factory = cast(Callable[[], AsyncContextManager[T]],
+                                 asynccontextmanager(factory))
+        else:
+            self._factory = cast(Callable[[], AsyncContextManager[T]], factory)
+        self._name: str = getattr(factory, "__qualname__", repr(factory))
+        self._max_size = max_size
+        self._stats = ResourceStats()
+        # One pool per event loop, resources can't be shared between loops
+        self._pools: "WeakKeyDictionary[AbstractEventLoop, _Pool[T]]" = WeakKeyDictionary()
+        _resources.add(self)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_size
+
+    @property
+    def stats(self) -> ResourceStats:
+        return self._stats
+
+    async def acquire(self) -> T:
+        # async with given:
+        #     client = await http_client.acquire()
+        pool = self._get_pool()
+        obj = await pool.acquire()
+
+        leases = _leases.get()
+        if leases is not None:
+            leases.append((pool, obj))
+        return obj
+
+    def release(self, obj: T) -> None:
+        # Only needed outside of scenarios, where resources are not returned automatically
+        leases = _leases.get() or []
+        for idx, (pool, leased) in enumerate(leases):
+            if leased is obj:
+                del leases[idx]
+                pool.release(obj)
+                return
+        self._get_pool().release(obj)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[T]:
+        obj = await self.acquire()
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    async def close(self) -> None:
+        pool = self._pools.pop(get_running_loop(), None)
+        if pool is not None:
+            await pool.close()
+
+    def _get_pool(self) -> _Pool[T]:
+        loop = get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            max_size = self._max_size if (self._max_size is not None) else _default_pool_size
+            pool = _Pool(self._factory, self._stats, max_size=max_size)
+            self._pools[loop] = pool
+        return pool
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._name!r} max_size={self._max_size!r}>"
+
+
+_resources: "WeakSet[Resource[Any]]" = WeakSet()
+
+
+def iter_resources() -> List[Resource[Any]]:
+    return sorted(_resources, key=lambda r: r.name)
+
+
+def has_resources() -> bool:
+    return len(_resources) > 0
+
+
+async def close_resources() -> None:
+    errors = []
+    for res in list(_resources):
+        try:
+            await res.close()
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+@overload
+def resource(fn: FactoryType[T], /) -> Resource[T]:  # pragma: no cover
+    ...
+
+
+@overload
+def resource(*, max_size: Optional[int] = None) -> Callable[[FactoryType[T]],
+                                                            Resource[T]]:  # pragma: no cover
+    ...
+
+
+def resource(fn: Optional[FactoryType[T]] = None, /, *,
+             max_size: Optional[int] = None) -> Union[Resource[T],
+                                                      Callable[[FactoryType[T]], Resource[T]]]:
+    if fn is not None:
+        return Resource(fn, max_size=max_size)
+
+    def wrapper(fn: FactoryType[T]) -> Resource[T]:
+        return Resource(fn, max_size=max_size)
+
+    return wrapper
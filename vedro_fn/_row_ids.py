@@ -0,0 +1,62 @@
+import re
+from hashlib import blake2b
+from typing import Any, Union
+
+from vedro.core import VirtualScenario
+
+__all__ = ("get_row_id", "get_row_key", "stable_repr", "UnstableReprError",)
+
+# Default object reprs (<Foo object at 0x7f...>) differ between runs
+_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class UnstableReprError(ValueError):
+    pass
+
+
+def stable_repr(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        items = ", ".join(stable_repr(x) for x in value)
+        return f"[{items}]" if isinstance(value, list) else f"({items})"
+    if isinstance(value, dict):
+        items = ", ".join(f"{stable_repr(k)}: {stable_repr(v)}" for k, v in value.items())
+        return f"{{{items}}}"
+    if isinstance(value, (set, frozenset)):
+        # Iteration order of sets depends on hash randomization
+        return "{" + ", ".join(sorted(stable_repr(x) for x in value)) + "}"
+
+    value_repr = repr(value)
+    if _ADDRESS_PATTERN.search(value_repr):
+        raise UnstableReprError(value_repr)
+    return value_repr
+
+
+def get_row_id(scenario: VirtualScenario) -> Union[str, None]:
+    # Rows from params sources carry their own IDs
+    row = getattr(scenario._orig_scenario, "__vedro_fn_row__", None)
+    if (row is not None) and (row.id is not None):
+        return str(row.id)
+
+    if scenario.template_index is None:
+        return None
+
+    template_args = scenario.template_args
+    if template_args is not None:
+        # Eager params are bound to the generated `__init__(self, *args, **kwargs)`
+        arguments = {k: v for k, v in template_args.arguments.items() if k != "self"}
+        try:
+            value_repr = stable_repr(arguments)
+        except UnstableReprError:
+            pass
+        else:
+            return blake2b(value_repr.encode(), digest_size=8).hexdigest()
+
+    # Fall back to the position
+    return f"#{scenario.template_index}"
+
+
+def get_row_key(scenario: VirtualScenario) -> str:
+    row_id = get_row_id(scenario)
+    if row_id is None:
+        return scenario.unique_id
+    return f"{scenario.rel_path}::{scenario.name}[{row_id}]"
@@ -0,0 +1,238 @@
+from abc import ABC, abstractmethod
+from asyncio import Future, Semaphore, gather, get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from time import time
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple, Type, Union
+from weakref import WeakSet
+
+from vedro import Scenario, defer
+from vedro.core import VirtualScenario
+from vedro.plugins.deferrer import _deferrer
+
+from ._benchmark import BenchmarkStats, collect_benchmarks, start_collecting
+from ._memory_tracker import clear_memory_tracker
+from ._profiler import clear_step_profiler
+from ._resource_pool import start_leasing, stop_leasing
+from ._step_timings import StepRecorder, get_step_recorder, start_recording
+
+__all__ = ("ScenarioBatch", "RowBatch", "ThreadBatch", "RowCallType", "SyncCallType",
+           "get_scenario_batch", "cancel_scenario_batches",)
+
+RowCallType = Callable[[Type[Scenario]], Awaitable[None]]
+SyncCallType = Callable[[Type[Scenario]], None]
+
+_deferred: ContextVar[Union[List[_deferrer.Deferrable], None]] = ContextVar(
+    "vedro_fn_deferred", default=None
+)
+
+
+class _DeferredQueue:
+    # `defer()` appends to the queue of the Deferrer plugin, which runs it when the current
+    # scenario ends. Calls made by batched scenarios are kept until they are reported
+    def __init__(self, queue: Any) -> None:
+        self._queue = queue
+
+    def append(self, deferrable: _deferrer.Deferrable) -> None:
+        deferred = _deferred.get()
+        if deferred is None:
+            self._queue.append(deferrable)
+        else:
+            deferred.append(deferrable)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._queue, name)
+
+
+def _route_deferred() -> None:
+    # vedro has no hook for the queue of `defer()`, it is replaced while batches run
+    if not isinstance(_deferrer._queue, _DeferredQueue):
+        setattr(_deferrer, "_queue", _DeferredQueue(_deferrer._queue))
+
+
+def _unroute_deferred() -> None:
+    if isinstance(_deferrer._queue, _DeferredQueue):
+        setattr(_deferrer, "_queue", _deferrer._queue._queue)
+
+
+class _BatchRun:
+    def __init__(self) -> None:
+        self.recorder = StepRecorder()
+        self.benchmarks: List[BenchmarkStats] = []
+        self.deferred: List[_deferrer.Deferrable] = []
+        self.started_at: Union[float, None] = None
+        self.ended_at: Union[float, None] = None
+        self.future: Union["Future[None]", None] = None
+
+    def isolate(self) -> None:
+        # Batched scenarios run in copies of the context of the scenario that started
+        # the batch, so the per-scenario state is replaced. Profiling and memory tracking
+        # are never started for batched scenarios (refused by the ScenarioLoader and
+        # skipped by the VedroFnPlugin), the context is cleared just in case
+        start_recording(self.recorder)
+        start_collecting(self.benchmarks)
+        _deferred.set(self.deferred)
+        clear_step_profiler()
+        clear_memory_tracker()
+        self.started_at = time()
+
+    def finish(self) -> None:
+        self.ended_at = time()
+
+    def replay(self) -> None:
+        # Step timings, benchmarks and deferred calls are handed over to the scenario
+        # reporting the run
+        recorder = get_step_recorder()
+        if recorder is not None:
+            for timing in self.recorder:
+                recorder.record(timing)
+        collect_benchmarks(self.benchmarks)
+        for fn, args, kwargs in self.deferred:
+            defer(fn, *args, **kwargs)
+
+
+class ScenarioBatch(ABC):
+    def __init__(self, *, limit: int) -> None:
+        if limit < 1:
+            raise ValueError(f"limit must be greater than 0, {limit} given")
+        self._limit = limit
+        self._started: Set[Type[Scenario]] = set()
+        self._pending: List[Type[Scenario]] = []
+        self._runs: Dict[Type[Scenario], _BatchRun] = {}
+        self._timings: Dict[Type[Scenario], Tuple[float, float]] = {}
+        _batches.add(self)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def schedule(self, scenarios: List[Type[Scenario]]) -> None:
+        # Scenarios started together, the first of them is about to run. Each scenario runs
+        # in the batch once, later runs of it (e.g. reruns) are not batched
+        if not scenarios or (scenarios[0] in self._started) or (scenarios[0] in self._pending):
+            return
+        self._pending = [scn for scn in scenarios if scn not in self._started]
+
+    async def run(self, scenario: Type[Scenario]) -> None:
+        if scenario in self._pending:
+            pending, self._pending = self._pending, []
+            _route_deferred()
+            for scn in pending:
+                self._started.add(scn)
+                started = _BatchRun()
+                started.future = self._start(scn, started)
+                self._runs[scn] = started
+
+        batch_run = self._runs.pop(scenario, None)
+        if (batch_run is None) or (batch_run.future is None):
+            await self._run_directly(scenario)
+            return
+
+        try:
+            await batch_run.future
+        finally:
+            batch_run.replay()
+            if (batch_run.started_at is not None) and (batch_run.ended_at is not None):
+                self._timings[scenario] = (batch_run.started_at, batch_run.ended_at)
+
+    def pop_timing(self, scenario: Type[Scenario]) -> Union[Tuple[float, float], None]:
+        # Started and ended at (time.time()) of the scenario run in the batch, which starts
+        # before the scenario's turn
+        return self._timings.pop(scenario, None)
+
+    async def cancel(self) -> None:
+        # Scenarios started but never reported (e.g. the run was interrupted)
+        futures = [batch_run.future for batch_run in self._runs.values()
+                   if batch_run.future is not None]
+        self._pending, self._runs, self._timings = [], {}, {}
+        for future in futures:
+            future.cancel()
+        await gather(*futures, return_exceptions=True)
+
+    @abstractmethod
+    def _start(self, scenario: Type[Scenario], batch_run: _BatchRun) -> "Future[None]":
+        pass
+
+    @abstractmethod
+    async def _run_directly(self, scenario: Type[Scenario]) -> None:
+        pass
+
+
+class RowBatch(ScenarioBatch):
+    # Param rows of an async scenario, run as tasks on the event loop
+    def __init__(self, call: RowCallType, *, limit: int) -> None:
+        super().__init__(limit=limit)
+        self._call = call
+        self._semaphore: Union[Semaphore, None] = None
+
+    def _start(self, scenario: Type[Scenario], batch_run: _BatchRun) -> "Future[None]":
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self._limit)
+        return get_running_loop().create_task(self._run_isolated(scenario, batch_run,
+                                                                 self._semaphore))
+
+    async def _run_directly(self, scenario: Type[Scenario]) -> None:
+        await self._call(scenario)
+
+    async def _run_isolated(self, scenario: Type[Scenario], batch_run: _BatchRun,
+                            semaphore: Semaphore) -> None:
+        async with semaphore:
+            batch_run.isolate()
+            token = start_leasing([])
+            try:
+                await self._call(scenario)
+            finally:
+                batch_run.finish()
+                stop_leasing(token)
+
+
+class ThreadBatch(ScenarioBatch):
+    # Sync scenarios, run in a thread pool of `limit` workers
+    def __init__(self, *, limit: int) -> None:
+        super().__init__(limit=limit)
+        self._executor: Union[ThreadPoolExecutor, None] = None
+
+    def _start(self, scenario: Type[Scenario], batch_run: _BatchRun) -> "Future[None]":
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._limit,
+                                                thread_name_prefix="vedro_fn_scenario")
+        # Threads don't inherit the context, every scenario gets its own copy
+        context = copy_context()
+        return get_running_loop().run_in_executor(self._executor, context.run,
+                                                  self._run_isolated, scenario, batch_run)
+
+    async def _run_directly(self, scenario: Type[Scenario]) -> None:
+        self._get_call(scenario)(scenario)
+
+    async def cancel(self) -> None:
+        await super().cancel()
+        if self._executor is not None:
+            # Scenarios already running in threads can't be interrupted
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run_isolated(self, scenario: Type[Scenario], batch_run: _BatchRun) -> None:
+        batch_run.isolate()
+        try:
+            self._get_call(scenario)(scenario)
+        finally:
+            batch_run.finish()
+
+    def _get_call(self, scenario: Type[Scenario]) -> SyncCallType:
+        # Set by the ScenarioLoader, scenarios of different functions share the batch
+        call: SyncCallType = getattr(scenario, "__vedro_fn_call__")
+        return call
+
+
+_batches: "WeakSet[ScenarioBatch]" = WeakSet()
+
+
+def get_scenario_batch(scenario: VirtualScenario) -> Union[ScenarioBatch, None]:
+    batch: Any = getattr(scenario._orig_scenario, "__vedro_fn_batch__", None)
+    return batch if isinstance(batch, ScenarioBatch) else None
+
+
+async def cancel_scenario_batches() -> None:
+    for batch in list(_batches):
+        await batch.cancel()
+    _unroute_deferred()
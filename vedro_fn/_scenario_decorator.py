@@ -1,15 +1,20 @@
-from typing import Any, Callable, Sequence, Tuple, Union, overload
+from asyncio import iscoroutinefunction
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Tuple, Union, overload
 
-from ._scenario_descriptor import ScenarioDescriptor
+from ._params_matrix import ParamsMatrix
+from ._scenario_descriptor import ParamsType, ScenarioDescriptor
 
 __all__ = ("scenario",)
 
 
 class _ScenarioDecorator:
     def __init__(self, decorators: Tuple[Callable[..., Any], ...] = (),
-                 params: Tuple[Any, ...] = ()) -> None:
+                 params: ParamsType = (), *,
+                 concurrency: Optional[int] = None, threaded: Optional[bool] = None) -> None:
         self._decorators = decorators
         self._params = params
+        self._concurrency = concurrency
+        self._threaded = threaded
 
     @overload
     def __call__(self, /) -> "_ScenarioDecorator":  # pragma: no cover
@@ -22,23 +27,61 @@ class _ScenarioDecorator:
 
     @overload
     def __call__(self, /,
-                 fn_or_params: Sequence[Any]) -> "_ScenarioDecorator":  # pragma: no cover
+                 fn_or_params: Iterable[Any]) -> "_ScenarioDecorator":  # pragma: no cover
         ...
 
     def __call__(self, /,
-                 fn_or_params: Union[Sequence[Any], Callable[..., Any], None] = None
+                 fn_or_params: Union[Iterable[Any], Callable[..., Any], None] = None
                  ) -> Union[ScenarioDescriptor, "_ScenarioDecorator"]:
         if fn_or_params is None:
             return self
 
         if callable(fn_or_params):
-            return ScenarioDescriptor(fn_or_params, self._decorators, self._params)
+            if (self._concurrency is not None) and not iscoroutinefunction(fn_or_params):
+                raise TypeError("Only async scenarios can run param rows concurrently, "
+                                f"'{fn_or_params.__name__}' is not async")
+            if self._threaded and iscoroutinefunction(fn_or_params):
+                raise TypeError("Only sync scenarios can run in threads, "
+                                f"'{fn_or_params.__name__}' is async")
+            return ScenarioDescriptor(fn_or_params, self._decorators, self._params,
+                                      concurrency=self._concurrency, threaded=self._threaded)
 
-        return _ScenarioDecorator(self._decorators, tuple(fn_or_params))
+        if isinstance(fn_or_params, Sequence):
+            return self._replace(params=tuple(fn_or_params))
+
+        # Any other iterable (e.g. generator) is kept as is and expanded lazily
+        return self._replace(params=fn_or_params)
+
+    def matrix(self, axes: Optional[Mapping[str, Iterable[Any]]] = None, /, *,
+               reduce: Optional[str] = None, sample: Optional[int] = None, seed: int = 0,
+               **named_axes: Iterable[Any]) -> "_ScenarioDecorator":
+        # @scenario.matrix(browser=["chrome", "firefox"], os=["linux", "macos"], reduce="pairwise")
+        # Axes named as the options (e.g. `reduce`) can be given as a mapping
+        matrix = ParamsMatrix({**(axes or {}), **named_axes},
+                              reduce=reduce, sample=sample, seed=seed)
+        return self._replace(params=matrix)
+
+    def concurrently(self, *, limit: int) -> "_ScenarioDecorator":
+        # @scenario.concurrently(limit=20)([params(...), ...])
+        # Rows of an async scenario run at the same time and are still reported one by one
+        if limit < 1:
+            raise ValueError(f"limit must be greater than 0, {limit} given")
+        return self._replace(concurrency=limit)
+
+    def threaded(self, enabled: bool = True) -> "_ScenarioDecorator":
+        # @scenario.threaded()
+        # Sync scenarios run in the thread pool of the plugin, so blocking calls overlap.
+        # `threaded(False)` opts out when the plugin runs all sync scenarios in threads
+        return self._replace(threaded=enabled)
 
     def __getitem__(self, item: Any) -> "_ScenarioDecorator":
         decorators = item if isinstance(item, tuple) else (item,)
-        return _ScenarioDecorator(decorators)
+        return self._replace(decorators=decorators, params=())
+
+    def _replace(self, **changes: Any) -> "_ScenarioDecorator":
+        options = {"decorators": self._decorators, "params": self._params,
+                   "concurrency": self._concurrency, "threaded": self._threaded}
+        return _ScenarioDecorator(**{**options, **changes})
 
 
 scenario = _ScenarioDecorator()
@@ -1,15 +1,20 @@
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
 
-__all__ = ("ScenarioDescriptor",)
+__all__ = ("ScenarioDescriptor", "ParamsType",)
+
+ParamsType = Union[Tuple[Any, ...], Iterable[Any]]
 
 
 class ScenarioDescriptor:
     def __init__(self, fn: Callable[..., Any],
                  decorators: Tuple[Callable[..., Any], ...] = (),
-                 params: Tuple[Any, ...] = ()) -> None:
+                 params: ParamsType = (), *,
+                 concurrency: Optional[int] = None, threaded: Optional[bool] = None) -> None:
         self._fn = fn
         self._decorators = decorators
         self._params = params
+        self._concurrency = concurrency
+        self._threaded = threaded
 
     @property
     def name(self) -> str:
@@ -24,5 +29,20 @@ class ScenarioDescriptor:
         return self._decorators
 
     @property
-    def params(self) -> Tuple[Any, ...]:
+    def params(self) -> ParamsType:
         return self._params
+
+    @property
+    def is_lazy(self) -> bool:
+        # Params given as an arbitrary iterable (e.g. generator) are expanded on demand
+        return not isinstance(self._params, tuple)
+
+    @property
+    def concurrency(self) -> Optional[int]:
+        # Max number of param rows running at the same time, None if rows run one by one
+        return self._concurrency
+
+    @property
+    def threaded(self) -> Optional[bool]:
+        # Run (sync) scenario in the thread pool of the plugin, None follows the plugin config
+        return self._threaded
@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from vedro.core import MultiScenarioDiscoverer, ScenarioFinder
+from vedro.core import ScenarioLoader as BaseScenarioLoader
+from vedro.core import ScenarioOrderer, VirtualScenario
+from vedro.core.scenario_discoverer import create_vscenario
+
+from ._scenario_loader import ScenarioLoader
+
+__all__ = ("ScenarioDiscoverer", "ModuleSelectorType",)
+
+# (scenarios of imported modules, unique IDs of scenarios of not yet imported modules by path)
+# -> paths of the modules to import
+ModuleSelectorType = Callable[[List[VirtualScenario], Dict[Path, List[str]]], Set[Path]]
+
+
+class ScenarioDiscoverer(MultiScenarioDiscoverer):
+    def __init__(self, finder: ScenarioFinder, loader: BaseScenarioLoader,
+                 orderer: ScenarioOrderer, *, workers: int = 4,
+                 module_selector: Optional[ModuleSelectorType] = None) -> None:
+        super().__init__(finder, loader, orderer)
+        self._scenario_loader = loader
+        self._workers = workers
+        self._module_selector = module_selector
+
+    async def discover(self, root: Path, *,
+                       project_dir: Optional[Path] = None) -> List[VirtualScenario]:
+        if project_dir is None:
+            project_dir = root.parent
+
+        paths = []
+        async for path in self._finder.find(root):
+            paths.append(path.relative_to(project_dir) if path.is_absolute() else path)
+
+        # Modules whose scenarios are known from the static index are imported last,
+        # and only those chosen by the module selector
+        static: Dict[Path, List[str]] = {}
+        if (self._module_selector is not None) and isinstance(self._scenario_loader,
+                                                              ScenarioLoader):
+            for path in paths:
+                class_names = self._scenario_loader.get_class_names(path)
+                if class_names is not None:
+                    static[path] = [f"{path}::{name}" for name in class_names]
+
+        loaded = await self._load([path for path in paths if path not in static],
+                                  project_dir=project_dir)
+        if static:
+            assert self._module_selector is not None  # for type checker
+            selected = self._module_selector(
+                [scn for scenarios in loaded.values() for scn in scenarios], static
+            )
+            loaded.update(await self._load([path for path in paths if path in selected],
+                                           project_dir=project_dir))
+
+        scenarios = [scn for path in paths for scn in loaded.get(path, [])]
+        ordered = await self._orderer.sort(scenarios)
+        if len(scenarios) != len(ordered):
+            raise ValueError(
+                f"The scenario orderer returned {len(ordered)} scenario(s), "
+                f"but {len(scenarios)} scenario(s) were discovered"
+            )
+        return ordered
+
+    async def _load(self, paths: List[Path], *,
+                    project_dir: Path) -> Dict[Path, List[VirtualScenario]]:
+        if isinstance(self._scenario_loader, ScenarioLoader) and (self._workers > 0):
+            await self._scenario_loader.prefetch(paths, workers=self._workers)
+
+        loaded = {}
+        for path in paths:
+            loaded[path] = [create_vscenario(scn, project_dir=project_dir)
+                            for scn in await self._scenario_loader.load(path)]
+        return loaded
@@ -0,0 +1,214 @@
+import ast
+from pathlib import Path
+from typing import Any, List, Optional, Set, Tuple, Union
+
+__all__ = ("ScenarioIndexer", "ModuleIndex", "IndexedScenario",)
+
+
+class IndexedScenario:
+    def __init__(self, name: str, lineno: int, *,
+                 is_async: bool = False,
+                 decorators: Tuple[str, ...] = (),
+                 params: Union[int, None] = 0) -> None:
+        self._name = name
+        self._lineno = lineno
+        self._is_async = is_async
+        self._decorators = decorators
+        # 0 – not parameterized, None – parameterized with unknown number of rows
+        self._params = params
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def subject(self) -> str:
+        return self._name.replace("_", " ")
+
+    @property
+    def lineno(self) -> int:
+        return self._lineno
+
+    @property
+    def is_async(self) -> bool:
+        return self._is_async
+
+    @property
+    def decorators(self) -> Tuple[str, ...]:
+        return self._decorators
+
+    @property
+    def params(self) -> Union[int, None]:
+        return self._params
+
+    @property
+    def class_names(self) -> Tuple[str, ...]:
+        # Names of the classes generated by the ScenarioLoader
+        if self._params == 0:
+            return (f"Scenario_{self._name}",)
+        if self._params is None:
+            return ()
+        return tuple(f"Scenario_{self._name}_{idx}_VedroScenario"
+                     for idx in range(1, self._params + 1))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._name!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, self.__class__) and (self.__dict__ == other.__dict__)
+
+
+class ModuleIndex:
+    def __init__(self, path: Path, scenarios: List[IndexedScenario], *,
+                 is_complete: bool = True) -> None:
+        self._path = path
+        self._scenarios = scenarios
+        # False if the module uses `scenario` in a way that can't be resolved statically
+        self._is_complete = is_complete
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def scenarios(self) -> List[IndexedScenario]:
+        return self._scenarios
+
+    @property
+    def is_complete(self) -> bool:
+        return self._is_complete
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {str(self._path)!r} scenarios={len(self._scenarios)}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, self.__class__) and (self.__dict__ == other.__dict__)
+
+
+class ScenarioIndexer:
+    # Methods of `scenario` returning a decorator
+    _METHODS = ("matrix", "concurrently", "threaded",)
+
+    def __init__(self, *, package: str = "vedro_fn", decorator: str = "scenario") -> None:
+        self._package = package
+        self._decorator = decorator
+
+    def index(self, path: Path) -> ModuleIndex:
+        return self.index_source(path.read_bytes(), path)
+
+    def index_source(self, source: Union[str, bytes], path: Path) -> ModuleIndex:
+        try:
+            tree = ast.parse(source, filename=str(path))
+        except (SyntaxError, ValueError):
+            # The module must be imported to report the error
+            return ModuleIndex(path, [], is_complete=False)
+
+        fn_aliases, pkg_aliases = self._find_aliases(tree)
+
+        scenarios = []
+        resolved = 0
+        for node in tree.body:
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for decorator in node.decorator_list:
+                parsed = self._parse_decorator(decorator, fn_aliases, pkg_aliases)
+                if parsed is None:
+                    continue
+                resolved += 1
+                if node.name.startswith("_"):
+                    continue
+                decorators, params = parsed
+                scenarios.append(IndexedScenario(
+                    node.name, node.lineno,
+                    is_async=isinstance(node, ast.AsyncFunctionDef),
+                    decorators=decorators,
+                    params=params,
+                ))
+
+        references = self._count_references(tree, fn_aliases, pkg_aliases)
+        return ModuleIndex(path, scenarios, is_complete=(references == resolved))
+
+    def _find_aliases(self, tree: ast.Module) -> Tuple[Set[str], Set[str]]:
+        # `scenario` is always considered, so re-exports from helper modules are not missed
+        fn_aliases = {self._decorator}
+        pkg_aliases = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and (node.module == self._package):
+                for alias in node.names:
+                    if alias.name == self._decorator:
+                        fn_aliases.add(alias.asname or alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name == self._package:
+                        pkg_aliases.add(alias.asname or alias.name)
+        return fn_aliases, pkg_aliases
+
+    def _is_scenario_ref(self, node: ast.AST, fn_aliases: Set[str], pkg_aliases: Set[str]) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in fn_aliases
+        if isinstance(node, ast.Attribute) and (node.attr == self._decorator):
+            return isinstance(node.value, ast.Name) and (node.value.id in pkg_aliases)
+        return False
+
+    def _count_references(self, tree: ast.Module,
+                          fn_aliases: Set[str], pkg_aliases: Set[str]) -> int:
+        count = 0
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Name, ast.Attribute)) and isinstance(node.ctx, ast.Load):
+                if self._is_scenario_ref(node, fn_aliases, pkg_aliases):
+                    count += 1
+        return count
+
+    def _parse_decorator(self, node: ast.expr, fn_aliases: Set[str], pkg_aliases: Set[str]
+                         ) -> Optional[Tuple[Tuple[str, ...], Union[int, None]]]:
+        # @scenario, @scenario(), @scenario([...]), @scenario[...], @scenario[...](...),
+        # @scenario.matrix(...), @scenario.concurrently(limit=N)([...]), @scenario.threaded()
+        if self._is_scenario_ref(node, fn_aliases, pkg_aliases):
+            return (), 0
+
+        if isinstance(node, ast.Subscript):
+            parsed = self._parse_decorator(node.value, fn_aliases, pkg_aliases)
+            if parsed is None:
+                return None
+            # Params are reset by `scenario[...]`
+            return self._parse_decorator_names(node.slice), 0
+
+        if not isinstance(node, ast.Call):
+            return None
+
+        if isinstance(node.func, ast.Attribute) and (node.func.attr in self._METHODS):
+            parsed = self._parse_decorator(node.func.value, fn_aliases, pkg_aliases)
+            if parsed is None:
+                return None
+            decorators, params = parsed
+            # Matrix rows are generated lazily, their number is unknown
+            return decorators, (None if node.func.attr == "matrix" else params)
+
+        parsed = self._parse_decorator(node.func, fn_aliases, pkg_aliases)
+        if parsed is None:
+            return None
+        decorators, params = parsed
+        return decorators, (self._count_params(node.args) if node.args else params)
+
+    def _parse_decorator_names(self, node: ast.expr) -> Tuple[str, ...]:
+        items = node.elts if isinstance(node, ast.Tuple) else [node]
+        return tuple(name for name in (self._get_name(item) for item in items) if name)
+
+    def _get_name(self, node: ast.AST) -> Union[str, None]:
+        if isinstance(node, ast.Call):
+            return self._get_name(node.func)
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        return None
+
+    def _count_params(self, args: List[ast.expr]) -> Union[int, None]:
+        if len(args) == 0:
+            return 0
+        params = args[0]
+        if not isinstance(params, (ast.List, ast.Tuple)):
+            return None
+        if any(isinstance(elt, ast.Starred) for elt in params.elts):
+            return None
+        return len(params.elts)
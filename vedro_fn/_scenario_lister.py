@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import List, Union
+
+from vedro.core import ScenarioFinder
+from vedro.core import ScenarioLoader as BaseScenarioLoader
+
+from ._scenario_index import ScenarioIndexer
+
+__all__ = ("ScenarioLister",)
+
+
+class ScenarioLister:
+    def __init__(self, finder: ScenarioFinder, loader: BaseScenarioLoader, root: Path, *,
+                 project_dir: Path, indexer: Union[ScenarioIndexer, None] = None) -> None:
+        self._finder = finder
+        self._loader = loader
+        self._root = root
+        self._project_dir = project_dir
+        self._indexer = indexer or ScenarioIndexer()
+
+    async def list(self) -> List[str]:
+        # Only modules that can't be indexed statically are imported
+        lines: List[str] = []
+        async for path in self._finder.find(self._root):
+            if path.is_absolute():
+                path = path.relative_to(self._project_dir)
+
+            index = self._indexer.index(path)
+            if index.is_complete:
+                subjects = [scn.subject for scn in index.scenarios]
+            else:
+                loaded = await self._loader.load(path)
+                # Param rows share the subject of their scenario
+                subjects = list(dict.fromkeys(scn.subject for scn in loaded))
+            lines.extend(f"{path}::{subject}" for subject in subjects)
+        return lines
@@ -1,37 +1,198 @@
 import os
-from asyncio import iscoroutinefunction
+from asyncio import gather, get_running_loop, iscoroutinefunction
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from importlib.abc import SourceLoader
+from importlib.util import spec_from_file_location
+from inspect import signature
 from pathlib import Path
+from time import perf_counter
 from types import ModuleType
-from typing import Any, List, Type, cast
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, Type, cast
 
 from vedro import Scenario
 from vedro.core import ModuleLoader
 from vedro.core import ScenarioLoader as BaseScenarioLoader
 
+from ._import_graph import ImportGraph
+from ._import_profiler import ImportProfiler
+from ._memory_tracker import check_memory_budget
+from ._params_row import ParamsRow, iter_params_rows
+from ._profiler import profile_body
+from ._scenario_batch import RowBatch, RowCallType, SyncCallType, ThreadBatch
 from ._scenario_descriptor import ScenarioDescriptor
+from ._scenario_index import IndexedScenario, ModuleIndex, ScenarioIndexer
+from ._shared import FamilyType, reset_scenario_family, set_scenario_family
 
-__all__ = ("ScenarioLoader",)
+__all__ = ("ScenarioLoader", "ScenarioFilterType",)
+
+ScenarioFilterType = Callable[[IndexedScenario], bool]
+
+ResolvedType = Tuple[Tuple[Any, ...], Dict[str, Any]]
 
 
 class ScenarioLoader(BaseScenarioLoader):
-    def __init__(self, module_loader: ModuleLoader) -> None:
+    def __init__(self, module_loader: ModuleLoader, *,
+                 scenario_filter: Optional[ScenarioFilterType] = None,
+                 indexer: Optional[ScenarioIndexer] = None,
+                 import_graph: Optional[ImportGraph] = None,
+                 thread_pool_size: Optional[int] = None,
+                 threaded: bool = False,
+                 import_profiler: Optional[ImportProfiler] = None) -> None:
         self._module_loader = module_loader
+        self._scenario_filter = scenario_filter
+        self._indexer = indexer
+        self._import_graph = import_graph
+        # Sync scenarios marked with `scenario.threaded()` (or all, if `threaded`) run in
+        # a pool of `thread_pool_size` threads, and as usual without it. The batch is created
+        # for the first threaded scenario
+        self._thread_pool_size = thread_pool_size
+        self._thread_batch: Optional[ThreadBatch] = None
+        self._threaded = threaded
+        self._import_profiler = import_profiler
+        self._load_times: Dict[Path, float] = {}
+
+    @property
+    def load_times(self) -> Dict[Path, float]:
+        # seconds
+        return self._load_times
 
     async def load(self, path: Path) -> List[Type[Scenario]]:
-        module = await self._module_loader.load(path)
-        return self._collect_scenarios(module)
+        if not self._is_module_selected(path):
+            return []
+        started_at = perf_counter()
+        with self._measure_import(path), self._record_files(path):
+            if self._import_graph is None:
+                module = await self._module_loader.load(path)
+            else:
+                with self._import_graph.record():
+                    module = await self._module_loader.load(path)
+                self._import_graph.add_root(path, module.__name__)
+        with self._measure_build(path), self._record_files(path):
+            scenarios = self._collect_scenarios(module)
+        self._load_times[path] = perf_counter() - started_at
+        return scenarios
+
+    def _record_files(self, path: Path) -> ContextManager[None]:
+        # Data files read by params sources are dependencies of the scenario file
+        if self._import_graph is None:
+            return nullcontext()
+        return self._import_graph.record_files(path)
+
+    def _measure_import(self, path: Path) -> ContextManager[None]:
+        if self._import_profiler is None:
+            return nullcontext()
+        return self._import_profiler.measure_import(path)
+
+    def _measure_build(self, path: Path) -> ContextManager[None]:
+        if self._import_profiler is None:
+            return nullcontext()
+        return self._import_profiler.measure_build(path)
+
+    async def prefetch(self, paths: List[Path], *, workers: int) -> None:
+        # Reading sources and writing bytecode caches overlap in threads,
+        # executing modules (`load`) stays serial
+        loop = get_running_loop()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vedro_fn") as executor:
+            await gather(*[loop.run_in_executor(executor, self._prefetch_module, path)
+                           for path in paths])
+
+    def _prefetch_module(self, path: Path) -> None:
+        spec = spec_from_file_location(path.stem, path)
+        if (spec is None) or not isinstance(spec.loader, SourceLoader):
+            return
+        try:
+            spec.loader.get_code(spec.name)
+        except (OSError, SyntaxError, ValueError):
+            # Reported by `load`
+            pass
+
+    def index(self, path: Path) -> ModuleIndex:
+        if self._indexer is None:
+            self._indexer = ScenarioIndexer()
+        return self._indexer.index(path)
+
+    def get_class_names(self, path: Path) -> Optional[List[str]]:
+        # Names of the scenario classes `load` would build, None if they can't be told
+        # without importing the module
+        index = self.index(path)
+        if not index.is_complete:
+            return None
+
+        class_names: List[str] = []
+        for scenario in index.scenarios:
+            if (self._scenario_filter is not None) and (not self._scenario_filter(scenario)):
+                continue
+            if scenario.params != 0:
+                # Rows are identified by their values
+                return None
+            class_names.extend(scenario.class_names)
+        return class_names
+
+    def _is_module_selected(self, path: Path) -> bool:
+        # Without a filter every module is imported anyway
+        if self._scenario_filter is None:
+            return True
+
+        index = self.index(path)
+        if not index.is_complete:
+            return True
+
+        return any(self._scenario_filter(scn) for scn in index.scenarios)
 
     def _collect_scenarios(self, module: ModuleType) -> List[Type[Scenario]]:
         loaded = []
         for name, val in module.__dict__.items():
             if not name.startswith("_") and isinstance(val, ScenarioDescriptor):
+                if not self._is_descriptor_selected(val):
+                    continue
                 scenarios = self._build_vedro_scenarios(val, module)
+                self._check_batched_scenarios(scenarios, val, module)
                 loaded.extend(scenarios)
         return loaded
 
+    def _check_batched_scenarios(self, scenarios: List[Type[Scenario]],
+                                 descriptor: ScenarioDescriptor, module: ModuleType) -> None:
+        # Profiles and memory peaks (tracemalloc is process-wide) of scenarios running
+        # together can't be told apart
+        for scenario_cls in scenarios:
+            if getattr(scenario_cls, "__vedro_fn_batch__", None) is None:
+                continue
+            template = getattr(scenario_cls, "__vedro__template__", None)
+            for cls in (scenario_cls, template):
+                if getattr(cls, "__vedro_fn_profile__", False):
+                    decorator = "@profile"
+                elif getattr(cls, "__vedro_fn_memory_budget__", None) is not None:
+                    decorator = "@memory_budget"
+                else:
+                    continue
+                name = self._create_scenario_name(descriptor)
+                raise TypeError(f"{decorator} can't be used with scenarios running concurrently "
+                                f"or in threads <{module.__name__}.{name}>")
+
+    def _is_descriptor_selected(self, descriptor: ScenarioDescriptor) -> bool:
+        if self._scenario_filter is None:
+            return True
+        return self._scenario_filter(self._index_descriptor(descriptor))
+
+    def _index_descriptor(self, descriptor: ScenarioDescriptor) -> IndexedScenario:
+        if descriptor.is_lazy:
+            params = None
+        else:
+            params = len(cast(Tuple[Any, ...], descriptor.params))
+        return IndexedScenario(
+            descriptor.name, descriptor.fn.__code__.co_firstlineno,
+            is_async=iscoroutinefunction(descriptor.fn),
+            decorators=tuple(getattr(d, "__name__", "") for d in descriptor.decorators),
+            params=params,
+        )
+
     def _build_vedro_scenarios(self, descriptor: ScenarioDescriptor,
                                module: ModuleType) -> List[Type[Scenario]]:
-        if len(descriptor.params) == 0:
+        if descriptor.is_lazy:
+            return self._build_vedro_scenarios_lazily(descriptor, module)
+
+        if len(cast(Tuple[Any, ...], descriptor.params)) == 0:
             scenario_cls = self._build_vedro_scenario(descriptor, module)
             return [scenario_cls]
 
@@ -49,12 +210,18 @@ class ScenarioLoader(BaseScenarioLoader):
 
     def _build_vedro_scenario(self, descriptor: ScenarioDescriptor,
                               module: ModuleType) -> Type[Scenario]:
-        scenario_cls = type(self._create_scenario_name(descriptor), (Scenario,), {
+        family = self._create_family(descriptor, module)
+        namespace = {
             "__module__": module.__name__,
             "__file__": self._create_module_path(module),
             "subject": self._create_subject(descriptor),
-            "do": self._make_do(descriptor.fn),
-        })
+            "do": self._make_do(descriptor.fn, family),
+        }
+        if self._is_threaded(descriptor):
+            call = self._make_sync_call(descriptor.fn, family, self._resolve_no_args)
+            namespace.update(self._create_thread_namespace(call))
+
+        scenario_cls = type(self._create_scenario_name(descriptor), (Scenario,), namespace)
 
         for decorator in descriptor.decorators:
             scenario_cls = decorator(scenario_cls)
@@ -69,47 +236,229 @@ class ScenarioLoader(BaseScenarioLoader):
         for params in descriptor.params:
             __init__ = params(__init__)
 
-        scenario_cls = type(self._create_scenario_name(descriptor), (Scenario,), {
+        family = self._create_family(descriptor, module)
+        namespace = {
             "__module__": module.__name__,
             "__file__": self._create_module_path(module),
             "__init__": __init__,
             "subject": self._create_subject(descriptor),
-            "do": self._make_do_with_params(descriptor.fn),
-        })
+            "do": self._make_do_with_params(descriptor.fn, family),
+        }
+        if descriptor.concurrency is not None:
+            call = self._make_row_call(descriptor.fn, family, self._resolve_template_args)
+            namespace.update(self._create_batch_namespace(call, descriptor.concurrency))
+        elif self._is_threaded(descriptor):
+            sync_call = self._make_sync_call(descriptor.fn, family, self._resolve_template_args)
+            namespace.update(self._create_thread_namespace(sync_call))
+
+        scenario_cls = type(self._create_scenario_name(descriptor), (Scenario,), namespace)
 
         for decorator in descriptor.decorators:
             scenario_cls = decorator(scenario_cls)
         return scenario_cls
 
+    def _build_vedro_scenarios_lazily(self, descriptor: ScenarioDescriptor,
+                                      module: ModuleType) -> List[Type[Scenario]]:
+        # Unlike `_build_vedro_scenario_with_params`, rows are not materialized up front
+        # and generated classes are not stored in the module globals
+        template = type("VedroTemplate", (Scenario,), {
+            "__module__": module.__name__,
+            "__file__": self._create_module_path(module),
+            "subject": self._create_subject(descriptor),
+        })
+        for decorator in descriptor.decorators:
+            template = decorator(template)
+
+        fn_signature = signature(descriptor.fn)
+        scenario_name = self._create_scenario_name(descriptor)
+        family = self._create_family(descriptor, module)
+        namespace = {
+            "__module__": module.__name__,
+            "__file__": self._create_module_path(module),
+            "subject": self._create_subject(descriptor),
+            "do": self._make_do_with_row(descriptor.fn, family),
+            "__vedro__template_name__": scenario_name,
+            "__vedro__template__": template,
+        }
+        if descriptor.concurrency is not None:
+            call = self._make_row_call(descriptor.fn, family, self._resolve_row)
+            namespace.update(self._create_batch_namespace(call, descriptor.concurrency))
+        elif self._is_threaded(descriptor):
+            sync_call = self._make_sync_call(descriptor.fn, family, self._resolve_row)
+            namespace.update(self._create_thread_namespace(sync_call))
+
+        scenarios = []
+        for idx, row in enumerate(iter_params_rows(descriptor.params), start=1):
+            if row.is_deferred:
+                # Decoded (and bound) only when the scenario runs
+                bound_args = None
+            else:
+                try:
+                    bound_args = fn_signature.bind(*row.args, **row.kwargs)
+                except TypeError as e:
+                    raise TypeError(f"{e} <{module.__name__}.{scenario_name}>") from None
+                bound_args.apply_defaults()
+
+            cls_name = f"{scenario_name}_{idx}_VedroScenario"
+            scenario_cls = type(cls_name, (Scenario,), {
+                **namespace,
+                "__qualname__": cls_name,
+                "__vedro__template_index__": idx,
+                "__vedro__template_args__": bound_args,
+                "__vedro_fn_row__": row,
+            })
+            for decorator in row.decorators:
+                scenario_cls = decorator(scenario_cls)
+            scenarios.append(scenario_cls)
+
+        for scenario_cls in scenarios:
+            setattr(scenario_cls, "__vedro__template_total__", len(scenarios))
+        return scenarios
+
     def _create_scenario_name(self, descriptor: ScenarioDescriptor) -> str:
         return f"Scenario_{descriptor.name}"
 
     def _create_subject(self, descriptor: ScenarioDescriptor) -> str:
         return descriptor.name.replace("_", " ")
 
+    def _create_family(self, descriptor: ScenarioDescriptor, module: ModuleType) -> FamilyType:
+        return (module.__name__, descriptor.name)
+
     def _create_module_path(self, module: ModuleType) -> str:
         return os.path.abspath(str(module.__file__))
 
-    def _make_do(self, fn: Any) -> Any:
+    def _make_do(self, fn: Any, family: FamilyType) -> Any:
         if iscoroutinefunction(fn):
             async def do(self) -> None:  # type: ignore
-                await fn()
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        await fn()
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
 
             return do
         else:
             def do(self) -> None:  # type: ignore
-                fn()
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        fn()
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
 
             return do
 
-    def _make_do_with_params(self, fn: Any) -> Any:
+    def _make_do_with_params(self, fn: Any, family: FamilyType) -> Any:
         if iscoroutinefunction(fn):
             async def do(self) -> None:  # type: ignore
-                await fn(*self.__args, **self.__kwargs)
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        await fn(*self.__args, **self.__kwargs)
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
 
             return do
         else:
             def do(self) -> None:  # type: ignore
-                fn(*self.__args, **self.__kwargs)
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        fn(*self.__args, **self.__kwargs)
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
 
             return do
+
+    def _make_do_with_row(self, fn: Any, family: FamilyType) -> Any:
+        if iscoroutinefunction(fn):
+            async def do(self) -> None:  # type: ignore
+                args, kwargs = self.__vedro_fn_row__.resolve()
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        await fn(*args, **kwargs)
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
+
+            return do
+        else:
+            def do(self) -> None:  # type: ignore
+                args, kwargs = self.__vedro_fn_row__.resolve()
+                token = set_scenario_family(family)
+                try:
+                    with profile_body():
+                        fn(*args, **kwargs)
+                    check_memory_budget()
+                finally:
+                    reset_scenario_family(token)
+
+            return do
+
+    def _create_batch_namespace(self, call: RowCallType, limit: int) -> Dict[str, Any]:
+        batch = RowBatch(call, limit=limit)
+
+        async def do(self) -> None:  # type: ignore
+            await batch.run(type(self))
+
+        return {"do": do, "__vedro_fn_batch__": batch}
+
+    def _make_row_call(self, fn: Any, family: FamilyType,
+                       resolve: Callable[[Type[Scenario]], ResolvedType]) -> RowCallType:
+        async def call(scenario_cls: Type[Scenario]) -> None:
+            args, kwargs = resolve(scenario_cls)
+            token = set_scenario_family(family)
+            try:
+                await fn(*args, **kwargs)
+                check_memory_budget()
+            finally:
+                reset_scenario_family(token)
+
+        return call
+
+    def _is_threaded(self, descriptor: ScenarioDescriptor) -> bool:
+        if (self._thread_pool_size is None) or iscoroutinefunction(descriptor.fn):
+            return False
+        return self._threaded if (descriptor.threaded is None) else descriptor.threaded
+
+    def _create_thread_namespace(self, call: SyncCallType) -> Dict[str, Any]:
+        if self._thread_batch is None:
+            assert self._thread_pool_size is not None  # for type checker
+            self._thread_batch = ThreadBatch(limit=self._thread_pool_size)
+        batch = self._thread_batch
+
+        async def do(self) -> None:  # type: ignore
+            await batch.run(type(self))
+
+        return {"do": do, "__vedro_fn_batch__": batch, "__vedro_fn_call__": call}
+
+    def _make_sync_call(self, fn: Any, family: FamilyType,
+                        resolve: Callable[[Type[Scenario]], ResolvedType]) -> SyncCallType:
+        def call(scenario_cls: Type[Scenario]) -> None:
+            args, kwargs = resolve(scenario_cls)
+            token = set_scenario_family(family)
+            try:
+                fn(*args, **kwargs)
+                check_memory_budget()
+            finally:
+                reset_scenario_family(token)
+
+        return call
+
+    def _resolve_no_args(self, scenario_cls: Type[Scenario]) -> ResolvedType:
+        return (), {}
+
+    def _resolve_template_args(self, scenario_cls: Type[Scenario]) -> ResolvedType:
+        # Bound to `__init__(self, *args, **kwargs)` of `_build_vedro_scenario_with_params`
+        arguments = getattr(scenario_cls, "__vedro__template_args__").arguments
+        return tuple(arguments.get("args", ())), dict(arguments.get("kwargs", {}))
+
+    def _resolve_row(self, scenario_cls: Type[Scenario]) -> ResolvedType:
+        row: ParamsRow = getattr(scenario_cls, "__vedro_fn_row__")
+        return row.resolve()
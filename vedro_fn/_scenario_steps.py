@@ -1,15 +1,58 @@
+from contextvars import ContextVar
+from time import perf_counter_ns
 from types import TracebackType
-from typing import Optional, Type, Union
+from typing import Optional, Tuple, Type, Union
+
+from ._memory_tracker import get_memory_tracker
+from ._profiler import get_step_profiler
+from ._step_group import StepGroup
+from ._step_timings import StepTiming, get_step_recorder
 
 __all__ = ("given", "when", "then", "Given", "When", "Then", "Step",)
 
 
+# (step, name, started_at)
+_StepFrame = Tuple["Step", Union[str, None], Union[int, None]]
+
+# Step objects are module-level singletons, so their state is kept per context (task/thread).
+# Immutable tuples are used, so tasks inheriting a context never share the same stack
+_pending_name: ContextVar[Union[Tuple["Step", str], None]] = ContextVar(
+    "vedro_fn_pending_step_name", default=None)
+_step_stack: ContextVar[Tuple[_StepFrame, ...]] = ContextVar(
+    "vedro_fn_step_stack", default=())
+
+
 class Step:
-    def __init__(self) -> None:
-        self._name: Union[str, None] = None
+    @property
+    def _name(self) -> Union[str, None]:
+        stack = _step_stack.get()
+        if stack and (stack[-1][0] is self):
+            return stack[-1][1]
+
+        pending = _pending_name.get()
+        if (pending is not None) and (pending[0] is self):
+            return pending[1]
+        return None
 
     def __enter__(self) -> None:
-        pass
+        name = None
+        pending = _pending_name.get()
+        if pending is not None:
+            _pending_name.set(None)
+            if pending[0] is self:
+                name = pending[1]
+
+        started_at = perf_counter_ns() if (get_step_recorder() is not None) else None
+        _step_stack.set(_step_stack.get() + ((self, name, started_at),))
+
+        profiler, tracker = get_step_profiler(), get_memory_tracker()
+        if (profiler is not None) or (tracker is not None):
+            kind = self.__class__.__name__.lower()
+            label = kind if (name is None) else f"{kind} {name}"
+            if profiler is not None:
+                profiler.enter_step(label)
+            if tracker is not None:
+                tracker.enter_step(label)
 
     async def __aenter__(self) -> None:
         return self.__enter__()
@@ -18,7 +61,26 @@ class Step:
                  exc_type: Optional[Type[BaseException]],
                  exc_val: Optional[BaseException],
                  exc_tb: Optional[TracebackType]) -> bool:
-        self._name = None
+        stack = _step_stack.get()
+        if not stack:
+            return exc_type is None
+        _, name, started_at = stack[-1]
+        _step_stack.set(stack[:-1])
+
+        profiler, tracker = get_step_profiler(), get_memory_tracker()
+        if profiler is not None:
+            profiler.exit_step()
+        if tracker is not None:
+            tracker.exit_step()
+
+        if started_at is not None:
+            elapsed = perf_counter_ns() - started_at
+            recorder = get_step_recorder()
+            if recorder is not None:
+                recorder.record(StepTiming(self.__class__.__name__.lower(), name,
+                                           started_at, elapsed,
+                                           failed=(exc_type is not None)))
+
         return exc_type is None
 
     async def __aexit__(self,
@@ -28,9 +90,14 @@ class Step:
         return self.__exit__(exc_type, exc_val, exc_tb)
 
     def __call__(self, name: str) -> "Step":
-        self._name = name
+        _pending_name.set((self, name))
         return self
 
+    def concurrently(self, *, limit: Optional[int] = None) -> StepGroup:
+        # async with given.concurrently(limit=3) as group:
+        #     group.add(create_user())
+        return StepGroup(self, limit=limit)
+
 
 class Given(Step):
     pass
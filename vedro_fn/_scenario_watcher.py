@@ -0,0 +1,162 @@
+import ast
+import os
+import re
+import sys
+from asyncio import sleep
+from importlib.util import cache_from_source
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Set, Tuple, Type, Union
+
+from vedro import Scenario
+from vedro.core import ScenarioFinder
+from vedro.core import ScenarioLoader as BaseScenarioLoader
+from vedro.core import VirtualScenario
+from vedro.core.scenario_discoverer import create_vscenario
+
+from ._scenario_index import ScenarioIndexer
+
+__all__ = ("ScenarioWatcher", "ModuleFingerprint",)
+
+# (st_mtime_ns, st_size)
+_Signature = Tuple[int, int]
+
+_CLASS_NAME_PATTERN = re.compile(r"^Scenario_(?P<name>.+?)(_\d+_VedroScenario)?$")
+
+
+class ModuleFingerprint:
+    def __init__(self, scenarios: Dict[str, str], rest: Union[str, None]) -> None:
+        self._scenarios = scenarios
+        self._rest = rest
+
+    @property
+    def scenarios(self) -> Dict[str, str]:
+        # scenario function name -> AST dump (without line numbers)
+        return self._scenarios
+
+    @property
+    def rest(self) -> Union[str, None]:
+        # AST dump of everything else (imports, helpers, constants),
+        # None if the module can't be parsed or indexed completely
+        return self._rest
+
+    def changed_scenarios(self,
+                          previous: Union["ModuleFingerprint", None]) -> Union[Set[str], None]:
+        # None means every scenario of the module is affected
+        if (previous is None) or (self._rest is None) or (self._rest != previous.rest):
+            return None
+        return {name for name, dump in self._scenarios.items()
+                if previous.scenarios.get(name) != dump}
+
+
+class ScenarioWatcher:
+    def __init__(self, finder: ScenarioFinder, loader: BaseScenarioLoader, root: Path, *,
+                 project_dir: Path, interval: float = 0.5,
+                 indexer: Union[ScenarioIndexer, None] = None) -> None:
+        self._finder = finder
+        self._loader = loader
+        self._root = root
+        self._project_dir = project_dir
+        self._interval = interval
+        self._indexer = indexer or ScenarioIndexer()
+        self._signatures: Dict[Path, _Signature] = {}
+        self._fingerprints: Dict[Path, ModuleFingerprint] = {}
+
+    async def snapshot(self) -> None:
+        # Remember the current state of scenario files, modules are not loaded
+        for path in await self._find_paths():
+            signature = self._get_signature(path)
+            if signature is not None:
+                self._signatures[path] = signature
+                self._fingerprints[path] = self._fingerprint(path)
+
+    async def poll(self) -> List[VirtualScenario]:
+        paths = await self._find_paths()
+        for path in set(self._signatures) - set(paths):
+            del self._signatures[path]
+            self._fingerprints.pop(path, None)
+
+        scenarios = []
+        for path in paths:
+            signature = self._get_signature(path)
+            if (signature is None) or (self._signatures.get(path) == signature):
+                continue
+            self._signatures[path] = signature
+
+            fingerprint = self._fingerprint(path)
+            changed = fingerprint.changed_scenarios(self._fingerprints.get(path))
+            self._fingerprints[path] = fingerprint
+            if changed is not None and len(changed) == 0:
+                # e.g. comments or formatting
+                continue
+
+            try:
+                loaded = await self._reload(path)
+            except Exception as e:
+                # Keep watching, the next save will retry
+                print(f"vedro-fn watch: failed to load {path}: {type(e).__name__}: {e}",
+                      file=sys.stderr, flush=True)
+                continue
+
+            for scenario in loaded:
+                if (changed is None) or (self._get_descriptor_name(scenario) in changed):
+                    scenarios.append(self._create_vscenario(scenario))
+        return scenarios
+
+    async def watch(self) -> AsyncIterator[List[VirtualScenario]]:
+        while True:
+            await sleep(self._interval)
+            scenarios = await self.poll()
+            if scenarios:
+                yield scenarios
+
+    async def _find_paths(self) -> List[Path]:
+        paths = []
+        async for path in self._finder.find(self._root):
+            paths.append(path.relative_to(self._project_dir) if path.is_absolute() else path)
+        return paths
+
+    async def _reload(self, path: Path) -> List[Type[Scenario]]:
+        # Bytecode caches are validated by mtime in seconds and size,
+        # so an edit within the same second could load a stale module
+        try:
+            os.remove(cache_from_source(str(path)))
+        except (OSError, NotImplementedError):
+            pass
+        return list(await self._loader.load(path))
+
+    def _create_vscenario(self, scenario: Type[Scenario]) -> VirtualScenario:
+        vscenario = create_vscenario(scenario, project_dir=self._project_dir)
+        # The Skipper plugin marks scenarios only once, at startup
+        template = getattr(scenario, "__vedro__template__", None)
+        if getattr(template, "__vedro__skipped__", getattr(scenario, "__vedro__skipped__", False)):
+            vscenario.skip()
+        return vscenario
+
+    def _get_signature(self, path: Path) -> Union[_Signature, None]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _fingerprint(self, path: Path) -> ModuleFingerprint:
+        try:
+            source = path.read_bytes()
+            tree = ast.parse(source, filename=str(path))
+        except (OSError, SyntaxError, ValueError):
+            return ModuleFingerprint({}, None)
+
+        index = self._indexer.index_source(source, path)
+        names = {scn.name for scn in index.scenarios}
+
+        scenarios, rest = {}, []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and (node.name in names):
+                scenarios[node.name] = ast.dump(node)
+            else:
+                rest.append(ast.dump(node))
+        return ModuleFingerprint(scenarios, "\n".join(rest) if index.is_complete else None)
+
+    def _get_descriptor_name(self, scenario: Type[Scenario]) -> Union[str, None]:
+        match = _CLASS_NAME_PATTERN.match(scenario.__name__)
+        return match.group("name") if match else None
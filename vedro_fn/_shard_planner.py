@@ -0,0 +1,44 @@
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Mapping
+
+__all__ = ("ShardPlanner",)
+
+
+class ShardPlanner:
+    def __init__(self, total: int) -> None:
+        if total < 1:
+            raise ValueError(f"Number of shards must be greater than 0, {total} given")
+        self._total = total
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def plan(self, unique_ids: Iterable[str],
+             durations: Mapping[str, float]) -> Dict[str, int]:
+        # Every shard computes the same plan, so the result must not depend on the input order
+        unique_ids = sorted(set(unique_ids))
+        known = [uid for uid in unique_ids if uid in durations]
+        unseen = [uid for uid in unique_ids if uid not in durations]
+
+        plan: Dict[str, int] = {}
+        loads: List[float] = [0.0] * self._total
+
+        # Unseen scenarios (e.g. new param rows) are pinned by hash and weighted by
+        # the average known duration
+        estimate = (sum(durations[uid] for uid in known) / len(known)) if known else 0.0
+        for uid in unseen:
+            shard = self._hash(uid) % self._total
+            plan[uid] = shard
+            loads[shard] += estimate
+
+        # Greedy bin packing: the longest scenario goes to the least loaded shard
+        for uid in sorted(known, key=lambda x: (-durations[x], x)):
+            shard = min(range(self._total), key=lambda x: (loads[x], x))
+            plan[uid] = shard
+            loads[shard] += durations[uid]
+
+        return plan
+
+    def _hash(self, unique_id: str) -> int:
+        return int(blake2b(unique_id.encode(), digest_size=8).hexdigest(), 16)
@@ -0,0 +1,232 @@
+from asyncio import CancelledError, Future, get_running_loop, iscoroutinefunction, shield
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from functools import update_wrapper
+from threading import Lock, RLock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+from weakref import WeakSet
+
+from ._row_ids import UnstableReprError, stable_repr
+
+__all__ = ("shared", "SharedFunction", "ScopeType", "FamilyType", "clear_shared",
+           "get_scenario_family", "set_scenario_family", "reset_scenario_family",)
+
+T = TypeVar("T")
+
+ScopeType = Literal["family", "module", "session"]
+
+# (module name, scenario function name) of the running scenario, shared by all its param rows
+FamilyType = Tuple[str, str]
+
+_scenario_family: ContextVar[Union[FamilyType, None]] = ContextVar("vedro_fn_scenario_family",
+                                                                   default=None)
+
+
+def get_scenario_family() -> Union[FamilyType, None]:
+    return _scenario_family.get()
+
+
+def set_scenario_family(family: FamilyType) -> Token[Union[FamilyType, None]]:
+    return _scenario_family.set(family)
+
+
+def reset_scenario_family(token: Token[Union[FamilyType, None]]) -> None:
+    _scenario_family.reset(token)
+
+
+class SharedFunction(Generic[T]):
+    def __init__(self, fn: Callable[..., T], *, scope: ScopeType = "family",
+                 maxsize: Optional[int] = 1) -> None:
+        if scope not in ("family", "module", "session"):
+            raise ValueError(f"Unknown scope '{scope}', expected 'family', 'module' or 'session'")
+        if (maxsize is not None) and (maxsize < 1):
+            raise ValueError(f"maxsize must be greater than 0 or None, {maxsize} given")
+
+        self._fn = fn
+        self._scope = scope
+        self._maxsize = maxsize
+        # scope key -> call key -> result, least recently used scope first
+        self._cache: "OrderedDict[Hashable, Dict[Hashable, Any]]" = OrderedDict()
+        # Calls in progress, (scope key, call key) -> lock (sync) or future (async),
+        # so concurrent rows and threads wait for the result instead of computing it again
+        self._call_locks: Dict[Hashable, RLock] = {}
+        self._in_flight: Dict[Hashable, "Future[Any]"] = {}
+        self._lock = Lock()
+        update_wrapper(self, fn)
+        _shared_functions.add(self)
+
+    @property
+    def scope(self) -> ScopeType:
+        return self._scope
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        scope_key = self._get_scope_key()
+        call_key = self._create_call_key(args, kwargs)
+
+        if iscoroutinefunction(self._fn):
+            return cast(T, self._call_async(scope_key, call_key, args, kwargs))
+
+        found, result = self._get_result(scope_key, call_key)
+        if found:
+            return cast(T, result)
+
+        with self._lock:
+            lock = self._call_locks.setdefault((scope_key, call_key), RLock())
+        try:
+            with lock:
+                found, result = self._get_result(scope_key, call_key)
+                if not found:
+                    # If the call fails, the next waiting thread calls the function itself
+                    result = self._fn(*args, **kwargs)
+                    self._set_result(scope_key, call_key, result)
+        finally:
+            with self._lock:
+                self._call_locks.pop((scope_key, call_key), None)
+        return cast(T, result)
+
+    async def _call_async(self, scope_key: Hashable, call_key: Hashable,
+                          args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        while True:
+            found, result = self._get_result(scope_key, call_key)
+            if found:
+                return result
+
+            in_flight = self._in_flight.get((scope_key, call_key))
+            if in_flight is None:
+                break
+            try:
+                # Cancelling a waiting row doesn't cancel the call it waits for
+                return await shield(in_flight)
+            except CancelledError:
+                # The call was cancelled with the row that made it, the next row calls again
+                if not in_flight.cancelled():
+                    raise
+
+        future: "Future[Any]" = get_running_loop().create_future()
+        self._in_flight[(scope_key, call_key)] = future
+        try:
+            result = await cast(Callable[..., Any], self._fn)(*args, **kwargs)
+        except CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved, so rows that didn't wait for it don't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            # The scope could have been evicted while awaiting
+            self._set_result(scope_key, call_key, result)
+            return result
+        finally:
+            del self._in_flight[(scope_key, call_key)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _create_call_key(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+        call_key = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(call_key)
+            return call_key
+        except TypeError:
+            pass
+
+        # Unhashable arguments (e.g. dicts, lists) are matched by their representation
+        arguments = [(f"argument {idx}", arg) for idx, arg in enumerate(args, start=1)]
+        arguments += [(f"argument '{name}'", arg) for name, arg in kwargs.items()]
+        for label, arg in arguments:
+            try:
+                hash(arg)
+            except TypeError:
+                try:
+                    stable_repr(arg)
+                except UnstableReprError:
+                    raise TypeError(f"Can't cache {self._fn.__qualname__}(): {label} "
+                                    f"is unhashable and has no stable repr ({arg!r})") from None
+        return ("repr", stable_repr(call_key))
+
+    def _get_result(self, scope_key: Hashable, call_key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entries = self._get_entries(scope_key)
+            if call_key in entries:
+                return True, entries[call_key]
+            return False, None
+
+    def _set_result(self, scope_key: Hashable, call_key: Hashable, result: Any) -> None:
+        with self._lock:
+            self._get_entries(scope_key)[call_key] = result
+
+    def _get_scope_key(self) -> Hashable:
+        if self._scope == "session":
+            return None
+        family = get_scenario_family()
+        if self._scope == "module":
+            return family[0] if (family is not None) else None
+        return family
+
+    def _get_entries(self, scope_key: Hashable) -> Dict[Hashable, Any]:
+        if scope_key in self._cache:
+            self._cache.move_to_end(scope_key)
+            return self._cache[scope_key]
+
+        entries: Dict[Hashable, Any] = {}
+        self._cache[scope_key] = entries
+        if self._maxsize is not None:
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return entries
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._fn!r} scope={self._scope!r}>"
+
+
+_shared_functions: "WeakSet[SharedFunction[Any]]" = WeakSet()
+
+
+def clear_shared() -> None:
+    for shared_function in list(_shared_functions):
+        shared_function.clear()
+
+
+@overload
+def shared(fn: Callable[..., T], /) -> SharedFunction[T]:  # pragma: no cover
+    ...
+
+
+@overload
+def shared(*, scope: ScopeType = "family",
+           maxsize: Optional[int] = 1) -> Callable[[Callable[..., T]],
+                                                   SharedFunction[T]]:  # pragma: no cover
+    ...
+
+
+def shared(fn: Optional[Callable[..., T]] = None, /, *, scope: ScopeType = "family",
+           maxsize: Optional[int] = 1) -> Union[SharedFunction[T],
+                                                Callable[[Callable[..., T]], SharedFunction[T]]]:
+    if fn is not None:
+        return SharedFunction(fn, scope=scope, maxsize=maxsize)
+
+    def wrapper(fn: Callable[..., T]) -> SharedFunction[T]:
+        return SharedFunction(fn, scope=scope, maxsize=maxsize)
+
+    return wrapper
@@ -0,0 +1,316 @@
+import os
+import pickle
+import sys
+from asyncio import iscoroutinefunction
+from functools import update_wrapper
+from hashlib import blake2b
+from inspect import Signature, signature
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from types import CodeType, FunctionType, ModuleType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+from ._row_ids import UnstableReprError, stable_repr
+
+__all__ = ("snapshot", "SnapshotFunction", "SnapshotCache", "SnapshotStats",
+           "set_snapshot_cache", "get_snapshot_cache",)
+
+T = TypeVar("T")
+
+_SUFFIX = ".pickle"
+
+
+class SnapshotStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.evicted} evicted"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self}>"
+
+
+class SnapshotCache:
+    def __init__(self, directory: Path, *, max_size: int) -> None:
+        self._directory = directory
+        self._max_size = max_size
+        self._stats = SnapshotStats()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        # bytes
+        return self._max_size
+
+    @property
+    def stats(self) -> SnapshotStats:
+        return self._stats
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, _, size in self._list_entries())
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self._directory / f"{key}{_SUFFIX}"
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self._stats.misses += 1
+            return False, None
+        except Exception:
+            # e.g. written by another version of a class, recomputed and overwritten
+            self._stats.misses += 1
+            return False, None
+
+        # Files are evicted in the order they were last used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._stats.hits += 1
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile("wb", dir=str(self._directory), suffix=".tmp",
+                                delete=False) as f:
+            tmp_file_name = f.name
+            try:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_file_name)
+                raise
+        os.replace(tmp_file_name, self._directory / f"{key}{_SUFFIX}")
+        self._evict()
+
+    def clear(self) -> int:
+        removed = 0
+        for path, _, _ in self._list_entries():
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _evict(self) -> None:
+        entries = sorted(self._list_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self._max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self._stats.evicted += 1
+
+    def _list_entries(self) -> List[Tuple[Path, int, int]]:
+        # (path, last used at, size)
+        entries = []
+        try:
+            with os.scandir(self._directory) as it:
+                for entry in it:
+                    if entry.name.endswith(_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((Path(entry.path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return entries
+
+
+_cache: Optional[SnapshotCache] = None
+
+
+def set_snapshot_cache(cache: Optional[SnapshotCache]) -> None:
+    # Configured by the plugin, snapshot functions are called as is without a cache
+    global _cache
+    _cache = cache
+
+
+def get_snapshot_cache() -> Optional[SnapshotCache]:
+    return _cache
+
+
+def _hash_code(code: CodeType, digest: Any) -> None:
+    # Line numbers and file names are left out, so moving a function keeps its snapshots
+    digest.update(code.co_code)
+    digest.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(stable_repr(const).encode())
+
+
+def _get_global_names(code: CodeType) -> List[str]:
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names += _get_global_names(const)
+    return names
+
+
+def _hash_globals(fn: Callable[..., Any], digest: Any) -> None:
+    # Only constants are hashed, changes in called functions, classes and modules
+    # are not detected
+    fn_globals = getattr(fn, "__globals__", {})
+    for name in sorted(set(_get_global_names(getattr(fn, "__code__")))):
+        value = fn_globals.get(name)
+        if isinstance(value, ModuleType) or callable(value):
+            continue
+        try:
+            value_repr = stable_repr(value)
+        except UnstableReprError:
+            continue
+        digest.update(f"{name}={value_repr}".encode())
+
+
+def _hash_closure(fn: Callable[..., Any], digest: Any) -> None:
+    # Raises UnstableReprError for values that can't be matched between runs
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:  # empty cell
+            digest.update(b"<empty>")
+            continue
+        if isinstance(value, FunctionType):
+            _hash_code(value.__code__, digest)
+        else:
+            digest.update(stable_repr(value).encode())
+
+
+class SnapshotFunction(Generic[T]):
+    def __init__(self, fn: Callable[..., T], *, version: Optional[str] = None) -> None:
+        self._fn = fn
+        self._version = version
+        self._fn_hash: Union[str, None] = None
+        self._signature: Union[Signature, None] = None
+        update_wrapper(self, fn)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        cache = _cache
+        key = self._create_key(args, kwargs) if (cache is not None) else None
+
+        if iscoroutinefunction(self._fn):
+            return cast(T, self._call_async(cache, key, args, kwargs))
+
+        if (cache is None) or (key is None):
+            return self._fn(*args, **kwargs)
+
+        found, cached = cache.get(key)
+        if found:
+            return cast(T, cached)
+        result = self._fn(*args, **kwargs)
+        self._put(cache, key, result)
+        return result
+
+    async def _call_async(self, cache: Optional[SnapshotCache], key: Optional[str],
+                          args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        fn = cast(Callable[..., Any], self._fn)
+        if (cache is None) or (key is None):
+            return await fn(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if found:
+            return value
+        value = await fn(*args, **kwargs)
+        self._put(cache, key, value)
+        return value
+
+    def _put(self, cache: SnapshotCache, key: str, value: Any) -> None:
+        try:
+            cache.put(key, value)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise TypeError(f"Result of {self._fn.__qualname__}() can't be snapshotted: "
+                            f"{e}") from None
+
+    def _create_key(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[str]:
+        if self._signature is None:
+            self._signature = signature(self._fn)
+        try:
+            bound = self._signature.bind(*args, **kwargs)
+        except TypeError:
+            # Invalid call, left to the function to fail
+            return None
+        # Defaults are part of the key, so changing a default invalidates the snapshots
+        bound.apply_defaults()
+
+        try:
+            args_repr = stable_repr(list(bound.arguments.items()))
+        except UnstableReprError:
+            # Arguments without a stable representation (e.g. default object reprs)
+            # can't be matched between runs
+            return None
+
+        if self._fn_hash is None:
+            digest = blake2b(digest_size=16)
+            digest.update(f"{self._fn.__module__}.{self._fn.__qualname__}".encode())
+            digest.update(f"{sys.version_info[:2]}:{self._version}".encode())
+            _hash_code(getattr(self._fn, "__code__"), digest)
+            _hash_globals(self._fn, digest)
+            try:
+                _hash_closure(self._fn, digest)
+            except UnstableReprError:
+                self._fn_hash = ""
+            else:
+                self._fn_hash = digest.hexdigest()
+        if self._fn_hash == "":
+            # Closes over values that can't be matched between runs
+            return None
+
+        digest = blake2b(self._fn_hash.encode(), digest_size=16)
+        digest.update(args_repr.encode())
+        return digest.hexdigest()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._fn!r} version={self._version!r}>"
+
+
+@overload
+def snapshot(fn: Callable[..., T], /) -> SnapshotFunction[T]:  # pragma: no cover
+    ...
+
+
+@overload
+def snapshot(*, version: Optional[str] = None
+             ) -> Callable[[Callable[..., T]], SnapshotFunction[T]]:  # pragma: no cover
+    ...
+
+
+def snapshot(fn: Optional[Callable[..., T]] = None, /, *,
+             version: Optional[str] = None) -> Union[SnapshotFunction[T],
+                                                     Callable[[Callable[..., T]],
+                                                              SnapshotFunction[T]]]:
+    if fn is not None:
+        return SnapshotFunction(fn, version=version)
+
+    def wrapper(fn: Callable[..., T]) -> SnapshotFunction[T]:
+        return SnapshotFunction(fn, version=version)
+
+    return wrapper
@@ -0,0 +1,106 @@
+import asyncio
+from inspect import CORO_CREATED, getcoroutinestate, iscoroutine
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Awaitable, List, Optional, Type, TypeVar, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._scenario_steps import Step
+
+__all__ = ("StepGroup",)
+
+T = TypeVar("T")
+
+
+class StepGroup:
+    def __init__(self, step: "Step", *, limit: Optional[int] = None) -> None:
+        if (limit is not None) and (limit < 1):
+            raise ValueError(f"limit must be greater than 0 or None, {limit} given")
+        self._step = step
+        self._limit = limit
+        self._title: Union[str, None] = None
+        self._semaphore: Union[asyncio.Semaphore, None] = None
+        self._tasks: List["asyncio.Task[Any]"] = []
+        self._awaitables: List[Awaitable[Any]] = []
+
+    @property
+    def limit(self) -> Optional[int]:
+        return self._limit
+
+    @property
+    def results(self) -> List[Any]:
+        # In the order awaitables were added
+        return [task.result() for task in self._tasks]
+
+    def add(self, awaitable: Awaitable[T]) -> "asyncio.Task[T]":
+        if self._title is None:
+            raise RuntimeError("StepGroup.add() must be called inside `async with`")
+        task = asyncio.ensure_future(self._run(awaitable))
+        self._tasks.append(task)
+        self._awaitables.append(awaitable)
+        return task
+
+    async def _run(self, awaitable: Awaitable[T]) -> T:
+        if self._semaphore is None:
+            return await awaitable
+        async with self._semaphore:
+            return await awaitable
+
+    async def __aenter__(self) -> "StepGroup":
+        self._step.__enter__()
+        name = self._step._name
+        kind = self._step.__class__.__name__.lower()
+        self._title = kind if (name is None) else f"{kind} {name!r}"
+        if self._limit is not None:
+            self._semaphore = asyncio.Semaphore(self._limit)
+        return self
+
+    async def __aexit__(self,
+                        exc_type: Optional[Type[BaseException]],
+                        exc_val: Optional[BaseException],
+                        exc_tb: Optional[TracebackType]) -> bool:
+        try:
+            if exc_type is None:
+                await self._wait()
+            else:
+                await self._cancel()
+        except BaseException as e:
+            self._step.__exit__(type(e), e, e.__traceback__)
+            raise
+        return self._step.__exit__(exc_type, exc_val, exc_tb)
+
+    async def _wait(self) -> None:
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except BaseException:
+            await self._cancel()
+            raise
+
+        for index, task in enumerate(self._tasks, start=1):
+            if task.done() and not task.cancelled() and (task.exception() is not None):
+                await self._cancel()
+                exc = task.exception()
+                assert exc is not None  # for type checker
+                self._add_note(exc, f"raised in {self._title} (task {index} of "
+                                    f"{len(self._tasks)})")
+                raise exc
+
+    async def _cancel(self) -> None:
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Tasks cancelled before they started never awaited their coroutines
+        for awaitable in self._awaitables:
+            if iscoroutine(awaitable) and (getcoroutinestate(awaitable) == CORO_CREATED):
+                awaitable.close()
+
+    def _add_note(self, exc: BaseException, note: str) -> None:
+        # Same as BaseException.add_note() (Python 3.11+)
+        notes = getattr(exc, "__notes__", None)
+        if notes is None:
+            exc.__notes__ = [note]
+        else:
+            notes.append(note)
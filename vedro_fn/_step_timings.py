@@ -0,0 +1,78 @@
+from contextvars import ContextVar, Token
+from typing import Any, Iterator, List, Union
+
+__all__ = ("StepTiming", "StepRecorder", "get_step_recorder", "start_recording",
+           "stop_recording",)
+
+
+class StepTiming:
+    def __init__(self, kind: str, name: Union[str, None], started_at: int, elapsed: int, *,
+                 failed: bool = False) -> None:
+        self._kind = kind
+        self._name = name
+        self._started_at = started_at
+        self._elapsed = elapsed
+        self._failed = failed
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def name(self) -> Union[str, None]:
+        return self._name
+
+    @property
+    def started_at(self) -> int:
+        # time.perf_counter_ns()
+        return self._started_at
+
+    @property
+    def elapsed(self) -> int:
+        # nanoseconds
+        return self._elapsed
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def __str__(self) -> str:
+        title = self._kind if (self._name is None) else f"{self._kind} {self._name}"
+        return f"{title} ({self._elapsed / 1_000_000:.2f}ms)"
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}({self._kind!r}, {self._name!r}, "
+                f"{self._started_at!r}, {self._elapsed!r}, failed={self._failed!r})")
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, self.__class__) and (self.__dict__ == other.__dict__)
+
+
+class StepRecorder:
+    def __init__(self) -> None:
+        self._timings: List[StepTiming] = []
+
+    def record(self, timing: StepTiming) -> None:
+        self._timings.append(timing)
+
+    def __iter__(self) -> Iterator[StepTiming]:
+        return iter(self._timings)
+
+    def __len__(self) -> int:
+        return len(self._timings)
+
+
+_recorder: ContextVar[Union[StepRecorder, None]] = ContextVar("vedro_fn_step_recorder",
+                                                              default=None)
+
+
+def get_step_recorder() -> Union[StepRecorder, None]:
+    return _recorder.get()
+
+
+def start_recording(recorder: StepRecorder) -> Token[Union[StepRecorder, None]]:
+    return _recorder.set(recorder)
+
+
+def stop_recording(token: Token[Union[StepRecorder, None]]) -> None:
+    _recorder.reset(token)
@@ -0,0 +1,62 @@
+import json
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import IO, Any, Callable, List
+
+__all__ = ("read_json", "write_json", "read_json_lines", "append_json_line",
+           "write_json_lines",)
+
+
+def read_json(file_path: Path) -> Any:
+    try:
+        with open(file_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_json(file_path: Path, content: Any) -> None:
+    _write_atomically(file_path, lambda f: json.dump(content, f))
+
+
+def read_json_lines(file_path: Path) -> List[Any]:
+    # Lines that can't be decoded (e.g. partially written) are skipped
+    contents = []
+    try:
+        with open(file_path, "r") as f:
+            for line in f:
+                try:
+                    contents.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return contents
+
+
+def append_json_line(file_path: Path, content: Any) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "a") as f:
+        f.write(json.dumps(content, separators=(",", ":")) + "\n")
+
+
+def write_json_lines(file_path: Path, contents: List[Any]) -> None:
+    def write(f: IO[str]) -> None:
+        for content in contents:
+            f.write(json.dumps(content, separators=(",", ":")) + "\n")
+
+    _write_atomically(file_path, write)
+
+
+def _write_atomically(file_path: Path, write: Callable[[IO[str]], None]) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=str(file_path.parent), suffix=".tmp",
+                            delete=False) as f:
+        tmp_file_name = f.name
+        write(f)
+    try:
+        os.replace(tmp_file_name, file_path)
+    except Exception:
+        os.unlink(tmp_file_name)
+        raise
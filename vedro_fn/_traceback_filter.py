@@ -0,0 +1,67 @@
+import os
+from types import FrameType, ModuleType, TracebackType
+from typing import Dict, Sequence, Union
+
+from vedro.core import ExcInfo
+from vedro.core.exc_info import TracebackFilter as BaseTracebackFilter
+
+__all__ = ("TracebackFilter", "FilteredExcInfo",)
+
+# Number of source files whose "is internal" decision is kept
+_MAX_CACHED_FILES = 4096
+
+
+class TracebackFilter(BaseTracebackFilter):
+    def __init__(self, modules: Sequence[Union[str, ModuleType]], *,
+                 skip_hidden_frames: bool = True) -> None:
+        super().__init__(modules, skip_hidden_frames=skip_hidden_frames)
+        # Directories of the modules to hide
+        self._paths = tuple(os.path.join(str(path), "") for path in self._module_paths)
+        # file name -> "is internal file", so each file path is resolved only once
+        self._internal_files: Dict[str, bool] = {}
+
+    def should_hide_frame(self, frame: FrameType) -> bool:
+        if self._is_internal_file(frame.f_code.co_filename):
+            return True
+
+        if not self._skip_hidden_frames:
+            return False
+        for flag in ("__traceback_hide__", "__tracebackhide__"):
+            if frame.f_locals.get(flag, False):
+                return True
+        return False
+
+    def _is_internal_file(self, filename: str) -> bool:
+        try:
+            return self._internal_files[filename]
+        except KeyError:
+            pass
+        if len(self._internal_files) >= _MAX_CACHED_FILES:
+            self._internal_files.clear()
+        is_internal = os.path.realpath(filename).startswith(self._paths)
+        self._internal_files[filename] = is_internal
+        return is_internal
+
+
+class FilteredExcInfo(ExcInfo):
+    # Wraps the exception info of a failed step, the traceback is filtered on first read
+    # (e.g. by a reporter), not when the exception is raised
+
+    _traceback: TracebackType
+    _tb_filter: Union[BaseTracebackFilter, None]
+
+    def __init__(self, exc_info: ExcInfo, tb_filter: BaseTracebackFilter) -> None:
+        super().__init__(exc_info.type, exc_info.value, exc_info.traceback)
+        self._tb_filter = tb_filter
+
+    @property
+    def traceback(self) -> TracebackType:
+        if self._tb_filter is not None:
+            self._traceback = self._tb_filter.filter_tb(self._traceback)
+            self._tb_filter = None
+        return self._traceback
+
+    @traceback.setter
+    def traceback(self, value: TracebackType) -> None:
+        self._tb_filter = None
+        self._traceback = value
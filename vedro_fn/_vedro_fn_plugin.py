@@ -1,11 +1,73 @@
 import os
-from typing import Type, Union
+import re
+import sys
+from contextvars import Token
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple, Type, Union, cast
 
-from vedro.core import Dispatcher, Plugin, PluginConfig
-from vedro.events import ConfigLoadedEvent, ExceptionRaisedEvent
-from vedro.plugins.director.rich.utils import TracebackFilter
+from vedro import Scenario
+from vedro.core import (
+    ConfigType,
+    Dispatcher,
+    ModuleLoader,
+    Plugin,
+    PluginConfig,
+    ScenarioResult,
+    ScenarioScheduler,
+    VirtualScenario,
+)
+from vedro.core.exc_info import TracebackFilter as BaseTracebackFilter
+from vedro.events import (
+    ArgParsedEvent,
+    ArgParseEvent,
+    CleanupEvent,
+    ConfigLoadedEvent,
+    ScenarioFailedEvent,
+    ScenarioPassedEvent,
+    ScenarioReportedEvent,
+    ScenarioRunEvent,
+    StartupEvent,
+    StepFailedEvent,
+)
 
-from ._scenario_loader import ScenarioLoader
+from ._benchmark import pop_collected_benchmarks
+from ._discovery_cache import DiscoveryCache
+from ._duration_log import DurationLog
+from ._events import StepTimingsRecordedEvent
+from ._impact_map import ImpactMap, get_changed_files
+from ._import_graph import ImportGraph
+from ._import_profiler import ImportProfiler
+from ._memory_tracker import (
+    MemoryTracker,
+    format_size,
+    get_memory_budget,
+    parse_size,
+    start_tracking,
+    stop_tracking,
+)
+from ._params_matrix import set_full_matrix
+from ._profiler import ScenarioProfiler, is_profiled, start_profiling, stop_profiling
+from ._resource_pool import (
+    close_resources,
+    has_resources,
+    iter_resources,
+    set_default_pool_size,
+    start_leasing,
+    stop_leasing,
+)
+from ._row_ids import get_row_key
+from ._scenario_batch import ScenarioBatch, cancel_scenario_batches, get_scenario_batch
+from ._scenario_discoverer import ModuleSelectorType, ScenarioDiscoverer
+from ._scenario_index import IndexedScenario
+from ._scenario_lister import ScenarioLister
+from ._scenario_loader import ScenarioFilterType, ScenarioLoader
+from ._scenario_watcher import ScenarioWatcher
+from ._shard_planner import ShardPlanner
+from ._shared import clear_shared
+from ._snapshot_cache import SnapshotCache, set_snapshot_cache
+from ._step_timings import StepRecorder, start_recording, stop_recording
+from ._storage import read_json, write_json
+from ._traceback_filter import FilteredExcInfo, TracebackFilter
 
 __all__ = ("VedroFn", "VedroFnPlugin",)
 
@@ -14,27 +76,632 @@ class VedroFnPlugin(Plugin):
     def __init__(self, config: Type["VedroFn"]) -> None:
         super().__init__(config)
         self._show_internal_calls: bool = config.show_internal_calls
-        self._tb_filter: Union[TracebackFilter, None] = None
+        self._static_index: bool = config.static_index
+        self._use_discovery_cache: bool = config.discovery_cache
+        self._discovery_cache: Union[DiscoveryCache, None] = None
+        self._discovery_workers: int = config.discovery_workers
+        self._import_profiling: bool = config.import_profiling
+        self._import_allocations: bool = config.import_allocations
+        self._import_profiler: Union[ImportProfiler, None] = None
+        self._scenario_loader: Union[ScenarioLoader, None] = None
+        self._tb_filter: Union[BaseTracebackFilter, None] = None
+        self._subject: Union[str, None] = None
+        self._sharding: bool = config.sharding
+        self._shard: Union[Tuple[int, int], None] = None
+        self._shard_summary: Union[str, None] = None
+        # Planned at discovery when modules are skipped before import
+        self._shard_plan: Union[Dict[str, int], None] = None
+        self._shard_skipped_files = 0
+        self._regression_detection: bool = config.regression_detection
+        self._regression_window: int = config.regression_window
+        if self._regression_window < 1:
+            raise ValueError("regression_window must be greater than 0, "
+                             f"{self._regression_window} given")
+        self._regression_threshold: float = config.regression_threshold
+        # Durations of passed scenarios by row key, used for sharding and regression detection
+        self._duration_log: Union[DurationLog, None] = None
+        self._run_durations: Dict[str, float] = {}
+        self._failed_rows: bool = config.failed_rows
+        self._failed_rows_path: Union[Path, None] = None
+        self._last_failed_rows = False
+        self._failed_row_keys: Set[str] = set()
+        self._impact_selection: bool = config.impact_selection
+        self._impact_map: Union[ImpactMap, None] = None
+        self._import_graph: Union[ImportGraph, None] = None
+        self._changed_since: Union[str, None] = None
+        self._impact_summary: Union[str, None] = None
+        self._profiling: bool = config.profiling
+        self._profiles_dir: Union[Path, None] = None
+        self._profile_all = False
+        self._profiler: Union[ScenarioProfiler, None] = None
+        self._profiler_token: Union[Token[Union[ScenarioProfiler, None]], None] = None
+        self._profiles_written = 0
+        self._profiles_skipped = 0
+        self._memory_tracking: bool = config.memory_tracking
+        self._memory_tracker: Union[MemoryTracker, None] = None
+        self._memory_tracker_token: Union[Token[Union[MemoryTracker, None]], None] = None
+        self._memory_skipped = 0
+        self._watch: bool = config.watch
+        self._watch_interval: float = config.watch_interval
+        self._watching = False
+        self._vedro_config: Union[ConfigType, None] = None
+        self._resource_pool_size: Union[int, None] = config.resource_pool_size
+        self._leases_token: Union[Token[Union[List[Any], None]], None] = None
+        self._full_matrix: bool = config.full_matrix
+        self._threaded: bool = config.threaded
+        self._thread_pool_size: int = config.thread_pool_size
+        if self._thread_pool_size < 1:
+            raise ValueError("thread_pool_size must be greater than 0, "
+                             f"{self._thread_pool_size} given")
+        self._snapshots: bool = config.snapshots
+        self._snapshot_cache_size = parse_size(config.snapshot_cache_size)
+        self._snapshot_cache: Union[SnapshotCache, None] = None
+        self._step_timings: bool = config.step_timings
+        self._step_recorder: Union[StepRecorder, None] = None
+        self._step_recorder_token: Union[Token[Union[StepRecorder, None]], None] = None
+        self._scheduler: Union[ScenarioScheduler, None] = None
+        self._dispatcher: Union[Dispatcher, None] = None
 
     def subscribe(self, dispatcher: Dispatcher) -> None:
+        self._dispatcher = dispatcher
         dispatcher.listen(ConfigLoadedEvent, self._on_config_loaded) \
-                  .listen(ExceptionRaisedEvent, self._on_exception_raised)
+                  .listen(ArgParseEvent, self._on_arg_parse) \
+                  .listen(ArgParsedEvent, self._on_arg_parsed) \
+                  .listen(ArgParsedEvent, self._on_arg_parsed_list) \
+                  .listen(StartupEvent, self._on_startup) \
+                  .listen(ScenarioRunEvent, self._on_scenario_run) \
+                  .listen(StepFailedEvent, self._on_step_failed) \
+                  .listen(ScenarioPassedEvent, self._on_scenario_end) \
+                  .listen(ScenarioFailedEvent, self._on_scenario_end) \
+                  .listen(ScenarioReportedEvent, self._on_scenario_reported) \
+                  .listen(CleanupEvent, self._on_cleanup) \
+                  .listen(CleanupEvent, self._on_cleanup_watch, priority=sys.maxsize - 1)
 
     def _on_config_loaded(self, event: ConfigLoadedEvent) -> None:
-        event.config.Registry.ScenarioLoader.register(  # pragma: no branch
-            lambda: ScenarioLoader(module_loader=event.config.Registry.ModuleLoader()),
+        self._vedro_config = event.config
+        set_default_pool_size(self._resource_pool_size)
+
+        if self._use_discovery_cache:
+            cache_path = event.config.project_dir / ".vedro" / "vedro_fn" / "discovery.json"
+            self._discovery_cache = DiscoveryCache(cache_path)
+
+        if self._failed_rows:
+            self._failed_rows_path = (event.config.project_dir / ".vedro" / "vedro_fn" /
+                                      "last_failed.json")
+
+        if self._impact_selection:
+            impact_path = event.config.project_dir / ".vedro" / "vedro_fn" / "impact.json"
+            self._impact_map = ImpactMap(impact_path)
+            self._import_graph = ImportGraph()
+
+        if self._profiling:
+            self._profiles_dir = event.config.project_dir / ".vedro" / "vedro_fn" / "profiles"
+
+        if self._sharding or self._regression_detection:
+            log_path = event.config.project_dir / ".vedro" / "vedro_fn" / "durations.jsonl"
+            # Enough runs are kept for the regression window
+            self._duration_log = DurationLog(log_path,
+                                             max_runs=max(50, self._regression_window))
+
+        if self._snapshots:
+            snapshots_dir = event.config.project_dir / ".vedro" / "vedro_fn" / "snapshots"
+            self._snapshot_cache = SnapshotCache(snapshots_dir,
+                                                 max_size=self._snapshot_cache_size)
+
+        registry = event.config.Registry
+        registry.ScenarioLoader.register(  # pragma: no branch
+            lambda: self._create_scenario_loader(registry.ModuleLoader()),
             self
         )
 
-    def _on_exception_raised(self, event: ExceptionRaisedEvent) -> None:
-        if self._show_internal_calls:
+        # Modules must be imported by the ScenarioLoader to record their imports
+        if ((self._discovery_workers > 0) or self._impact_selection or
+                (self._sharding and self._use_discovery_cache)):
+            registry.ScenarioDiscoverer.register(lambda: ScenarioDiscoverer(
+                finder=registry.ScenarioFinder(),
+                loader=registry.ScenarioLoader(),
+                orderer=registry.ScenarioOrderer(),
+                workers=self._discovery_workers,
+                module_selector=self._create_module_selector(),
+            ), self)
+
+    def _create_scenario_loader(self, module_loader: ModuleLoader) -> ScenarioLoader:
+        self._scenario_loader = ScenarioLoader(module_loader=module_loader,
+                                               scenario_filter=self._create_scenario_filter(),
+                                               indexer=self._discovery_cache,
+                                               import_graph=self._import_graph,
+                                               thread_pool_size=self._thread_pool_size,
+                                               threaded=self._threaded,
+                                               import_profiler=self._import_profiler)
+        return self._scenario_loader
+
+    def _create_module_selector(self) -> Union[ModuleSelectorType, None]:
+        if (self._shard is None) or (self._discovery_cache is None):
+            return None
+        if self._last_failed_rows or (self._changed_since is not None):
+            # These selections are applied before sharding, after all modules are imported
+            return None
+        return self._select_shard_modules
+
+    def _on_arg_parse(self, event: ArgParseEvent) -> None:
+        group = event.arg_parser.add_argument_group("VedroFn")
+        group.add_argument("--fn-full-matrix", action="store_true", default=False,
+                           help="Run every combination of scenario.matrix(...), "
+                                "ignoring pairwise and random reductions")
+        group.add_argument("--fn-profile-imports", action="store_true", default=False,
+                           help="Measure time of importing each scenario file "
+                                "and report the heaviest imports")
+        group.add_argument("--fn-profile-import-allocations", action="store_true",
+                           default=False,
+                           help="Also measure memory allocated by the imports (tracemalloc), "
+                                "which makes them several times slower")
+        if self._use_discovery_cache:
+            group.add_argument("--fn-list", action="store_true", default=False,
+                               help="List scenarios without importing scenario files that can "
+                                    "be indexed statically, and exit")
+        if self._sharding:
+            group.add_argument("--fn-shard", metavar="N/M",
+                               help="Run the N-th of M shards balanced by recorded durations "
+                                    "(N starts at 1)")
+        if self._failed_rows:
+            group.add_argument("--fn-last-failed", action="store_true", default=False,
+                               help="Run only scenarios and param rows failed in the last run")
+        if self._impact_selection:
+            group.add_argument("--fn-changed", metavar="REF", nargs="?", const="HEAD",
+                               help="Run only scenarios affected by files changed since REF "
+                                    "(git diff, HEAD by default)")
+        if self._profiling:
+            group.add_argument("--fn-profile", action="store_true", default=False,
+                               help="Profile all scenarios, not only marked with @profile")
+        if self._snapshots:
+            group.add_argument("--fn-no-snapshots", action="store_true", default=False,
+                               help="Call @snapshot functions without reading or writing "
+                                    "the snapshot cache")
+            group.add_argument("--fn-clear-snapshots", action="store_true", default=False,
+                               help="Remove all snapshots before the run")
+        if self._watch:
+            group.add_argument("--fn-watch", action="store_true", default=False,
+                               help="Keep running and rerun scenarios changed in scenario files")
+
+    def _on_arg_parsed(self, event: ArgParsedEvent) -> None:
+        # `--subject` is registered by the Skipper plugin, which may be disabled
+        self._subject = getattr(event.args, "subject", None)
+
+        self._last_failed_rows = getattr(event.args, "fn_last_failed", False)
+        self._changed_since = getattr(event.args, "fn_changed", None)
+        self._profile_all = getattr(event.args, "fn_profile", False)
+        self._watching = getattr(event.args, "fn_watch", False)
+        set_full_matrix(self._full_matrix or getattr(event.args, "fn_full_matrix", False))
+        track_allocations = (self._import_allocations or
+                             getattr(event.args, "fn_profile_import_allocations", False))
+        if (self._import_profiling or track_allocations or
+                getattr(event.args, "fn_profile_imports", False)):
+            self._import_profiler = ImportProfiler(track_allocations=track_allocations)
+
+        fn_shard = getattr(event.args, "fn_shard", None)
+        if fn_shard is not None:
+            self._shard = self._parse_shard(fn_shard)
+
+        if self._snapshot_cache is not None:
+            if getattr(event.args, "fn_clear_snapshots", False):
+                self._snapshot_cache.clear()
+            if getattr(event.args, "fn_no_snapshots", False):
+                self._snapshot_cache = None
+            # Snapshots may be taken by module-level code, so the cache is set before discovery
+            set_snapshot_cache(self._snapshot_cache)
+
+    async def _on_arg_parsed_list(self, event: ArgParsedEvent) -> None:
+        if not getattr(event.args, "fn_list", False):
+            return
+        assert self._vedro_config is not None  # for type checker
+        assert self._discovery_cache is not None  # for type checker
+
+        registry = self._vedro_config.Registry
+        project_dir = self._vedro_config.project_dir
+        lister = ScenarioLister(registry.ScenarioFinder(), registry.ScenarioLoader(),
+                                project_dir / self._vedro_config.default_scenarios_dir,
+                                project_dir=project_dir, indexer=self._discovery_cache)
+        for line in await lister.list():
+            print(line)
+        self._discovery_cache.save()
+        raise SystemExit(0)
+
+    def _parse_shard(self, raw: str) -> Tuple[int, int]:
+        match = re.match(r"^(?P<index>\d+)\s*/\s*(?P<total>\d+)$", raw.strip())
+        if not match:
+            raise ValueError(f"Invalid --fn-shard format: '{raw}'. "
+                             "Expected '<index>/<total>' with positive integers")
+        index, total = int(match.group("index")), int(match.group("total"))
+        if not (1 <= index <= total):
+            raise ValueError("`<index>` in --fn-shard must be greater than or equal to 1 and "
+                             "less than or equal to `<total>`")
+        return index, total
+
+    def _create_scenario_filter(self) -> Union[ScenarioFilterType, None]:
+        if not self._static_index or not self._subject:
+            return None
+
+        subject = self._subject
+
+        def scenario_filter(scenario: IndexedScenario) -> bool:
+            return scenario.subject == subject
+
+        return scenario_filter
+
+    async def _on_startup(self, event: StartupEvent) -> None:
+        # Discovery is finished at this point
+        if self._discovery_cache is not None:
+            self._discovery_cache.save()
+
+        if (self._impact_map is not None) and (self._import_graph is not None):
+            assert self._vedro_config is not None  # for type checker
+            project_dir = self._vedro_config.project_dir
+            self._impact_map.update(self._import_graph.dependencies(project_dir))
+            self._impact_map.save()
+
+            if self._changed_since is not None:
+                await self._apply_impact_selection(event, project_dir, self._changed_since)
+
+        if self._last_failed_rows:
+            await self._apply_last_failed_rows(event)
+
+        if (self._shard is not None) and (self._duration_log is not None):
+            await self._apply_shard(event, *self._shard)
+
+        # Concurrent rows and threaded scenarios are batched by what is left after the selection
+        self._scheduler = event.scheduler
+
+    async def _apply_impact_selection(self, event: StartupEvent, project_dir: Path,
+                                      ref: str) -> None:
+        assert self._impact_map is not None  # for type checker
+        changed_files = get_changed_files(project_dir, ref)
+        uncovered = self._impact_map.get_uncovered(changed_files)
+        if uncovered:
+            total = len([scenario async for scenario in event.scheduler])
+            paths = sorted(uncovered)
+            not_covered = ", ".join(paths[:3])
+            if len(paths) > 3:
+                not_covered += f" and {len(paths) - 3} more"
+            self._impact_summary = (f"vedro-fn impact: all {total} scenarios selected, "
+                                    f"{len(changed_files)} files changed since {ref}, "
+                                    f"not covered by the impact map: {not_covered}")
+            return
+
+        total, selected = 0, 0
+        async for scenario in event.scheduler:
+            total += 1
+            if self._impact_map.is_affected(scenario.rel_path, changed_files):
+                selected += 1
+            else:
+                event.scheduler.ignore(scenario)
+
+        self._impact_summary = (f"vedro-fn impact: {selected} of {total} scenarios selected, "
+                                f"{len(changed_files)} files changed since {ref}")
+
+    async def _apply_last_failed_rows(self, event: StartupEvent) -> None:
+        assert self._failed_rows_path is not None  # for type checker
+        content = read_json(self._failed_rows_path)
+        if isinstance(content, dict) and (content.get("version") == 1):
+            last_failed = set(content["failed"])
+        else:
+            last_failed = set()
+
+        async for scenario in event.scheduler:
+            if get_row_key(scenario) not in last_failed:
+                event.scheduler.ignore(scenario)
+
+    def _get_shard_durations(self, scenarios: List[VirtualScenario]) -> Dict[str, float]:
+        assert self._duration_log is not None  # for type checker
+        latest = self._duration_log.latest
+        # Rows are recorded by keys derived from their params, so reordering rows keeps
+        # their durations
+        return {scn.unique_id: latest[get_row_key(scn)] for scn in scenarios
+                if get_row_key(scn) in latest}
+
+    def _select_shard_modules(self, scenarios: List[VirtualScenario],
+                              static_ids: Dict[Path, List[str]]) -> Set[Path]:
+        # Scenarios of modules known from the discovery cache are planned without importing
+        # their modules, only modules with scenarios in this shard are imported
+        assert self._shard is not None  # for type checker
+        assert self._duration_log is not None  # for type checker
+        index, total = self._shard
+        latest = self._duration_log.latest
+
+        unique_ids = [scn.unique_id for scn in scenarios]
+        durations = self._get_shard_durations(scenarios)
+        for ids in static_ids.values():
+            unique_ids.extend(ids)
+            # Row keys of scenarios without params are their unique IDs
+            durations.update({uid: latest[uid] for uid in ids if uid in latest})
+        self._shard_plan = ShardPlanner(total).plan(unique_ids, durations)
+
+        selected = {path for path, ids in static_ids.items()
+                    if any(self._shard_plan[uid] == index - 1 for uid in ids)}
+        self._shard_skipped_files = len(static_ids) - len(selected)
+        return selected
+
+    async def _apply_shard(self, event: StartupEvent, index: int, total: int) -> None:
+        scenarios = [scenario async for scenario in event.scheduler]
+        durations = self._get_shard_durations(scenarios)
+        if self._shard_plan is None:
+            plan = ShardPlanner(total).plan([scn.unique_id for scn in scenarios], durations)
+        else:
+            plan = self._shard_plan
+
+        selected, unseen, estimated = 0, 0, 0.0
+        for scenario in scenarios:
+            # Scenarios missing from the plan made at discovery are kept, so none is lost
+            if plan.get(scenario.unique_id, index - 1) != index - 1:
+                event.scheduler.ignore(scenario)
+                continue
+            selected += 1
+            if scenario.unique_id in durations:
+                estimated += durations[scenario.unique_id]
+            else:
+                unseen += 1
+
+        self._shard_summary = (f"vedro-fn shard {index}/{total}: {selected} scenarios "
+                               f"(estimated {estimated:.2f}s, {unseen} without history)")
+        if self._shard_plan is not None:
+            self._shard_summary += f", {self._shard_skipped_files} files not imported"
+
+    def _on_scenario_run(self, event: ScenarioRunEvent) -> None:
+        # Results of `benchmark` calls are collected from the first call of the scenario,
+        # those made outside scenarios are dropped
+        pop_collected_benchmarks()
+        # Resources acquired by the scenario are returned to their pools when it ends
+        # (resources are usually declared at import, before scenarios run)
+        if has_resources():
+            self._leases_token = start_leasing([])
+
+        batch = get_scenario_batch(event.scenario_result.scenario)
+        if (batch is not None) and (self._scheduler is not None):
+            batch.schedule(self._get_batch_group(event.scenario_result.scenario, batch))
+
+        if self._step_timings:
+            self._step_recorder = StepRecorder()
+            self._step_recorder_token = start_recording(self._step_recorder)
+
+        scenario = event.scenario_result.scenario
+        if self._profiling and (self._profile_all or is_profiled(scenario)):
+            if batch is not None:
+                # Scenarios running concurrently or in threads can't be told apart
+                # (explicit @profile is refused by the ScenarioLoader)
+                self._profiles_skipped += 1
+            else:
+                self._profiler = ScenarioProfiler()
+                self._profiler_token = start_profiling(self._profiler)
+
+        # Scenarios with a memory budget are always tracked
+        budget = get_memory_budget(scenario)
+        if self._memory_tracking or (budget is not None):
+            if batch is not None:
+                # tracemalloc is process-wide, so scenarios running concurrently or in threads
+                # can't be measured (@memory_budget on them is refused by the ScenarioLoader)
+                self._memory_skipped += 1
+            else:
+                self._memory_tracker = MemoryTracker(budget)
+                self._memory_tracker_token = start_tracking(self._memory_tracker)
+
+    def _get_batch_group(self, scenario: VirtualScenario,
+                         batch: ScenarioBatch) -> List[Type[Scenario]]:
+        # The scenario and scenarios of the same batch scheduled right after it (skipped ones
+        # don't run), so batched scenarios never overlap with scenarios run one by one
+        assert self._scheduler is not None  # for type checker
+        group: List[Type[Scenario]] = []
+        seen: Set[str] = set()
+        for scn in self._scheduler.scheduled:
+            if scn.unique_id in seen:
+                continue
+            seen.add(scn.unique_id)
+            if not group:
+                if scn.unique_id == scenario.unique_id:
+                    group.append(scn._orig_scenario)
+            elif scn.is_skipped():
+                continue
+            elif get_scenario_batch(scn) is batch:
+                group.append(scn._orig_scenario)
+            else:
+                break
+        return group
+
+    async def _on_scenario_end(self,
+                               event: Union[ScenarioPassedEvent, ScenarioFailedEvent]) -> None:
+        batch = get_scenario_batch(event.scenario_result.scenario)
+        if batch is not None:
+            # Batched scenarios start before their turn, so they are timed by the batch
+            timing = batch.pop_timing(event.scenario_result.scenario._orig_scenario)
+            if timing is not None:
+                event.scenario_result.set_started_at(timing[0]).set_ended_at(timing[1])
+
+        row = getattr(event.scenario_result.scenario._orig_scenario, "__vedro_fn_row__", None)
+        if (row is not None) and (row.id is not None):
+            event.scenario_result.add_extra_details(f"row {row.id}")
+
+        if self._leases_token is not None:
+            stop_leasing(self._leases_token)
+            self._leases_token = None
+
+        for stats in pop_collected_benchmarks():
+            event.scenario_result.add_extra_details(str(stats))
+
+        # Failed scenarios often end early, only passed ones are recorded
+        if (self._duration_log is not None) and event.scenario_result.is_passed():
+            self._run_durations[get_row_key(event.scenario_result.scenario)] = \
+                event.scenario_result.elapsed
+
+        if (self._memory_tracker is not None) and (self._memory_tracker_token is not None):
+            stop_tracking(self._memory_tracker, self._memory_tracker_token)
+            self._add_memory_details(event.scenario_result, self._memory_tracker)
+            self._memory_tracker, self._memory_tracker_token = None, None
+
+        if (self._profiler is not None) and (self._profiler_token is not None):
+            stop_profiling(self._profiler, self._profiler_token)
+            self._write_profile(event.scenario_result, self._profiler)
+            self._profiler, self._profiler_token = None, None
+
+        if (self._step_recorder is None) or (self._step_recorder_token is None):
+            return
+
+        stop_recording(self._step_recorder_token)
+        step_timings = list(self._step_recorder)
+        self._step_recorder, self._step_recorder_token = None, None
+
+        for step_timing in step_timings:
+            event.scenario_result.add_extra_details(str(step_timing))
+
+        assert self._dispatcher is not None  # for type checker
+        await self._dispatcher.fire(StepTimingsRecordedEvent(event.scenario_result,
+                                                             step_timings))
+
+    def _add_memory_details(self, scenario_result: ScenarioResult,
+                            tracker: MemoryTracker) -> None:
+        scenario_result.add_extra_details(f"memory peak {format_size(tracker.peak)}, "
+                                          f"net {format_size(tracker.net, sign=True)}")
+        for step_memory in tracker.steps:
+            scenario_result.add_extra_details(str(step_memory))
+
+    def _write_profile(self, scenario_result: ScenarioResult, profiler: ScenarioProfiler) -> None:
+        assert self._profiles_dir is not None  # for type checker
+        self._profiles_dir.mkdir(parents=True, exist_ok=True)
+
+        file_name = re.sub(r"[^\w.-]+", "_", scenario_result.scenario.unique_id)
+        stats_path = self._profiles_dir / f"{file_name}.pstats"
+        profiler.dump_stats(stats_path)
+        profiler.dump_collapsed_stacks(self._profiles_dir / f"{file_name}.collapsed")
+
+        self._profiles_written += 1
+        scenario_result.add_extra_details(f"profile {stats_path.with_suffix('')}.*")
+
+    def _on_scenario_reported(self, event: ScenarioReportedEvent) -> None:
+        if self._failed_rows and event.aggregated_result.is_failed():
+            self._failed_row_keys.add(get_row_key(event.aggregated_result.scenario))
+
+    def _on_step_failed(self, event: StepFailedEvent) -> None:
+        exc_info = event.step_result.exc_info
+        if self._show_internal_calls or (exc_info is None):
             return
 
         if self._tb_filter is None:
-            vedro_scn_module = os.path.dirname(__file__)
-            self._tb_filter = TracebackFilter(modules=[vedro_scn_module])
+            self._tb_filter = self._create_tb_filter(os.path.dirname(__file__))
+
+        if not isinstance(exc_info, FilteredExcInfo):
+            event.step_result.set_exc_info(FilteredExcInfo(exc_info, self._tb_filter))
+
+    def _create_tb_filter(self, vedro_fn_module: str) -> BaseTracebackFilter:
+        registry = getattr(self._vedro_config, "Registry", None)
+        tb_filter_factory = getattr(registry, "TracebackFilter", None)
+        if tb_filter_factory is None:
+            return TracebackFilter(modules=[vedro_fn_module])
+
+        # The default filter is replaced with the cached one, others (e.g. the no-op filter
+        # registered with `--vedro-debug`) are used as is
+        tb_filter = tb_filter_factory(modules=[vedro_fn_module])
+        if type(tb_filter) is BaseTracebackFilter:
+            return TracebackFilter(modules=[vedro_fn_module])
+        return cast(BaseTracebackFilter, tb_filter)
+
+    async def _on_cleanup(self, event: CleanupEvent) -> None:
+        # Release results of `shared` setup functions
+        clear_shared()
+        await cancel_scenario_batches()
+
+        for res in iter_resources():
+            if res.stats.created > 0:
+                event.report.add_summary(f"vedro-fn resource {res.name}: {res.stats}")
+        await close_resources()
+
+        if self._failed_rows_path is not None:
+            write_json(self._failed_rows_path,
+                       {"version": 1, "failed": sorted(self._failed_row_keys)})
+
+        if (self._duration_log is not None) and self._run_durations:
+            if self._regression_detection:
+                self._report_regressions(event, self._duration_log)
+            self._duration_log.append(self._run_durations)
+
+        if self._snapshot_cache is not None:
+            snapshot_stats = self._snapshot_cache.stats
+            if snapshot_stats.hits + snapshot_stats.misses > 0:
+                event.report.add_summary(
+                    f"vedro-fn snapshots: {snapshot_stats} "
+                    f"({format_size(self._snapshot_cache.size)} on disk)"
+                )
+
+        if (self._profiles_written > 0) or (self._profiles_skipped > 0):
+            summary = (f"vedro-fn profiles: {self._profiles_written} written "
+                       f"to {self._profiles_dir}")
+            if self._profiles_skipped > 0:
+                summary += (f", {self._profiles_skipped} skipped "
+                            f"(scenarios running concurrently or in threads)")
+            event.report.add_summary(summary)
+
+        if self._memory_skipped > 0:
+            event.report.add_summary(f"vedro-fn memory tracking: {self._memory_skipped} skipped "
+                                     f"(scenarios running concurrently or in threads)")
+
+        if self._impact_summary is not None:
+            event.report.add_summary(self._impact_summary)
+
+        if self._shard_summary is not None:
+            event.report.add_summary(self._shard_summary)
+
+        if self._discovery_cache is not None:
+            stats = self._discovery_cache.stats
+            event.report.add_summary(
+                f"vedro-fn discovery cache: {stats.hit_rate:.1%} hit rate "
+                f"({stats.hits} hits, {stats.misses} misses, {stats.invalidated} invalidated)"
+            )
 
-        event.exc_info.traceback = self._tb_filter.filter_tb(event.exc_info.traceback)
+        if (self._discovery_workers > 0) and (self._scenario_loader is not None):
+            load_times = self._scenario_loader.load_times
+            summary = (f"vedro-fn discovery: {len(load_times)} files loaded "
+                       f"in {sum(load_times.values()):.2f}s")
+
+            slowest = sorted(load_times.items(), key=lambda x: x[1], reverse=True)[:3]
+            if slowest:
+                summary += ", slowest: " + ", ".join(f"{path} ({elapsed:.2f}s)"
+                                                     for path, elapsed in slowest)
+            event.report.add_summary(summary)
+
+        if self._import_profiler is not None:
+            for line in self._import_profiler.summary():
+                event.report.add_summary(line)
+
+    def _report_regressions(self, event: CleanupEvent, duration_log: DurationLog) -> None:
+        regressions = duration_log.find_regressions(self._run_durations,
+                                                    window=self._regression_window,
+                                                    threshold=self._regression_threshold)
+
+        if not regressions:
+            return
+        event.report.add_summary(f"vedro-fn regressions: {len(regressions)} of "
+                                 f"{len(self._run_durations)} scenarios slower than baseline")
+        for regression in regressions[:10]:
+            event.report.add_summary(f"  {regression}")
+        if len(regressions) > 10:
+            event.report.add_summary(f"  ... and {len(regressions) - 10} more")
+
+    async def _on_cleanup_watch(self, event: CleanupEvent) -> None:
+        # Runs after reporters have printed the summary, but before the Terminator plugin exits
+        if not self._watching:
+            return
+        assert self._vedro_config is not None  # for type checker
+        assert self._dispatcher is not None  # for type checker
+
+        registry = self._vedro_config.Registry
+        project_dir = self._vedro_config.project_dir
+        watcher = ScenarioWatcher(registry.ScenarioFinder(), registry.ScenarioLoader(),
+                                  project_dir / self._vedro_config.default_scenarios_dir,
+                                  project_dir=project_dir, interval=self._watch_interval)
+        await watcher.snapshot()
+
+        async for scenarios in watcher.watch():
+            runner = registry.ScenarioRunner()
+            report = await runner.run(registry.ScenarioScheduler(scenarios))
+            print(f"vedro-fn watch: {report.total} scenarios, {report.passed} passed, "
+                  f"{report.failed} failed, {report.skipped} skipped "
+                  f"({report.elapsed:.2f}s)", flush=True)
 
 
 class VedroFn(PluginConfig):
@@ -43,3 +710,79 @@ class VedroFn(PluginConfig):
 
     # Show internal calls (vedro_fn) in the traceback output
     show_internal_calls = False
+
+    # Parse scenario files before importing them and skip modules without selected scenarios
+    # (e.g. when `--subject` is given)
+    static_index = False
+
+    # Cache the static index in .vedro/ keyed by file path, mtime and content hash, also used by
+    # `--fn-shard` to skip importing files of other shards and by `--fn-list`
+    discovery_cache = False
+
+    # Measure wall time of importing each scenario file and building its scenarios, report files
+    # ranked by time with their heaviest first-time imports (also enabled with
+    # `--fn-profile-imports`)
+    import_profiling = False
+
+    # Also measure memory still allocated after each import (tracemalloc, also enabled with
+    # `--fn-profile-import-allocations`). Tracing memory makes imports several times slower
+    import_allocations = False
+
+    # Read and compile scenario files in a thread pool of the given size before importing
+    # them one by one (0 disables), report per-file load times
+    discovery_workers = 0
+
+    # Record durations of passed scenarios in .vedro/vedro_fn/durations.jsonl and enable
+    # `--fn-shard N/M`, which splits scenarios (including each param row) into M shards
+    # with similar total duration
+    sharding = False
+
+    # Remember failed scenarios and param rows (by IDs derived from param values)
+    # and enable `--fn-last-failed` to run only them
+    failed_rows = False
+
+    # Record project-local modules imported by each scenario file in .vedro/ and enable
+    # `--fn-changed [REF]`, which runs only scenarios affected by `git diff REF`
+    impact_selection = False
+
+    # Profile scenarios marked with @profile (or all with `--fn-profile`), write pstats
+    # and collapsed stacks (attributed to given/when/then steps) to .vedro/vedro_fn/profiles/
+    profiling = False
+
+    # Measure peak and net allocated memory (tracemalloc) per scenario and per given/when/then
+    # step, add it to the scenario result. Scenarios with @memory_budget are always measured
+    memory_tracking = False
+
+    # Enable `--fn-watch`: after the run, poll scenario files every `watch_interval` seconds,
+    # re-import only changed modules and rerun only changed scenarios
+    watch = False
+    watch_interval = 0.5
+
+    # Default size limit of pools of @resource without `max_size` (None means unlimited)
+    resource_pool_size = None
+
+    # Ignore `reduce=` of scenario.matrix(...) and run every combination
+    # (also enabled with `--fn-full-matrix`, e.g. for nightly runs)
+    full_matrix = False
+
+    # Run sync scenarios in a pool of `thread_pool_size` threads, so blocking calls overlap
+    # (`scenario.threaded()` enables it per scenario, `scenario.threaded(False)` opts out)
+    threaded = False
+    thread_pool_size = 4
+
+    # Record durations of passed scenarios (and each param row) in
+    # .vedro/vedro_fn/durations.jsonl after every run and report scenarios slower than
+    # `regression_threshold` times the median of their last `regression_window` runs
+    regression_detection = False
+    regression_window = 10
+    regression_threshold = 1.5
+
+    # Store results of @snapshot functions in .vedro/vedro_fn/snapshots/ keyed by their bytecode
+    # and arguments, evict least recently used ones above `snapshot_cache_size`
+    # (`--fn-no-snapshots` bypasses the cache, `--fn-clear-snapshots` empties it)
+    snapshots = False
+    snapshot_cache_size = "256MiB"
+
+    # Measure given/when/then blocks, add timings to the scenario result
+    # and fire StepTimingsRecordedEvent
+    step_timings = False